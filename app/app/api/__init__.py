@@ -4,7 +4,7 @@ Registers all API routers.
 """
 from fastapi import APIRouter
 from app.api.routes import auth, users, patients, screenings, images, diagnoses, audit
-from app.api.routes import samples, ai_results, annotations
+from app.api.routes import samples, ai_results, annotations, batches, admin, stats, exports
 
 api_router = APIRouter()
 
@@ -21,3 +21,7 @@ api_router.include_router(audit.router)
 api_router.include_router(samples.router)
 api_router.include_router(ai_results.router)
 api_router.include_router(annotations.router)
+api_router.include_router(batches.router)
+api_router.include_router(admin.router)
+api_router.include_router(stats.router)
+api_router.include_router(exports.router)
@@ -0,0 +1,136 @@
+"""
+CervixAI Admin Routes
+Operational endpoints (admin only).
+"""
+import logging
+from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+
+from app.core.cache import entity_cache
+from app.core.config import settings
+from app.db.database import engine, get_db, SessionLocal
+from app.db.pool_metrics import pool_metrics
+from app.db.replicas import replicas
+from app.db.sqlite import writer_gate
+from app.core.dependencies import require_admin
+from app.core.principal import Principal, principal_cache
+from app.models import User
+from app.schemas import BackfillCreate, BackfillRead
+from app.services.backfill_service import BackfillService, CampaignNotRunnableError
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def _run_backfill(campaign_id: str, user_id: str, claimed: bool = False):
+    """Background task: run a campaign with its own session."""
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.id == user_id).first()
+        try:
+            BackfillService(db, user).run_campaign(campaign_id, claimed=claimed)
+        except CampaignNotRunnableError as exc:
+            logger.info("Backfill %s not started: %s", campaign_id, exc)
+
+
+@router.post("/backfill", response_model=BackfillRead, status_code=status.HTTP_202_ACCEPTED)
+def start_backfill(
+    request: BackfillCreate,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Start a backfill campaign for the loaded model version; it runs in the background."""
+    service = BackfillService(db, current_user)
+    try:
+        campaign = service.create_campaign(
+            target_model_version=request.target_model_version,
+            chunk_size=request.chunk_size,
+            rate_limit=request.rate_limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    background_tasks.add_task(_run_backfill, campaign.id, current_user.id)
+    return campaign
+
+
+@router.get("/backfill", response_model=List[BackfillRead])
+def list_backfills(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """List backfill campaigns, newest first."""
+    return BackfillService(db, current_user).list_campaigns(limit)
+
+
+@router.get("/backfill/{campaign_id}", response_model=BackfillRead)
+def get_backfill(
+    campaign_id: str,
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Get campaign progress, throughput and ETA."""
+    campaign = BackfillService(db, current_user).get_campaign(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backfill campaign not found")
+    return campaign
+
+
+@router.post("/backfill/{campaign_id}/resume", response_model=BackfillRead, status_code=status.HTTP_202_ACCEPTED)
+def resume_backfill(
+    campaign_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Resume a paused, failed or abandoned campaign from its checkpoint."""
+    service = BackfillService(db, current_user)
+    campaign = service.get_campaign(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backfill campaign not found")
+    if not service.can_run(campaign) or not service.claim_campaign(campaign):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Campaign is {campaign.status} and cannot be resumed"
+        )
+
+    background_tasks.add_task(_run_backfill, campaign.id, current_user.id, True)
+    return campaign
+
+
+@router.post("/backfill/{campaign_id}/pause", response_model=BackfillRead)
+def pause_backfill(
+    campaign_id: str,
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Pause a campaign after its current chunk."""
+    service = BackfillService(db, current_user)
+    campaign = service.get_campaign(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backfill campaign not found")
+    return service.cancel_campaign(campaign)
+
+
+@router.get("/replicas")
+def replica_status(current_user: Principal = Depends(require_admin)):
+    """Read-replica health as of the last background check."""
+    return {"enabled": replicas.enabled, "replicas": replicas.status()}
+
+
+@router.get("/db-pool")
+def db_pool_status(current_user: Principal = Depends(require_admin)):
+    """Connection pool metrics for this worker process."""
+    metrics = {"mode": settings.db_pool_mode, "pools": pool_metrics()}
+    if engine.dialect.name == "sqlite":
+        metrics["sqlite"] = {"profile": settings.sqlite_profile, "writer_gate": writer_gate.status()}
+    return metrics
+
+
+@router.get("/cache")
+def entity_cache_status(current_user: Principal = Depends(require_admin)):
+    """Entity cache hit ratio and latency per entity type, and principal cache hits (this worker's counters)."""
+    return {**entity_cache.status(), "principals": principal_cache.status()}
@@ -2,13 +2,20 @@
 CervixAI AI Results API Routes
 Endpoints for AI analysis and results.
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.core.security import get_current_user
-from app.models import User, AIResult, Sample
+from app.db.database import get_async_db
+from app.db.counting import count_rows
+from app.db.json_attributes import attribute_conditions
+from app.db.pagination import KeysetPaginator, cursor_headers, count_headers
+from app.db.unit_of_work import UnitOfWork
+from app.core.dependencies import get_async_read_db, get_current_user_async, get_uow
+from app.core.principal import Principal
+from app.models import AIResult, Sample
 from app.schemas.ai_result import AIResultCreate, AIResultRead, AIAnalysisRequest, AIAnalysisResponse
 from app.services.ai_result_service import AIResultService
 
@@ -16,21 +23,29 @@ router = APIRouter(prefix="/ai-results", tags=["ai-results"])
 
 
 @router.post("/analyze", response_model=AIAnalysisResponse)
-async def run_ai_analysis(
+def run_ai_analysis(
     request: AIAnalysisRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    uow: UnitOfWork = Depends(get_uow)
 ):
-    """Run AI analysis on a screening or sample."""
-    service = AIResultService(db, current_user)
+    """
+    Run AI analysis on a screening or sample.
+
+    Inference is CPU-bound, so this handler stays synchronous and runs in
+    the threadpool rather than on the event loop.
+    """
+    service = AIResultService(uow.session, uow.user)
     
-    result = service.run_analysis(
-        screening_id=str(request.screening_id) if request.screening_id else None,
-        sample_id=str(request.sample_id) if request.sample_id else None
-    )
+    try:
+        result = service.run_analysis(
+            screening_id=str(request.screening_id) if request.screening_id else None,
+            sample_id=str(request.sample_id) if request.sample_id else None
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     
     if not result:
         raise HTTPException(status_code=404, detail="Screening or sample not found")
+    uow.commit()
     
     # Handle both Diagnosis (legacy) and AIResult models
     if hasattr(result, 'ai_prediction'):
@@ -57,30 +72,40 @@ async def run_ai_analysis(
 
 @router.get("/", response_model=list[AIResultRead])
 async def list_ai_results(
+    response: Response,
     sample_id: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    score: List[str] = Query([], description="Confidence score filter, e.g. hsil:gt:0.3"),
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor/X-Prev-Cursor from a previous page"),
+    count: Literal["exact", "estimated", "cached", "none"] = Query("none", description="Total count strategy (X-Total-Count header)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
-    """List AI results with optional filters."""
-    query = db.query(AIResult)
+    """List AI results with optional filters, newest first. Page cursors are returned in headers."""
+    query = select(AIResult)
     
     if sample_id:
-        query = query.filter(AIResult.sample_id == sample_id)
+        query = query.where(AIResult.sample_id == sample_id)
+    query = query.where(*attribute_conditions(db, AIResult.confidence_scores, score))
     
-    results = query.order_by(AIResult.processed_at.desc()).offset(skip).limit(limit).all()
+    total, count_strategy = await db.run_sync(lambda session: count_rows(session, query, count, "ai_results"))
+    paginator = KeysetPaginator(AIResult.processed_at, AIResult.id, limit, cursor)
+    rows = await db.scalars(paginator.apply(query, skip))
+    results, next_cursor, prev_cursor = paginator.page(rows.all())
+    response.headers.update(cursor_headers(next_cursor, prev_cursor))
+    response.headers.update(count_headers(total, count_strategy))
     return results
 
 
 @router.get("/{result_id}", response_model=AIResultRead)
 async def get_ai_result(
     result_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
     """Get a specific AI result by ID."""
-    result = db.query(AIResult).filter(AIResult.id == result_id).first()
+    result = await db.get(AIResult, result_id)
     if not result:
         raise HTTPException(status_code=404, detail="AI result not found")
     return result
@@ -89,16 +114,15 @@ async def get_ai_result(
 @router.get("/{result_id}/heatmap")
 async def get_result_heatmap(
     result_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
     """Get heatmap for an AI result."""
-    result = db.query(AIResult).filter(AIResult.id == result_id).first()
+    result = await db.get(AIResult, result_id)
     if not result:
         raise HTTPException(status_code=404, detail="AI result not found")
     
     if not result.heatmap_path:
         raise HTTPException(status_code=404, detail="Heatmap not available")
     
-    from fastapi.responses import FileResponse
     return FileResponse(result.heatmap_path)
@@ -2,13 +2,21 @@
 CervixAI Annotations API Routes
 Endpoints for clinician annotations and sign-offs.
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.core.security import get_current_user
-from app.models import User, Annotation, AIResult
+from app.db.database import get_async_db
+from app.db.counting import count_rows
+from app.db.json_attributes import attribute_conditions
+from app.db.pagination import KeysetPaginator, cursor_headers, count_headers
+from app.db.unit_of_work import AsyncUnitOfWork
+from app.core.dependencies import (
+    get_async_read_db, get_current_user_async, get_async_uow, require_permission_async
+)
+from app.core.principal import Principal
+from app.models import Annotation, AIResult
 from app.schemas.annotation import AnnotationCreate, AnnotationRead, AnnotationUpdate, AnnotationSignOff
 from app.schemas.common import MessageResponse
 from app.services.annotation_service import AnnotationService
@@ -19,57 +27,69 @@ router = APIRouter(prefix="/annotations", tags=["annotations"])
 @router.post("/", response_model=AnnotationRead, status_code=status.HTTP_201_CREATED)
 async def create_annotation(
     annotation_in: AnnotationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """Create a new annotation for an AI result."""
-    service = AnnotationService(db, current_user)
-    annotation = service.create_annotation(annotation_in)
+    annotation = await uow.session.run_sync(
+        lambda session: AnnotationService(session, uow.user).create_annotation(annotation_in)
+    )
+    await uow.commit()
     return annotation
 
 
 @router.get("/", response_model=list[AnnotationRead])
 async def list_annotations(
+    response: Response,
     result_id: Optional[str] = None,
     signed_off: Optional[bool] = None,
     clinician_id: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    override_flag: List[str] = Query([], description="Override flag filter, e.g. quality_issue"),
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor/X-Prev-Cursor from a previous page"),
+    count: Literal["exact", "estimated", "cached", "none"] = Query("none", description="Total count strategy (X-Total-Count header)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
-    """List annotations with optional filters."""
-    query = db.query(Annotation)
+    """List annotations with optional filters, newest first. Page cursors are returned in headers."""
+    query = select(Annotation)
     
     if result_id:
-        query = query.filter(Annotation.result_id == result_id)
+        query = query.where(Annotation.result_id == result_id)
     if signed_off is not None:
-        query = query.filter(Annotation.signed_off == signed_off)
+        query = query.where(Annotation.signed_off == signed_off)
     if clinician_id:
-        query = query.filter(Annotation.clinician_id == clinician_id)
+        query = query.where(Annotation.clinician_id == clinician_id)
+    query = query.where(*attribute_conditions(db, Annotation.override_flags, override_flag))
     
-    annotations = query.order_by(Annotation.created_at.desc()).offset(skip).limit(limit).all()
+    total, count_strategy = await db.run_sync(lambda session: count_rows(session, query, count, "annotations"))
+    paginator = KeysetPaginator(Annotation.created_at, Annotation.id, limit, cursor)
+    rows = await db.scalars(paginator.apply(query, skip))
+    annotations, next_cursor, prev_cursor = paginator.page(rows.all())
+    response.headers.update(cursor_headers(next_cursor, prev_cursor))
+    response.headers.update(count_headers(total, count_strategy))
     return annotations
 
 
 @router.get("/pending", response_model=list[AnnotationRead])
 async def get_pending_annotations(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
     """Get annotations pending sign-off for current user."""
-    service = AnnotationService(db, current_user)
-    return service.get_pending_annotations(current_user.id)
+    return await db.run_sync(
+        lambda session: AnnotationService(session, current_user).get_pending_annotations(current_user.id)
+    )
 
 
 @router.get("/{annotation_id}", response_model=AnnotationRead)
 async def get_annotation(
     annotation_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
     """Get a specific annotation by ID."""
-    annotation = db.query(Annotation).filter(Annotation.id == annotation_id).first()
+    annotation = await db.get(Annotation, annotation_id)
     if not annotation:
         raise HTTPException(status_code=404, detail="Annotation not found")
     return annotation
@@ -79,11 +99,11 @@ async def get_annotation(
 async def update_annotation(
     annotation_id: str,
     annotation_update: AnnotationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """Update an annotation."""
-    annotation = db.query(Annotation).filter(Annotation.id == annotation_id).first()
+    annotation = await db.get(Annotation, annotation_id)
     if not annotation:
         raise HTTPException(status_code=404, detail="Annotation not found")
     
@@ -94,20 +114,22 @@ async def update_annotation(
     for field, value in update_data.items():
         setattr(annotation, field, value)
     
-    db.commit()
-    db.refresh(annotation)
+    uow.audit("annotation.update", "annotation", annotation.id, {"updated_fields": list(update_data.keys())})
+    await uow.commit()
     return annotation
 
 
 @router.post("/{annotation_id}/sign-off", response_model=AnnotationRead)
 async def sign_off_annotation(
     annotation_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(require_permission_async("annotations", "sign_off")),
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """Sign off an annotation (mandatory clinical oversight)."""
-    service = AnnotationService(db, current_user)
-    annotation = service.sign_off_annotation(annotation_id)
+    annotation = await uow.session.run_sync(
+        lambda session: AnnotationService(session, uow.user).sign_off_annotation(annotation_id)
+    )
+    await uow.commit()
     
     if not annotation:
         raise HTTPException(status_code=404, detail="Annotation not found")
@@ -1,14 +1,16 @@
 """
 CervixAI Audit Log Routes
 """
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
-from app.core.dependencies import require_admin
-from app.models import User, AuditLog
+from app.db.counting import count_rows
+from app.db.pagination import KeysetPaginator
+from app.core.dependencies import get_read_db, require_admin
+from app.core.principal import Principal
+from app.models import AuditLog
 
 router = APIRouter(prefix="/audit", tags=["Audit"])
 
@@ -20,9 +22,11 @@ def list_audit_logs(
     entity_type: Optional[str] = Query(None),
     days: int = Query(7, ge=1, le=90),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    offset: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor from a previous page"),
+    count: Literal["exact", "estimated", "cached", "none"] = Query("exact", description="Total count strategy"),
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_read_db)
 ):
     """List audit logs (admin only)."""
     query = db.query(AuditLog)
@@ -38,23 +42,25 @@ def list_audit_logs(
         query = query.filter(AuditLog.action.ilike(f"%{action}%"))
     
     if entity_type:
-        query = query.filter(AuditLog.entity_type == entity_type)
+        query = query.filter(AuditLog.resource_type == entity_type)
     
-    query = query.order_by(AuditLog.timestamp.desc())
-    
-    total = query.count()
-    logs = query.offset(offset).limit(limit).all()
+    total, count_strategy = count_rows(db, query, count, "audit_logs")
+    paginator = KeysetPaginator(AuditLog.timestamp, AuditLog.id, limit, cursor)
+    logs, next_cursor, prev_cursor = paginator.page(paginator.apply(query, offset).all())
     
     return {
         "total": total,
+        "count_strategy": count_strategy,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
         "items": [
             {
                 "id": log.id,
                 "user_id": log.user_id,
                 "user_email": log.user_email,
                 "action": log.action,
-                "entity_type": log.entity_type,
-                "entity_id": log.entity_id,
+                "entity_type": log.resource_type,
+                "entity_id": log.resource_id,
                 "timestamp": log.timestamp.isoformat(),
                 "ip_address": log.ip_address
             }
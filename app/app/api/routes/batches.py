@@ -0,0 +1,98 @@
+"""
+CervixAI Batch API Routes
+Endpoints for analyzing whole sample batches (e.g. a slide rack).
+"""
+import json
+import logging
+from typing import Iterator
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db, SessionLocal
+from app.core.dependencies import require_clinician
+from app.core.principal import Principal
+from app.models import User, Sample
+from app.services.ai_result_service import AIResultService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batches", tags=["batches"])
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _batch_progress(batch_id: str, user_id: str) -> Iterator[str]:
+    """Analyze pending samples of a batch and stream progress as SSE."""
+    # The request-scoped session is gone once streaming starts, so the
+    # stream owns its own session for the lifetime of the batch.
+    db = SessionLocal()
+    service = None
+    claimed = {}
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        service = AIResultService(db, user)
+        # Samples claimed by a concurrent run of the batch are left to it
+        samples, claimed = service.claim_batch_samples(batch_id)
+
+        yield _sse("start", {
+            "batch_id": batch_id,
+            "model_version": service.engine.model_version,
+            "total": len(samples),
+        })
+
+        analyzed = failed = 0
+        for event in service.analyze_samples(samples):
+            if event["status"] == "analyzed":
+                analyzed += 1
+            else:
+                failed += 1
+            yield _sse("progress", event)
+
+        yield _sse("complete", {
+            "batch_id": batch_id,
+            "analyzed": analyzed,
+            "failed": failed,
+            "total": len(samples),
+        })
+    except Exception as exc:
+        db.rollback()
+        yield _sse("error", {"batch_id": batch_id, "detail": str(exc)})
+    finally:
+        # Failed samples, and those not reached when the client disconnected
+        if service is not None:
+            try:
+                service.release_samples(claimed)
+            except Exception:
+                db.rollback()
+                logger.exception("Could not release samples claimed for batch %s", batch_id)
+        db.close()
+
+
+@router.post("/{batch_id}/analyze")
+def analyze_batch(
+    batch_id: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_clinician)
+):
+    """
+    Run AI analysis on every pending or uploaded sample in a batch.
+
+    Progress is streamed as server-sent events (``start``, one ``progress``
+    per sample, then ``complete``). Samples that already have a result for
+    the current model version are skipped, so an interrupted batch can be
+    resumed by calling this endpoint again. Each sample is claimed by one run
+    at a time; concurrent calls for the same batch split its samples.
+    """
+    batch_exists = db.query(Sample.id).filter(Sample.batch_id == batch_id).first()
+    if not batch_exists:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return StreamingResponse(
+        _batch_progress(batch_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
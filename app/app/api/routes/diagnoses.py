@@ -11,11 +11,14 @@ from PIL import Image
 import numpy as np
 
 from app.db.database import get_db
+from app.core.cache import read_through
+from app.db.unit_of_work import UnitOfWork
 from app.core.config import settings
-from app.core.dependencies import get_current_user, require_clinician, require_pathologist
+from app.core.dependencies import get_read_db, get_current_user, get_uow, require_clinician, require_permission
+from app.core.principal import Principal
 from app.models import (
-    User, Screening, ScreeningImage, Diagnosis, 
-    DiagnosisCategory, ScreeningStatus, AuditLog
+    Screening, ScreeningImage, Diagnosis, 
+    DiagnosisCategory, ScreeningStatus
 )
 from app.schemas import (
     AIAnalysisRequest, AIAnalysisResponse, 
@@ -78,8 +81,9 @@ def generate_mock_heatmap(image_path: str, output_path: str):
 @router.post("/analyze", response_model=AIAnalysisResponse)
 def run_ai_analysis(
     request: AIAnalysisRequest,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Run AI analysis on a screening's images."""
     screening = db.query(Screening).filter(Screening.id == request.screening_id).first()
@@ -124,7 +128,7 @@ def run_ai_analysis(
         diagnosis = existing
     else:
         diagnosis = Diagnosis(screening_id=request.screening_id)
-        db.add(diagnosis)
+        uow.add(diagnosis)
     
     diagnosis.ai_prediction = prediction
     diagnosis.ai_confidence = confidence
@@ -134,19 +138,8 @@ def run_ai_analysis(
     # Update screening status
     screening.status = ScreeningStatus.AI_ANALYZED.value
     
-    db.commit()
-    db.refresh(diagnosis)
-    
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="diagnosis.ai_analysis",
-        entity_type="diagnosis",
-        entity_id=diagnosis.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.audit("diagnosis.ai_analysis", "diagnosis", diagnosis)
+    uow.commit()
     
     return AIAnalysisResponse(
         diagnosis_id=diagnosis.id,
@@ -161,8 +154,9 @@ def run_ai_analysis(
 @router.post("/review", response_model=DiagnosisResponse)
 def submit_clinician_review(
     request: ClinicianReviewRequest,
-    current_user: User = Depends(require_pathologist),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_permission("diagnoses", "approve")),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Submit clinician review for a diagnosis (mandatory human oversight)."""
     diagnosis = db.query(Diagnosis).filter(Diagnosis.id == request.diagnosis_id).first()
@@ -196,19 +190,8 @@ def submit_clinician_review(
     if screening:
         screening.status = ScreeningStatus.COMPLETED.value
     
-    db.commit()
-    db.refresh(diagnosis)
-    
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="diagnosis.clinician_review",
-        entity_type="diagnosis",
-        entity_id=diagnosis.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.audit("diagnosis.clinician_review", "diagnosis", diagnosis.id, severity="critical")
+    uow.commit()
     
     return diagnosis
 
@@ -216,8 +199,8 @@ def submit_clinician_review(
 @router.get("/{diagnosis_id}", response_model=DiagnosisResponse)
 def get_diagnosis(
     diagnosis_id: str,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_read_db)
 ):
     """Get diagnosis by ID."""
     diagnosis = db.query(Diagnosis).filter(Diagnosis.id == diagnosis_id).first()
@@ -232,11 +215,14 @@ def get_diagnosis(
 @router.get("/screening/{screening_id}", response_model=DiagnosisResponse)
 def get_diagnosis_by_screening(
     screening_id: str,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db)  # Primary: a lagging replica read would refill the cache with a stale row
 ):
     """Get diagnosis for a specific screening."""
-    diagnosis = db.query(Diagnosis).filter(Diagnosis.screening_id == screening_id).first()
+    diagnosis = read_through(
+        "diagnosis_by_screening", screening_id, DiagnosisResponse,
+        lambda: db.query(Diagnosis).filter(Diagnosis.screening_id == screening_id).first()
+    )
     if not diagnosis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
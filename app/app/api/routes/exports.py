@@ -0,0 +1,67 @@
+"""
+CervixAI Export API Routes
+Streaming research and registry exports (admin only).
+"""
+from datetime import datetime
+from typing import Iterator, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.db.replicas import read_session
+from app.core.dependencies import require_admin
+from app.core.principal import Principal
+from app.models import AuditLog
+from app.services.research_export import MEDIA_TYPES, ResearchExport
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+def _export_stream(export: ResearchExport) -> Iterator[bytes]:
+    # The request-scoped session is gone once streaming starts, and a long
+    # export belongs on a replica when one is healthy
+    db = read_session()
+    try:
+        yield from export.chunks(db)
+    finally:
+        db.close()
+
+
+@router.get("/{entity}")
+def export_entity(
+    entity: Literal["patients", "screenings", "diagnoses", "samples", "ai_results", "annotations"],
+    request: Request,
+    format: Literal["ndjson", "csv", "parquet"] = Query("ndjson"),
+    since: Optional[datetime] = Query(None, description="Watermark of the previous export (X-Export-Watermark)"),
+    deidentify: bool = Query(True, description="Drop direct identifiers and pseudonymize patient IDs"),
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream every row of an entity changed after ``since`` (all rows without
+    it). The ``X-Export-Watermark`` header is the ``since`` for the next
+    incremental export.
+    """
+    try:
+        export = ResearchExport(entity, format, since=since, deidentify=deidentify)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    details = export.summary()
+    del details["rows"]  # Not known until the stream has been read
+    AuditLog.log_action(
+        db, action="data.export", user=current_user, resource_type=entity, details=details,
+        ip_address=request.client.host if request.client else None,
+        severity="info" if deidentify else "warning"
+    )
+    db.commit()
+
+    return StreamingResponse(
+        _export_stream(export),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{export.filename}"',
+            "X-Export-Watermark": export.until.isoformat(),
+        }
+    )
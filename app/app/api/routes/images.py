@@ -11,9 +11,12 @@ from sqlalchemy.orm import Session
 import uuid
 
 from app.db.database import get_db
+from app.core.cache import read_through
+from app.db.unit_of_work import UnitOfWork
 from app.core.config import settings
-from app.core.dependencies import get_current_user, require_clinician
-from app.models import User, Screening, ScreeningImage, ImageType, AuditLog
+from app.core.dependencies import get_read_db, get_current_user, get_uow, require_clinician
+from app.core.principal import Principal
+from app.models import Screening, ScreeningImage, ImageType
 from app.schemas import ImageResponse, ImageListResponse
 
 router = APIRouter(prefix="/images", tags=["Images"])
@@ -30,8 +33,9 @@ async def upload_image(
     screening_id: str,
     file: UploadFile = File(...),
     image_type: str = Query(ImageType.PAP_SMEAR.value),
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Upload a screening image (Pap smear, colposcopy, etc.)."""
     # Verify screening exists
@@ -77,20 +81,9 @@ async def upload_image(
         image_type=image_type
     )
     
-    db.add(image)
-    db.commit()
-    db.refresh(image)
-    
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="image.upload",
-        entity_type="image",
-        entity_id=image.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.add(image)
+    uow.audit("image.upload", "image", image)
+    uow.commit()
     
     return image
 
@@ -98,11 +91,14 @@ async def upload_image(
 @router.get("/{image_id}", response_model=ImageResponse)
 def get_image_info(
     image_id: str,
-    current_user: User = Depends(require_clinician),
+    current_user: Principal = Depends(require_clinician),
     db: Session = Depends(get_db)
 ):
     """Get image metadata."""
-    image = db.query(ScreeningImage).filter(ScreeningImage.id == image_id).first()
+    image = read_through(
+        "image", image_id, ImageResponse,
+        lambda: db.query(ScreeningImage).filter(ScreeningImage.id == image_id).first()
+    )
     if not image:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -114,7 +110,7 @@ def get_image_info(
 @router.get("/{image_id}/file")
 def download_image(
     image_id: str,
-    current_user: User = Depends(require_clinician),
+    current_user: Principal = Depends(require_clinician),
     db: Session = Depends(get_db)
 ):
     """Download the actual image file."""
@@ -141,7 +137,7 @@ def download_image(
 @router.get("/{image_id}/heatmap")
 def get_heatmap(
     image_id: str,
-    current_user: User = Depends(require_clinician),
+    current_user: Principal = Depends(require_clinician),
     db: Session = Depends(get_db)
 ):
     """Get AI-generated heatmap overlay for the image."""
@@ -168,8 +164,8 @@ def get_heatmap(
 @router.get("/screening/{screening_id}", response_model=ImageListResponse)
 def list_screening_images(
     screening_id: str,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_read_db)
 ):
     """List all images for a screening."""
     images = db.query(ScreeningImage).filter(
@@ -1,17 +1,30 @@
 """
 CervixAI Patient Routes
 """
-from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+import io
+from datetime import date, datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status, Query
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.core.dependencies import get_current_user, require_clinician
-from app.models import User, Patient, AuditLog
+from app.core.cache import read_through
+from app.db.counting import count_rows, counter_total
+from app.db.json_attributes import attribute_conditions
+from app.db.pagination import KeysetPaginator
+from app.db.unit_of_work import UnitOfWork
+from app.core.dependencies import get_read_db, get_current_user, get_uow, require_admin, require_clinician
+from app.core.principal import Principal
+from app.models import Patient
 from app.schemas import (
-    PatientCreate, PatientUpdate, PatientResponse, PatientListResponse
+    PatientCreate, PatientUpdate, PatientResponse, PatientListResponse,
+    PatientSearchHit, PatientSearchResponse, PatientImportReport
 )
+from app.services.patient_import import (
+    DEFAULT_CHUNK_SIZE, IMPORT_FORMATS, PatientImportService, detect_format, parse_rows
+)
+from app.services.patient_search import PatientSearchService
 
 router = APIRouter(prefix="/patients", tags=["Patients"])
 
@@ -19,33 +32,71 @@ router = APIRouter(prefix="/patients", tags=["Patients"])
 @router.get("", response_model=PatientListResponse)
 def list_patients(
     search: Optional[str] = Query(None, description="Search by name or MRN"),
+    risk_factor: List[str] = Query([], description="Risk factor filter, e.g. hpv_positive or smoking:false"),
+    contact: List[str] = Query([], description="Contact info filter, e.g. address.city:Pune"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    offset: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor from a previous page"),
+    count: Optional[Literal["exact", "estimated", "cached", "none"]] = Query(
+        None, description="Total count strategy; default: maintained counter, or exact when filtered"
+    ),
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_read_db)
 ):
     """List patients with optional search."""
     query = db.query(Patient)
     
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Patient.first_name.ilike(search_term)) |
-            (Patient.last_name.ilike(search_term)) |
-            (Patient.medical_record_number.ilike(search_term))
-        )
+        query = query.filter(PatientSearchService(db).match_clause(search))
+    query = query.filter(
+        *attribute_conditions(db, Patient.risk_factors, risk_factor),
+        *attribute_conditions(db, Patient.contact_info, contact)
+    )
     
-    total = query.count()
-    patients = query.offset(offset).limit(limit).all()
+    if count is None and not (search or risk_factor or contact):
+        total, count_strategy = counter_total(db, "patients")
+    else:
+        total, count_strategy = count_rows(db, query, count or "exact", "patients")
+    paginator = KeysetPaginator(Patient.created_at, Patient.id, limit, cursor)
+    patients, next_cursor, prev_cursor = paginator.page(paginator.apply(query, offset).all())
     
-    return PatientListResponse(total=total, items=patients)
+    return PatientListResponse(
+        total=total, count_strategy=count_strategy, items=patients,
+        next_cursor=next_cursor, prev_cursor=prev_cursor
+    )
+
+
+@router.get("/search", response_model=PatientSearchResponse)
+def search_patients(
+    q: Optional[str] = Query(None, min_length=1, max_length=100, description="Name, MRN or prefix"),
+    dob: Optional[date] = Query(None, description="Exact date of birth"),
+    dob_from: Optional[date] = None,
+    dob_to: Optional[date] = None,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_read_db)
+):
+    """Ranked patient search for typeahead; an exact MRN returns that patient only."""
+    if not q and not (dob or dob_from or dob_to):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide a search term or a date of birth filter"
+        )
+    
+    hits, exact_mrn = PatientSearchService(db).search(q, dob, dob_from, dob_to, limit)
+    items = [
+        PatientSearchHit.model_validate(patient).model_copy(update={"score": score})
+        for patient, score in hits
+    ]
+    return PatientSearchResponse(items=items, exact_mrn=exact_mrn)
 
 
 @router.post("", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
 def create_patient(
     patient_data: PatientCreate,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Create a new patient record."""
     # Check for duplicate MRN
@@ -67,52 +118,66 @@ def create_patient(
         phone=patient_data.phone,
         medical_record_number=patient_data.medical_record_number,
         notes=patient_data.notes,
+        risk_factors=patient_data.risk_factors or {},
         consent_given=patient_data.consent_given,
         consent_date=datetime.utcnow() if patient_data.consent_given else None
     )
     
-    db.add(patient)
-    db.commit()
-    db.refresh(patient)
-    
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="patient.create",
-        entity_type="patient",
-        entity_id=patient.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.add(patient)
+    uow.audit("patient.create", "patient", patient)
+    uow.commit()
     
     return patient
 
 
+@router.post("/import", response_model=PatientImportReport)
+def import_patients(
+    request: Request,
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one patient per line)"),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Default: from the file name"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    dry_run: bool = Query(False, description="Validate and deduplicate without writing"),
+    current_user: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-create patients. Rows with invalid fields or an MRN that already
+    exists are reported and skipped; valid rows are imported.
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot tell the file format; pass ?format=csv or ?format=ndjson"
+        )
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    service = PatientImportService(db, current_user, request.client.host if request.client else None)
+    try:
+        return service.import_rows(parse_rows(lines, fmt), chunk_size=chunk_size, dry_run=dry_run)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unreadable file: {exc}")
+
+
 @router.get("/{patient_id}", response_model=PatientResponse)
 def get_patient(
     patient_id: str,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Get patient by ID."""
-    patient = db.query(Patient).filter(Patient.id == patient_id).first()
+    patient = read_through(
+        "patient", patient_id, PatientResponse,
+        lambda: db.query(Patient).filter(Patient.id == patient_id).first()
+    )
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
         )
     
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="patient.view",
-        entity_type="patient",
-        entity_id=patient.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.audit("patient.view", "patient", patient["id"])
+    uow.commit()
     
     return patient
 
@@ -121,8 +186,9 @@ def get_patient(
 def update_patient(
     patient_id: str,
     patient_update: PatientUpdate,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Update patient record."""
     patient = db.query(Patient).filter(Patient.id == patient_id).first()
@@ -138,19 +204,8 @@ def update_patient(
             patient.consent_date = datetime.utcnow()
         setattr(patient, field, value)
     
-    db.commit()
-    db.refresh(patient)
-    
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="patient.update",
-        entity_type="patient",
-        entity_id=patient.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.audit("patient.update", "patient", patient.id, {"updated_fields": list(update_data.keys())})
+    uow.commit()
     
     return patient
 
@@ -158,8 +213,9 @@ def update_patient(
 @router.delete("/{patient_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_patient(
     patient_id: str,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Delete patient record (soft delete in production)."""
     patient = db.query(Patient).filter(Patient.id == patient_id).first()
@@ -169,17 +225,8 @@ def delete_patient(
             detail="Patient not found"
         )
     
-    # Audit log before deletion
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="patient.delete",
-        entity_type="patient",
-        entity_id=patient.id
-    )
-    db.add(audit)
-    
-    db.delete(patient)
-    db.commit()
+    uow.delete(patient)
+    uow.audit("patient.delete", "patient", patient.id)
+    uow.commit()
     
     return None
@@ -2,31 +2,53 @@
 CervixAI Samples API Routes
 Endpoints for sample management and batch upload.
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+import os
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.db.database import get_db
-from app.core.security import get_current_user
-from app.models import User, Sample, Patient, AuditLog
+from app.core.config import settings
+from app.db.database import get_async_db
+from app.db.counting import count_rows, counter_total
+from app.db.json_attributes import attribute_conditions
+from app.db.pagination import KeysetPaginator, cursor_headers, count_headers
+from app.db.unit_of_work import AsyncUnitOfWork
+from app.core.dependencies import get_async_read_db, get_current_user_async, get_async_uow
+from app.core.principal import Principal
+from app.models import Sample, Patient
 from app.schemas.sample import SampleCreate, SampleRead, SampleUpdate
 from app.schemas.common import MessageResponse
 
 router = APIRouter(prefix="/samples", tags=["samples"])
 
 
+async def _get_sample_or_404(db: AsyncSession, sample_id: str) -> Sample:
+    sample = await db.get(Sample, sample_id)
+    if not sample:
+        raise HTTPException(status_code=404, detail="Sample not found")
+    return sample
+
+
+def _write_file(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
 @router.post("/", response_model=SampleRead, status_code=status.HTTP_201_CREATED)
 async def create_sample(
     sample_in: SampleCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """Create a new sample for a patient."""
     # Verify patient exists
-    patient = db.query(Patient).filter(Patient.id == str(sample_in.patient_id)).first()
+    patient = await db.get(Patient, str(sample_in.patient_id))
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
-    
+
     sample = Sample(
         patient_id=str(sample_in.patient_id),
         collection_date=sample_in.collection_date,
@@ -34,76 +56,79 @@ async def create_sample(
         batch_id=str(sample_in.batch_id) if sample_in.batch_id else None,
         metadata=sample_in.metadata or {}
     )
-    db.add(sample)
-    db.commit()
-    db.refresh(sample)
-    
-    # Audit log
-    AuditLog.log_action(db, "sample.create", current_user, "sample", sample.id)
-    db.commit()
-    
+    uow.add(sample)
+    uow.audit("sample.create", "sample", sample)
+    await uow.commit()
+
     return sample
 
 
 @router.get("/", response_model=list[SampleRead])
 async def list_samples(
+    response: Response,
     patient_id: Optional[str] = None,
     batch_id: Optional[str] = None,
     status: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    metadata: List[str] = Query([], description="Metadata filter, e.g. stain:pap"),
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor/X-Prev-Cursor from a previous page"),
+    count: Optional[Literal["exact", "estimated", "cached", "none"]] = Query(
+        None, description="Total count strategy (X-Total-Count header); default: maintained counter, or none when filtered"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
-    """List samples with optional filters."""
-    query = db.query(Sample)
-    
+    """List samples with optional filters, newest first. Page cursors are returned in headers."""
+    query = select(Sample)
+
     if patient_id:
-        query = query.filter(Sample.patient_id == patient_id)
+        query = query.where(Sample.patient_id == patient_id)
     if batch_id:
-        query = query.filter(Sample.batch_id == batch_id)
+        query = query.where(Sample.batch_id == batch_id)
     if status:
-        query = query.filter(Sample.status == status)
-    
-    samples = query.offset(skip).limit(limit).all()
+        query = query.where(Sample.status == status)
+    query = query.where(*attribute_conditions(db, Sample.__table__.c.metadata, metadata))
+
+    if count is None and not (patient_id or batch_id or metadata):
+        total, count_strategy = await db.run_sync(lambda session: counter_total(session, "samples", status))
+    else:
+        total, count_strategy = await db.run_sync(lambda session: count_rows(session, query, count or "none", "samples"))
+    paginator = KeysetPaginator(Sample.created_at, Sample.id, limit, cursor)
+    rows = await db.scalars(paginator.apply(query, skip))
+    samples, next_cursor, prev_cursor = paginator.page(rows.all())
+    response.headers.update(cursor_headers(next_cursor, prev_cursor))
+    response.headers.update(count_headers(total, count_strategy))
     return samples
 
 
 @router.get("/{sample_id}", response_model=SampleRead)
 async def get_sample(
     sample_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
 ):
     """Get a specific sample by ID."""
-    sample = db.query(Sample).filter(Sample.id == sample_id).first()
-    if not sample:
-        raise HTTPException(status_code=404, detail="Sample not found")
-    return sample
+    return await _get_sample_or_404(db, sample_id)
 
 
 @router.patch("/{sample_id}", response_model=SampleRead)
 async def update_sample(
     sample_id: str,
     sample_update: SampleUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """Update a sample."""
-    sample = db.query(Sample).filter(Sample.id == sample_id).first()
-    if not sample:
-        raise HTTPException(status_code=404, detail="Sample not found")
-    
+    sample = await _get_sample_or_404(db, sample_id)
+
     update_data = sample_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(sample, field, value)
-    
-    db.commit()
-    db.refresh(sample)
-    
-    AuditLog.log_action(db, "sample.update", current_user, "sample", sample.id)
-    db.commit()
-    
+
+    uow.audit("sample.update", "sample", sample.id, {"updated_fields": list(update_data.keys())})
+    await uow.commit()
+
     return sample
 
 
@@ -111,51 +136,36 @@ async def update_sample(
 async def upload_sample_image(
     sample_id: str,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """Upload an image for a sample."""
-    sample = db.query(Sample).filter(Sample.id == sample_id).first()
-    if not sample:
-        raise HTTPException(status_code=404, detail="Sample not found")
-    
-    # Save file
-    import os
-    from app.core.config import settings
-    
-    os.makedirs(settings.upload_dir, exist_ok=True)
+    sample = await _get_sample_or_404(db, sample_id)
+
+    # Save file off the event loop
     file_path = os.path.join(settings.upload_dir, f"{sample_id}_{file.filename}")
-    
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
+    content = await file.read()
+    await run_in_threadpool(_write_file, file_path, content)
+
     sample.image_path = file_path
     sample.status = "uploaded"
-    db.commit()
-    db.refresh(sample)
-    
-    AuditLog.log_action(db, "sample.upload_image", current_user, "sample", sample.id)
-    db.commit()
-    
+    uow.audit("sample.upload_image", "sample", sample.id)
+    await uow.commit()
+
     return sample
 
 
 @router.delete("/{sample_id}", response_model=MessageResponse)
 async def delete_sample(
     sample_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """Delete a sample."""
-    sample = db.query(Sample).filter(Sample.id == sample_id).first()
-    if not sample:
-        raise HTTPException(status_code=404, detail="Sample not found")
-    
-    db.delete(sample)
-    db.commit()
-    
-    AuditLog.log_action(db, "sample.delete", current_user, "sample", sample_id)
-    db.commit()
-    
+    sample = await _get_sample_or_404(db, sample_id)
+
+    await uow.delete(sample)
+    uow.audit("sample.delete", "sample", sample_id)
+    await uow.commit()
+
     return {"message": "Sample deleted successfully"}
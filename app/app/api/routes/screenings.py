@@ -1,16 +1,22 @@
 """
 CervixAI Screening Routes
 """
-from typing import Optional
+from typing import Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.core.dependencies import get_current_user, require_clinician
-from app.models import User, Patient, Screening, ScreeningStatus, AuditLog
+from app.core.cache import read_through
+from app.db.counting import count_rows, counter_total
+from app.db.pagination import KeysetPaginator
+from app.db.unit_of_work import UnitOfWork
+from app.core.dependencies import get_read_db, get_current_user, get_uow, require_clinician
+from app.core.principal import Principal
+from app.models import Patient, Screening, ScreeningStatus
 from app.schemas import (
-    ScreeningCreate, ScreeningUpdate, ScreeningResponse, ScreeningListResponse
+    ScreeningCreate, ScreeningUpdate, ScreeningResponse, ScreeningListResponse, ScreeningBundle
 )
+from app.services.screening_service import ScreeningService
 
 router = APIRouter(prefix="/screenings", tags=["Screenings"])
 
@@ -20,9 +26,13 @@ def list_screenings(
     patient_id: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    offset: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor from a previous page"),
+    count: Optional[Literal["exact", "estimated", "cached", "none"]] = Query(
+        None, description="Total count strategy; default: maintained counter, or exact when filtered"
+    ),
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_read_db)
 ):
     """List screening episodes with optional filters."""
     query = db.query(Screening)
@@ -33,19 +43,25 @@ def list_screenings(
     if status:
         query = query.filter(Screening.status == status)
     
-    query = query.order_by(Screening.created_at.desc())
-    
-    total = query.count()
-    screenings = query.offset(offset).limit(limit).all()
+    if count is None and not patient_id:
+        total, count_strategy = counter_total(db, "screenings", status)
+    else:
+        total, count_strategy = count_rows(db, query, count or "exact", "screenings")
+    paginator = KeysetPaginator(Screening.created_at, Screening.id, limit, cursor)
+    screenings, next_cursor, prev_cursor = paginator.page(paginator.apply(query, offset).all())
     
-    return ScreeningListResponse(total=total, items=screenings)
+    return ScreeningListResponse(
+        total=total, count_strategy=count_strategy, items=screenings,
+        next_cursor=next_cursor, prev_cursor=prev_cursor
+    )
 
 
 @router.post("", response_model=ScreeningResponse, status_code=status.HTTP_201_CREATED)
 def create_screening(
     screening_data: ScreeningCreate,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Create a new screening episode for a patient."""
     # Verify patient exists
@@ -70,20 +86,9 @@ def create_screening(
         status=ScreeningStatus.PENDING.value
     )
     
-    db.add(screening)
-    db.commit()
-    db.refresh(screening)
-    
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="screening.create",
-        entity_type="screening",
-        entity_id=screening.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.add(screening)
+    uow.audit("screening.create", "screening", screening)
+    uow.commit()
     
     return screening
 
@@ -91,11 +96,14 @@ def create_screening(
 @router.get("/{screening_id}", response_model=ScreeningResponse)
 def get_screening(
     screening_id: str,
-    current_user: User = Depends(require_clinician),
+    current_user: Principal = Depends(require_clinician),
     db: Session = Depends(get_db)
 ):
     """Get screening episode by ID."""
-    screening = db.query(Screening).filter(Screening.id == screening_id).first()
+    screening = read_through(
+        "screening", screening_id, ScreeningResponse,
+        lambda: db.query(Screening).filter(Screening.id == screening_id).first()
+    )
     if not screening:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -105,12 +113,40 @@ def get_screening(
     return screening
 
 
+@router.get("/{screening_id}/bundle", response_model=ScreeningBundle)
+def get_screening_bundle(
+    screening_id: str,
+    ai_results: int = Query(5, ge=0, le=50, description="Latest AI results for the patient"),
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
+):
+    """Screening with its patient, images, diagnosis and latest AI results in one call."""
+    bundle = ScreeningService(db, current_user).get_bundle(screening_id, ai_results)
+    if not bundle:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screening not found"
+        )
+    
+    # Serialize before the commit expires the loaded rows
+    screening = ScreeningResponse.model_validate(bundle.pop("screening")).model_dump()
+    response = ScreeningBundle.model_validate({**screening, **bundle}, from_attributes=True)
+    
+    # The bundle includes the patient's identifying details
+    uow.audit("patient.view", "patient", response.patient.id, {"via": "screening_bundle"})
+    uow.commit()
+    
+    return response
+
+
 @router.patch("/{screening_id}", response_model=ScreeningResponse)
 def update_screening(
     screening_id: str,
     screening_update: ScreeningUpdate,
-    current_user: User = Depends(require_clinician),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_clinician),
+    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Update screening episode."""
     screening = db.query(Screening).filter(Screening.id == screening_id).first()
@@ -124,18 +160,7 @@ def update_screening(
     for field, value in update_data.items():
         setattr(screening, field, value)
     
-    db.commit()
-    db.refresh(screening)
-    
-    # Audit log
-    audit = AuditLog(
-        user_id=current_user.id,
-        user_email=current_user.email,
-        action="screening.update",
-        entity_type="screening",
-        entity_id=screening.id
-    )
-    db.add(audit)
-    db.commit()
+    uow.audit("screening.update", "screening", screening.id)
+    uow.commit()
     
     return screening
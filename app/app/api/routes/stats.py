@@ -0,0 +1,39 @@
+"""
+CervixAI Statistics Routes
+"""
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_user, get_read_db
+from app.core.principal import Principal
+from app.db.identifiers import InvalidIdentifierError, parse_id
+from app.models import UserRole
+from app.schemas import DashboardStats
+from app.services.stats_service import StatsService
+
+router = APIRouter(prefix="/stats", tags=["Statistics"])
+
+
+@router.get("/dashboard", response_model=DashboardStats)
+def dashboard_stats(
+    user_id: Optional[str] = Query(None, description="Per-user figures for this user (admins); default: you"),
+    day: Optional[date] = Query(None, description="UTC day for throughput figures; default: today"),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Dashboard totals and throughput from maintained counters (constant time)."""
+    if user_id is None:
+        user_id = current_user.id
+    else:
+        try:
+            user_id = str(parse_id(user_id))
+        except InvalidIdentifierError as exc:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+        if user_id != current_user.id and current_user.role != UserRole.ADMIN.value:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only admins can view another user's statistics"
+            )
+    return StatsService(db, current_user).get_dashboard(user_id=user_id, day=day)
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.core.security import get_password_hash
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user_record
 from app.models import User
 from app.schemas import UserResponse, UserUpdate
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_profile(current_user: User = Depends(get_current_user)):
+def get_current_user_profile(current_user: User = Depends(get_current_user_record)):
     """Get current user's profile."""
     return current_user
 
@@ -22,7 +22,7 @@ def get_current_user_profile(current_user: User = Depends(get_current_user)):
 @router.patch("/me", response_model=UserResponse)
 def update_current_user_profile(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """Update current user's profile."""
@@ -0,0 +1,412 @@
+"""
+CervixAI Command Line Interface
+Operational commands run from the ``app`` directory:
+
+    python -m app.cli <command> [options]
+"""
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tiff", ".tif"}
+
+
+def _sample_set(images_dir: Optional[str], limit: int) -> List[Tuple[str, str]]:
+    """
+    Resolve the stored sample set as (id, image path) pairs.
+
+    Uses the image files in ``images_dir`` when given, otherwise the most
+    recent uploaded ``Sample`` images from the database.
+    """
+    if images_dir:
+        names = sorted(
+            name for name in os.listdir(images_dir)
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+        )
+        return [(name, os.path.join(images_dir, name)) for name in names[:limit]]
+
+    from app.db.database import get_db_context
+    from app.models import Sample
+
+    with get_db_context() as db:
+        rows = (
+            db.query(Sample.id, Sample.image_path)
+            .filter(Sample.image_path.isnot(None))
+            .order_by(Sample.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+    return [(sample_id, path) for sample_id, path in rows if os.path.exists(path)]
+
+
+def _load_tensors(images_dir: Optional[str], limit: int):
+    """Preprocessed tensors for the sample set, via the tensor store when enabled."""
+    from app.services.inference import InferenceEngine
+    from app.services.tensor_store import get_tensor_store, source_fingerprint
+
+    engine = InferenceEngine()
+    store = get_tensor_store()
+    sample_set = _sample_set(images_dir, limit)
+    if not sample_set:
+        raise SystemExit("No images found for the sample set")
+
+    ids, tensors, fresh = [], [], {}
+    for sample_id, path in sample_set:
+        fingerprint = source_fingerprint(path)
+        tensor = store.get(sample_id, fingerprint) if store is not None else None
+        if tensor is None:
+            tensor = engine.load_tensor(path)
+            fresh[sample_id] = (tensor, fingerprint)
+        ids.append(sample_id)
+        tensors.append(tensor)
+
+    if store is not None and fresh:
+        store.put_many(fresh)
+    return ids, tensors
+
+
+def cmd_quantize(args) -> int:
+    """Build an int8 variant of the FP32 model."""
+    from app.services.model_loader import quantize_dynamic_model, quantize_static_model
+
+    if args.mode == "dynamic":
+        path = quantize_dynamic_model(settings.ai_model_path)
+    else:
+        _, tensors = _load_tensors(args.images, args.limit)
+        path = quantize_static_model(settings.ai_model_path, tensors)
+        print(f"Calibrated on {len(tensors)} images", file=sys.stderr)
+    print(f"Wrote {path}", file=sys.stderr)
+    return 0
+
+
+def cmd_drift_report(args) -> int:
+    """Compare quantized and FP32 confidence scores on the same images."""
+    from app.services.inference import DIAGNOSIS_CATEGORIES
+    from app.services.model_loader import load_model, drift_report
+
+    reference = load_model(settings.ai_model_path, "fp32")
+    if reference is None:
+        raise SystemExit(f"No FP32 model available under {settings.ai_model_path}")
+    candidate = load_model(settings.ai_model_path, args.precision)
+
+    ids, tensors = _load_tensors(args.images, args.limit)
+    report = drift_report(reference, candidate, tensors, DIAGNOSIS_CATEGORIES, image_ids=ids)
+    report["thresholds"] = {"max_abs_diff": args.max_abs_diff, "min_top1_agreement": args.min_agreement}
+    report["passed"] = (
+        report["max_abs_diff"] <= args.max_abs_diff
+        and report["top1_agreement"] >= args.min_agreement
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+    return 0 if report["passed"] else 1
+
+
+def cmd_tensor_store(args) -> int:
+    """Inspect, warm or prune the preprocessed tensor store."""
+    from app.services.tensor_store import get_tensor_store
+
+    store = get_tensor_store()
+    if store is None:
+        raise SystemExit("Tensor store is disabled; set TENSOR_STORE_DIR")
+
+    if args.action == "warm":
+        ids, _ = _load_tensors(args.images, args.limit)
+        print(f"{len(ids)} tensors available", file=sys.stderr)
+    elif args.action == "prune":
+        for name in store.prune_stale():
+            print(f"Removed stale store {name}", file=sys.stderr)
+    print(json.dumps(store.stats(), indent=2))
+    return 0
+
+
+def cmd_backfill(args) -> int:
+    """Re-analyze historical samples that lack a result for the loaded model version."""
+    import signal
+    import threading
+    from app.db.database import get_db_context
+    from app.services.backfill_service import BackfillService
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        print("Stopping after the current chunk...", file=sys.stderr)
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    def report(campaign):
+        eta = f"{campaign.eta_seconds}s" if campaign.eta_seconds is not None else "?"
+        print(
+            f"{campaign.processed + campaign.failed}/{campaign.total} "
+            f"({campaign.failed} failed) {campaign.throughput:.1f} img/s ETA {eta}",
+            file=sys.stderr
+        )
+
+    with get_db_context() as db:
+        service = BackfillService(db)
+        if args.resume:
+            campaign = service.get_campaign(args.resume)
+            if campaign is None:
+                raise SystemExit(f"Backfill campaign {args.resume} not found")
+            if not service.can_run(campaign):
+                raise SystemExit(f"Campaign is {campaign.status} and cannot be resumed")
+        else:
+            try:
+                campaign = service.create_campaign(args.target_version, args.chunk_size, args.rate)
+            except ValueError as exc:
+                raise SystemExit(str(exc))
+            print(f"Created campaign {campaign.id} ({campaign.total} samples)", file=sys.stderr)
+
+        try:
+            campaign = service.run_campaign(campaign.id, stop_event=stop_event, on_progress=report)
+        except ValueError as exc:  # Another runner claimed it, or a model version mismatch
+            raise SystemExit(str(exc))
+        print(json.dumps({
+            "id": campaign.id,
+            "target_model_version": campaign.target_model_version,
+            "status": campaign.status,
+            "processed": campaign.processed,
+            "failed": campaign.failed,
+            "remaining": campaign.remaining,
+            "error": campaign.error,
+        }, indent=2))
+        return 0 if campaign.status in ("completed", "paused") else 1
+
+
+def cmd_db(args) -> int:
+    """Schema migrations (Alembic) for the configured database."""
+    from alembic import command
+    from app.db.database import engine
+    from app.db.migrations import alembic_config, current_revision, head_revision, upgrade
+
+    if args.action == "revision":
+        if not args.message:
+            raise SystemExit("revision requires -m/--message")
+        command.revision(alembic_config(), message=args.message, autogenerate=args.autogenerate)
+        return 0
+    if args.action == "history":
+        command.history(alembic_config())
+        return 0
+    if args.sql and args.action in ("upgrade", "downgrade", "stamp"):
+        # Offline mode: print the DDL for review instead of running it
+        getattr(command, args.action)(alembic_config(), args.revision or "head", sql=True)
+        return 0
+
+    with engine.connect() as connection:
+        if args.action == "upgrade":
+            upgrade(connection, args.revision or "head")
+        elif args.action == "downgrade":
+            if not args.revision:
+                raise SystemExit("downgrade requires --revision")
+            command.downgrade(alembic_config(connection), args.revision)
+            connection.commit()
+        elif args.action == "stamp":
+            command.stamp(alembic_config(connection), args.revision or "head")
+            connection.commit()
+        current = current_revision(connection)
+    print(json.dumps({"current": current, "head": head_revision()}, indent=2))
+    return 0
+
+
+def cmd_index_audit(args) -> int:
+    """EXPLAIN the API's list and lookup queries and fail on full table scans."""
+    from app.db.database import SessionLocal, init_db
+    from app.db.plan_audit import audit_query_plans, seed_synthetic
+
+    init_db()
+    with SessionLocal() as db:
+        if args.seed:
+            try:
+                counts = seed_synthetic(db, args.seed)
+            except ValueError as exc:
+                raise SystemExit(str(exc))
+            print(f"Seeded {counts}", file=sys.stderr)
+        results = audit_query_plans(db)
+
+    for result in results:
+        marker = "ok  " if result.uses_index else "SCAN"
+        print(f"{marker} {result.name}")
+        if args.verbose or not result.uses_index:
+            for line in result.plan:
+                print(f"       {line}")
+    failures = [result.name for result in results if not result.uses_index]
+    if failures:
+        print(f"{len(failures)} queries without an index: {', '.join(failures)}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def cmd_audit_maintenance(args) -> int:
+    """Create upcoming audit log partitions and apply the retention period."""
+    from app.db.audit_partitions import maintain_audit_logs
+    from app.db.database import engine
+
+    print(json.dumps(maintain_audit_logs(engine), indent=2))
+    return 0
+
+
+def cmd_rebuild_counters(args) -> int:
+    """Recount the status and dashboard counters from the base tables."""
+    from app.db.database import get_db_context, init_db
+    from app.models.dashboard_counter import DashboardCounter, rebuild_counters
+    from app.models.status_counter import StatusCounter
+
+    init_db()
+    with get_db_context() as db:
+        rebuild_counters(db)
+        rows = db.query(StatusCounter).count() + db.query(DashboardCounter).count()
+    print(f"Rebuilt {rows} counters", file=sys.stderr)
+    return 0
+
+
+def cmd_import_patients(args) -> int:
+    """Bulk-import patients from a CSV or NDJSON file and print the report."""
+    from app.db.database import get_db_context, init_db
+    from app.services.patient_import import PatientImportService, detect_format, parse_rows
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        print("Cannot tell the file format; pass --format csv or --format ndjson", file=sys.stderr)
+        return 2
+
+    init_db()
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+    try:
+        with get_db_context() as db:
+            report = PatientImportService(db).import_rows(
+                parse_rows(source, fmt), chunk_size=args.chunk_size, dry_run=args.dry_run
+            )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report["failed"] else 0
+
+
+def cmd_export(args) -> int:
+    """Stream a research/registry export to a file or stdout."""
+    from datetime import datetime
+    from app.db.database import init_db
+    from app.db.replicas import read_session
+    from app.services.research_export import ResearchExport
+
+    try:
+        export = ResearchExport(
+            args.entity, args.format,
+            since=datetime.fromisoformat(args.since) if args.since else None,
+            deidentify=not args.identified,
+            batch_size=args.batch_size,
+        )
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    init_db()
+    db = read_session()
+    try:
+        if args.output == "-":
+            export.write_to(db, sys.stdout.buffer)
+            sys.stdout.flush()
+        else:
+            with open(args.output, "wb") as output:
+                export.write_to(db, output)
+    finally:
+        db.close()
+    print(json.dumps(export.summary()), file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="CervixAI operations")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    quantize = commands.add_parser("quantize", help="Build an int8-quantized model variant")
+    quantize.add_argument("--mode", choices=("dynamic", "static"), default="dynamic")
+    quantize.add_argument("--images", help="Directory of calibration images (default: stored samples)")
+    quantize.add_argument("--limit", type=int, default=200, help="Maximum calibration images")
+    quantize.set_defaults(func=cmd_quantize)
+
+    drift = commands.add_parser("drift-report", help="Compare int8 and FP32 confidence scores")
+    drift.add_argument("--precision", choices=("int8_dynamic", "int8_static"), default="int8_dynamic")
+    drift.add_argument("--images", help="Directory of evaluation images (default: stored samples)")
+    drift.add_argument("--limit", type=int, default=500, help="Maximum evaluation images")
+    drift.add_argument("--max-abs-diff", type=float, default=0.05,
+                       help="Largest acceptable per-class score difference")
+    drift.add_argument("--min-agreement", type=float, default=0.99,
+                       help="Smallest acceptable top-1 agreement")
+    drift.add_argument("--output", help="Write the JSON report here instead of stdout")
+    drift.set_defaults(func=cmd_drift_report)
+
+    tensors = commands.add_parser("tensor-store", help="Manage the preprocessed tensor store")
+    tensors.add_argument("action", choices=("stats", "warm", "prune"))
+    tensors.add_argument("--images", help="Directory of images to warm (default: stored samples)")
+    tensors.add_argument("--limit", type=int, default=10000, help="Maximum images to warm")
+    tensors.set_defaults(func=cmd_tensor_store)
+
+    backfill = commands.add_parser("backfill", help="Re-analyze samples for the loaded model version")
+    backfill.add_argument("--target-version", help="Model version to backfill (default: loaded model)")
+    backfill.add_argument("--chunk-size", type=int, help="Samples per checkpointed chunk")
+    backfill.add_argument("--rate", type=float, help="Maximum images per second (0 = unthrottled)")
+    backfill.add_argument("--resume", metavar="CAMPAIGN_ID", help="Resume an existing campaign")
+    backfill.set_defaults(func=cmd_backfill)
+
+    db = commands.add_parser("db", help="Schema migrations")
+    db.add_argument("action", choices=("upgrade", "downgrade", "current", "history", "stamp", "revision"))
+    db.add_argument("--revision", help="Target revision (default: head)")
+    db.add_argument("-m", "--message", help="Message for a new revision")
+    db.add_argument("--autogenerate", action="store_true", help="Diff the models against the database")
+    db.add_argument("--sql", action="store_true", help="Print upgrade/downgrade SQL instead of running it")
+    db.set_defaults(func=cmd_db)
+
+    index_audit = commands.add_parser("index-audit", help="Check that API queries use indexes (EXPLAIN)")
+    index_audit.add_argument("--seed", type=int, metavar="PATIENTS",
+                             help="First fill an empty database with synthetic rows")
+    index_audit.add_argument("--verbose", action="store_true", help="Print every plan")
+    index_audit.set_defaults(func=cmd_index_audit)
+
+    audit = commands.add_parser("audit-maintenance",
+                                help="Create audit log partitions and drop expired ones")
+    audit.set_defaults(func=cmd_audit_maintenance)
+
+    counters = commands.add_parser("rebuild-counters",
+                                   help="Recount list totals and dashboard statistics")
+    counters.set_defaults(func=cmd_rebuild_counters)
+
+    patients = commands.add_parser("import-patients", help="Bulk-import patients from CSV or NDJSON")
+    patients.add_argument("path", help="File to import, or - for stdin")
+    patients.add_argument("--format", choices=("csv", "ndjson"), help="Default: from the file extension")
+    patients.add_argument("--chunk-size", type=int, default=1000, help="Rows per insert and commit")
+    patients.add_argument("--dry-run", action="store_true", help="Validate and deduplicate without writing")
+    patients.set_defaults(func=cmd_import_patients)
+
+    export = commands.add_parser("export", help="Stream a research/registry export")
+    export.add_argument("entity", choices=("patients", "screenings", "diagnoses", "samples", "ai_results",
+                                           "annotations"))
+    export.add_argument("--format", choices=("ndjson", "csv", "parquet"), default="ndjson")
+    export.add_argument("--since", help="Only rows changed after this watermark (the previous export's 'until')")
+    export.add_argument("--identified", action="store_true",
+                        help="Keep identifiers and free text (default: de-identified)")
+    export.add_argument("--batch-size", type=int, help="Rows per fetch (default: EXPORT_BATCH_SIZE)")
+    export.add_argument("--output", "-o", default="-", help="Output file (default: stdout)")
+    export.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+"""
+CervixAI Entity Cache
+Read-through cache for single-entity reads: patients, screenings, the
+diagnosis of a screening and image metadata.
+
+Values are the serialized API responses. They are stored in Redis when
+``REDIS_URL`` is set and the ``redis`` package is installed, shared by all
+workers and kept for ``CACHE_TTL_SECONDS``. Otherwise they go to a
+per-process LRU of ``CACHE_MAX_ENTRIES``, kept for
+``CACHE_MEMORY_TTL_SECONDS``. The TTL is shorter there because another
+worker's writes cannot evict this worker's copy.
+
+Invalidation: a session hook collects the cache keys of ``Patient``,
+``Screening``, ``Diagnosis`` and ``ScreeningImage`` rows updated or deleted
+in a flush, and deletes them after the transaction commits. So every route,
+service and background task that writes through the ORM invalidates what it
+changed. Bulk Core ``UPDATE`` statements bypass the hook, and the TTL bounds
+how stale such rows can get.
+
+Stampedes: concurrent misses for one key in a process are coalesced. One
+caller loads and the others wait for its result. Cache errors (Redis down)
+are logged and counted, and reads fall through to the database.
+
+Races with writes: each key has a generation counter in the backend, bumped
+by every invalidation. A loader reads the generation before querying and
+stores its result only if the generation is unchanged, in one atomic step
+(a Lua script on Redis). A load that overlapped a write in any worker is
+returned but not kept, so it cannot overwrite the invalidation.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.identifiers import InvalidIdentifierError, parse_id
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cervixai:entity:"
+GENERATION_PREFIX = "cervixai:entity-gen:"
+
+# Generations outlive any load in flight; an expired one reads as "0"
+GENERATION_TTL_SECONDS = 3600
+
+# Seconds a coalesced caller waits for the loading one before loading itself
+COALESCE_WAIT_SECONDS = 5.0
+
+# Table -> (cached entity, attribute holding its key)
+CACHED_TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "patients": [("patient", "id")],
+    "screenings": [("screening", "id")],
+    "diagnoses": [("diagnosis_by_screening", "screening_id")],
+    "screening_images": [("image", "id")],
+}
+
+ENTITIES = tuple(entity for keys in CACHED_TABLES.values() for entity, _ in keys)
+
+
+class MemoryBackend:
+    """Size-bounded LRU with per-entry expiry, for one process."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _set(self, key: str, value: str, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def generation(self, key: str) -> str:
+        with self._lock:
+            return self._get(key) or "0"
+
+    def bump(self, keys: Iterable[str], ttl: float):
+        with self._lock:
+            for key in keys:
+                self._set(key, str(int(self._get(key) or 0) + 1), ttl)
+
+    def set_if_generation(self, key: str, value: str, ttl: float, generation_key: str, generation: str) -> bool:
+        with self._lock:
+            if (self._get(generation_key) or "0") != generation:
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def delete(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+# KEYS: value key, generation key; ARGV: value, ttl, expected generation
+_SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[3] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+class RedisBackend:
+    """Shared cache in Redis; short socket timeouts so an outage degrades to misses."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._set_if_generation = self.client.register_script(_SET_IF_GENERATION)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: float):
+        self.client.set(key, value, ex=max(1, int(ttl)))
+
+    def delete(self, keys: Iterable[str]):
+        keys = list(keys)
+        if keys:
+            self.client.delete(*keys)
+
+    def delete_prefix(self, prefix: str):
+        keys = list(self.client.scan_iter(match=f"{prefix}*", count=1000))
+        if keys:
+            self.client.delete(*keys)
+
+    def generation(self, key: str) -> str:
+        value = self.client.get(key)
+        return value.decode() if value is not None else "0"
+
+    def bump(self, keys: Iterable[str], ttl: float):
+        pipeline = self.client.pipeline()
+        for key in keys:
+            pipeline.incr(key)
+            pipeline.expire(key, max(1, int(ttl)))
+        pipeline.execute()
+
+    def set_if_generation(self, key: str, value: str, ttl: float, generation_key: str, generation: str) -> bool:
+        return bool(self._set_if_generation(keys=[key, generation_key], args=[value, max(1, int(ttl)), generation]))
+
+
+class EntityStats:
+    """Hit ratio and latency counters for one entity type."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.errors = 0
+        self.hit_seconds = 0.0
+        self.load_seconds = 0.0
+        self.load_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, elapsed: float):
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+                self.hit_seconds += elapsed
+            else:
+                if outcome == "coalesced":
+                    self.coalesced += 1
+                self.misses += 1
+                self.load_seconds += elapsed
+                self.load_seconds_max = max(self.load_seconds_max, elapsed)
+
+    def count(self, field: str, amount: int = 1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "hit_ms_avg": round(self.hit_seconds / self.hits * 1000, 3) if self.hits else None,
+            "load_ms_avg": round(self.load_seconds / self.misses * 1000, 3) if self.misses else None,
+            "load_ms_max": round(self.load_seconds_max * 1000, 3),
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+class _Flight:
+    """A load in progress that concurrent misses wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Optional[str] = None
+        self.failed = False
+
+
+class EntityCache:
+    """Read-through cache of serialized entities; see the module docstring."""
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats: Dict[str, EntityStats] = {entity: EntityStats() for entity in ENTITIES}
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(entity: str, entity_id) -> str:
+        return f"{KEY_PREFIX}{entity}:{parse_id(entity_id)}"
+
+    @staticmethod
+    def generation_key(key: str) -> str:
+        return GENERATION_PREFIX + key[len(KEY_PREFIX):]
+
+    def _backend_call(self, entity: str, method: str, *args):
+        try:
+            return getattr(self.backend, method)(*args)
+        except Exception as exc:
+            self.stats[entity].count("errors")
+            logger.warning("Entity cache %s %s failed: %s", self.backend.name, method, exc)
+            return None
+
+    def get_or_load(self, entity: str, entity_id: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """
+        The cached value of an entity, or ``loader()`` (a JSON-compatible
+        dict, or None when it does not exist) stored for next time.
+        """
+        try:
+            key = self.key(entity, entity_id)
+        except InvalidIdentifierError:
+            return loader()  # Cannot match a row; the loader reports it
+        stats = self.stats[entity]
+        started = time.perf_counter()
+
+        cached = self._backend_call(entity, "get", key)
+        if cached is not None:
+            stats.record("hit", time.perf_counter() - started)
+            return json.loads(cached)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(COALESCE_WAIT_SECONDS) and not flight.failed:
+                stats.record("coalesced", time.perf_counter() - started)
+                return json.loads(flight.value) if flight.value is not None else None
+            value = loader()
+            stats.record("miss", time.perf_counter() - started)
+            return value
+
+        generation_key = self.generation_key(key)
+        generation = self._backend_call(entity, "generation", generation_key)
+        try:
+            value = loader()
+            flight.value = json.dumps(value) if value is not None else None
+        except BaseException:
+            flight.failed = True
+            raise
+        finally:
+            if flight.value is not None and generation is not None:
+                # Not kept if invalidated while loading: the value may predate the write
+                self._backend_call(
+                    entity, "set_if_generation", key, flight.value, self.ttl, generation_key, generation
+                )
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        stats.record("miss", time.perf_counter() - started)
+        return value
+
+    def invalidate(self, keys: Iterable[Tuple[str, str]]):
+        """Drop ``(entity, id)`` pairs from the cache."""
+        by_entity: Dict[str, List[str]] = {}
+        for entity, entity_id in keys:
+            try:
+                by_entity.setdefault(entity, []).append(self.key(entity, entity_id))
+            except InvalidIdentifierError:
+                continue
+        for entity, entity_keys in by_entity.items():
+            # Bump first: a load that read the old generation can no longer store
+            self._backend_call(
+                entity, "bump", [self.generation_key(key) for key in entity_keys], GENERATION_TTL_SECONDS
+            )
+            self._backend_call(entity, "delete", entity_keys)
+            self.stats[entity].count("invalidations", len(entity_keys))
+
+    def clear(self):
+        self._backend_call(ENTITIES[0], "delete_prefix", KEY_PREFIX)
+
+    def status(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl,
+            "entities": {entity: stats.snapshot() for entity, stats in self.stats.items()},
+        }
+
+
+def read_through(entity: str, entity_id: str, schema, load: Callable[[], object]) -> Optional[dict]:
+    """
+    ``entity_cache.get_or_load`` for a row read by ``load()`` (None when
+    missing) and serialized as the response ``schema``.
+    """
+    def loader():
+        row = load()
+        return schema.model_validate(row).model_dump(mode="json") if row is not None else None
+
+    return entity_cache.get_or_load(entity, entity_id, loader)
+
+
+def build_backend(max_entries: int):
+    """Redis when configured and installed, else an in-process LRU of ``max_entries``."""
+    if settings.redis_url:
+        try:
+            return RedisBackend(settings.redis_url)
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed; using the in-process cache")
+    return MemoryBackend(max_entries)
+
+
+def _build_cache() -> EntityCache:
+    backend = build_backend(settings.cache_max_entries)
+    ttl = settings.cache_ttl_seconds if backend.name == "redis" else settings.cache_memory_ttl_seconds
+    return EntityCache(backend, ttl)
+
+
+entity_cache = _build_cache()
+
+
+def _changed_keys(session: Session) -> List[Tuple[str, str]]:
+    keys = []
+    for instance in list(session.dirty) + list(session.deleted):
+        table = getattr(instance, "__tablename__", None)
+        if table not in CACHED_TABLES:
+            continue
+        if instance not in session.deleted and not session.is_modified(instance):
+            continue
+        state = inspect(instance)
+        for entity, attribute in CACHED_TABLES[table]:
+            history = state.attrs[attribute].history
+            for value in {*history.deleted, *history.unchanged, *history.added}:
+                if value is not None:
+                    keys.append((entity, value))
+    return keys
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_cache_invalidations(session, flush_context):
+    keys = _changed_keys(session)
+    if keys:
+        session.info.setdefault("entity_cache_invalidations", set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_cache_invalidations(session):
+    keys = session.info.pop("entity_cache_invalidations", None)
+    if keys:
+        entity_cache.invalidate(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_cache_invalidations(session):
+    session.info.pop("entity_cache_invalidations", None)
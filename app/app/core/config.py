@@ -23,6 +23,30 @@ class Settings(BaseSettings):
         validation_alias="DATABASE_URL"
     )
     
+    # Connection pool, per engine and worker process
+    db_pool_mode: str = Field(default="queue", validation_alias="DB_POOL_MODE")  # queue, transaction (behind PgBouncer)
+    db_pool_size: int = 20
+    db_max_overflow: int = 10  # Extra connections opened under burst load
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Replace connections older than this (-1: never)
+    db_pool_pre_ping: bool = True
+    
+    # SQLite tuning (see app/db/sqlite.py)
+    sqlite_profile: str = Field(default="production", validation_alias="SQLITE_PROFILE")  # production, default
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_mb: int = 256
+    sqlite_cache_size_mb: int = 64
+    
+    # Read replicas (optional, comma-separated) for read-only endpoints
+    database_replica_urls: Optional[str] = Field(default=None, validation_alias="DATABASE_REPLICA_URLS")
+    replica_health_check_seconds: float = 10.0
+    replica_max_lag_seconds: float = 30.0  # Lagging replicas leave the rotation
+    replica_connect_timeout_seconds: float = 5.0  # An unreachable replica fails fast
+    read_your_writes_seconds: float = 5.0  # Reads stay on the primary after a user's write
+    
+    # Apply pending migrations on startup; disable to migrate as a deploy step
+    auto_migrate: bool = True
+    
     # Async database URL for async operations
     async_database_url: Optional[str] = Field(
         default=None,
@@ -45,6 +69,12 @@ class Settings(BaseSettings):
     # Redis Cache (optional)
     redis_url: Optional[str] = Field(default=None, validation_alias="REDIS_URL")
     cache_ttl_seconds: int = 300  # 5 minutes default
+    cache_memory_ttl_seconds: int = 30  # In-process fallback; other workers' writes cannot evict it
+    cache_max_entries: int = 10000  # Entities held by the in-process fallback
+    principal_cache_ttl_seconds: int = 60  # Authenticated users; role and deactivation changes evict sooner
+    principal_cache_max_entries: int = 5000  # In-process fallback
+    count_cache_ttl_seconds: int = 60  # List totals with count=cached
+    count_cache_max_entries: int = 1000
     
     # RabbitMQ (optional for async processing)
     rabbitmq_url: Optional[str] = Field(default=None, validation_alias="RABBITMQ_URL")
@@ -56,7 +86,17 @@ class Settings(BaseSettings):
     
     # AI Processing
     ai_model_path: str = Field(default="./models", validation_alias="AI_MODEL_PATH")
+    ai_model_precision: str = Field(default="fp32", validation_alias="AI_MODEL_PRECISION")  # fp32, int8_dynamic, int8_static
     ai_confidence_threshold: float = 0.85
+    ai_inference_workers: int = 4  # Threads used to fan out image analysis
+    ai_batch_chunk_size: int = 16  # Samples analyzed and committed together
+    
+    # Model-version backfill
+    backfill_chunk_size: int = 32
+    backfill_rate_limit: Optional[float] = 2.0  # images/s, keeps headroom for live traffic
+    
+    # Preprocessed tensor store for re-analysis (optional)
+    tensor_store_dir: Optional[str] = Field(default=None, validation_alias="TENSOR_STORE_DIR")
     
     # Security
     bcrypt_rounds: int = 12
@@ -67,6 +107,14 @@ class Settings(BaseSettings):
     # Compliance
     enable_audit_logging: bool = True
     audit_log_retention_days: int = 2555  # ~7 years for HIPAA compliance
+    audit_partition_months_ahead: int = 3  # Monthly audit_logs partitions kept ready (PostgreSQL)
+    audit_retention_mode: str = "drop"  # drop, detach (keep expired partitions as standalone tables)
+    audit_maintenance_interval_hours: float = 24  # 0 disables the background run
+    
+    # Research and registry exports
+    export_batch_size: int = 2000  # Rows fetched per round trip (yield_per)
+    export_watermark_lag_seconds: int = 60  # Newer rows wait for the next incremental export
+    export_pseudonym_key: Optional[str] = Field(default=None, validation_alias="EXPORT_PSEUDONYM_KEY")  # Default: SECRET_KEY
     
     class Config:
         env_file = ".env"
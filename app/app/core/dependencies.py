@@ -1,49 +1,149 @@
 """
 CervixAI FastAPI Dependencies
 """
-from typing import Optional
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import AsyncGenerator, Generator, Optional
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db, AsyncSessionLocal
+from app.db.replicas import PRIMARY_COOKIE, async_read_session, primary_pinned, read_session
+from app.db.unit_of_work import UnitOfWork, AsyncUnitOfWork
+from app.core.permissions import permission_registry
+from app.core.principal import Principal, principal_cache
 from app.core.security import oauth2_scheme, decode_token
 from app.models import User, UserRole
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def _token_user_id(token: str) -> str:
+    """User ID from a valid access token."""
     payload = decode_token(token)
     user_id: str = payload.get("sub")
     token_type: str = payload.get("type")
     
     if user_id is None or token_type != "access":
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return user_id
+
+
+def _check_user(principal: Optional[Principal]) -> Principal:
+    if principal is None:
+        raise _credentials_exception()
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is deactivated"
         )
     
+    return principal
+
+
+def _cached_principal(token: str, user: Optional[User], generation: Optional[str]) -> Optional[Principal]:
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.set(token, principal, generation)
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Get the authenticated principal from the JWT token. Served from the
+    principal cache when possible; the session is only used on a miss.
+    """
+    user_id = _token_user_id(token)
+    principal = principal_cache.get(user_id, token)
+    if principal is None:
+        generation = principal_cache.generation(user_id)  # Before the load, to detect a racing change
+        permission_registry.refresh_if_stale(db)
+        user = db.query(User).options(joinedload(User.role_ref)).filter(User.id == user_id).first()
+        principal = _cached_principal(token, user, generation)
+    return _check_user(principal)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Async variant of ``get_current_user`` on the request's async session."""
+    user_id = _token_user_id(token)
+    principal = principal_cache.get(user_id, token)
+    if principal is None:
+        generation = principal_cache.generation(user_id)
+        await db.run_sync(permission_registry.refresh_if_stale)
+        user = await db.get(User, user_id, options=[joinedload(User.role_ref)])
+        principal = _cached_principal(token, user, generation)
+    return _check_user(principal)
+
+
+def get_current_user_record(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """The current user's full row, for endpoints that read or edit the profile."""
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise _credentials_exception()
     return user
 
 
+def get_uow(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+) -> UnitOfWork:
+    """Request-scoped unit of work; audit entries are attributed to the current user."""
+    return UnitOfWork(db, current_user, request.client.host if request.client else None)
+
+
+async def get_async_uow(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+) -> AsyncUnitOfWork:
+    """Async variant of ``get_uow`` on the request's async session."""
+    return AsyncUnitOfWork(db, current_user, request.client.host if request.client else None)
+
+
+def get_read_db(request: Request, token: str = Depends(oauth2_scheme)) -> Generator:
+    """
+    Session for read-only endpoints: a healthy replica when configured,
+    the primary when the user wrote within the read-your-writes window.
+    """
+    db = read_session(primary_pinned(_token_user_id(token), request.cookies.get(PRIMARY_COOKIE)))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request, token: str = Depends(oauth2_scheme)) -> AsyncGenerator:
+    """Async variant of ``get_read_db``."""
+    pinned = primary_pinned(_token_user_id(token), request.cookies.get(PRIMARY_COOKIE))
+    session = await async_read_session(pinned)
+    if session is None:
+        if AsyncSessionLocal is None:
+            raise RuntimeError("Async database not configured")
+        session = AsyncSessionLocal()
+    async with session:
+        yield session
+
+
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Ensure user is active."""
     if not current_user.is_active:
         raise HTTPException(
@@ -55,8 +155,10 @@ async def get_current_active_user(
 
 def require_role(*allowed_roles: str):
     """Dependency factory for role-based access control."""
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in allowed_roles:
+    allowed = frozenset(allowed_roles)
+
+    async def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required roles: {', '.join(allowed_roles)}"
@@ -65,6 +167,33 @@ def require_role(*allowed_roles: str):
     return role_checker
 
 
+def _permission_checker(resource: str, action: str, principal_dependency):
+    mask = permission_registry.mask(resource, action)  # Once per route, not per request
+
+    async def permission_checker(current_user: Principal = Depends(principal_dependency)) -> Principal:
+        if not permission_registry.allows(current_user.permission_role or current_user.role, mask):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Access denied. Required permission: {resource}:{action}"
+            )
+        return current_user
+    return permission_checker
+
+
+def require_permission(resource: str, action: str):
+    """
+    Dependency factory for permission-based access control, e.g.
+    ``require_permission("diagnoses", "approve")``. Checks the principal's
+    compiled role permissions without database access.
+    """
+    return _permission_checker(resource, action, get_current_user)
+
+
+def require_permission_async(resource: str, action: str):
+    """``require_permission`` for routes on the async session."""
+    return _permission_checker(resource, action, get_current_user_async)
+
+
 # Pre-built role dependencies
 require_admin = require_role(UserRole.ADMIN.value)
 require_pathologist = require_role(UserRole.ADMIN.value, UserRole.PATHOLOGIST.value)
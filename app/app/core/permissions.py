@@ -0,0 +1,142 @@
+"""
+CervixAI Permissions
+Role permissions compiled into bitsets, so that a permission check is one
+dictionary lookup and one AND.
+
+Each ``(resource, action)`` pair gets a bit on first use, and so does each
+resource's ``"*"`` wildcard. A role compiles to the OR of its pairs' bits. A
+check passes if the role's bits intersect the mask of the pair or of its
+wildcard, and ``require_permission`` computes that mask once, when the route
+is declared.
+
+Roles compile from ``DEFAULT_ROLES``, overlaid by rows of the ``roles``
+table with the same name or new names. A user's permissions are those of
+``role_ref`` when set, else of the role named by their legacy ``role``
+string. The table is read at startup. Role rows changed through the ORM are
+recompiled when their transaction commits. Other workers reload the table
+at most every ``PRINCIPAL_CACHE_TTL_SECONDS``, on a principal cache miss,
+which already queries the database. Permission checks never do.
+"""
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+WILDCARD = "*"
+
+
+class PermissionRegistry:
+    """Compiled permissions of every role; see the module docstring."""
+
+    def __init__(self):
+        self._bits: Dict[Tuple[str, str], int] = {}
+        self._roles: Optional[Dict[str, int]] = None
+        self._overrides: Dict[str, Optional[dict]] = {}
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+
+    def bit(self, resource: str, action: str) -> int:
+        """The bit of a pair, allocated on first use and never reassigned."""
+        pair = (resource, action)
+        bit = self._bits.get(pair)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(pair, 1 << len(self._bits))
+        return bit
+
+    def mask(self, resource: str, action: str) -> int:
+        """Bits granting ``action`` on ``resource``: the pair or the resource wildcard."""
+        return self.bit(resource, action) | self.bit(resource, WILDCARD)
+
+    def compile(self, permissions: dict) -> int:
+        """Bitset of a ``{"resource": ["action", ...]}`` permission dict."""
+        bits = 0
+        for resource, actions in (permissions or {}).items():
+            for action in actions:
+                bits |= self.bit(resource, action)
+        return bits
+
+    def _compile_roles(self) -> Dict[str, int]:
+        from app.models.role import DEFAULT_ROLES
+
+        roles = {role["role_name"]: self.compile(role["permissions"]) for role in DEFAULT_ROLES}
+        for name, permissions in self._overrides.items():
+            if permissions is None:
+                roles.pop(name, None)
+            else:
+                roles[name] = self.compile(permissions)
+        return roles
+
+    def load(self, roles: Iterable[Tuple[str, dict]]):
+        """Recompile from ``(role_name, permissions)`` rows of the roles table."""
+        self._overrides = {name: permissions for name, permissions in roles}
+        self._roles = self._compile_roles()
+        self.loaded_at = time.monotonic()
+
+    def update_roles(self, changes: Dict[str, Optional[dict]]):
+        """Recompile after roles were saved (permissions) or deleted (None)."""
+        overrides = dict(self._overrides)
+        for name, permissions in changes.items():
+            if permissions is None:
+                overrides.pop(name, None)
+            else:
+                overrides[name] = permissions
+        self._overrides = overrides
+        self._roles = self._compile_roles()
+
+    def refresh(self, db: Session):
+        from app.models.role import Role
+
+        self.load(db.query(Role.role_name, Role.permissions).all())
+
+    def refresh_if_stale(self, db: Session):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > settings.principal_cache_ttl_seconds:
+            self.refresh(db)
+
+    def role_bits(self, role: Optional[str]) -> int:
+        roles = self._roles
+        if roles is None:
+            roles = self._roles = self._compile_roles()
+        return roles.get(role, 0)
+
+    def allows(self, role: Optional[str], mask: int) -> bool:
+        return bool(self.role_bits(role) & mask)
+
+    def has_permission(self, role: Optional[str], resource: str, action: str) -> bool:
+        return self.allows(role, self.mask(resource, action))
+
+
+permission_registry = PermissionRegistry()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_role_changes(session, flush_context):
+    changes = {}
+    for instance in list(session.new) + list(session.dirty):
+        if getattr(instance, "__tablename__", None) != "roles":
+            continue
+        for old_name in inspect(instance).attrs.role_name.history.deleted:
+            if old_name:
+                changes[old_name] = None  # Renamed
+        changes[instance.role_name] = dict(instance.permissions or {})
+    for instance in session.deleted:
+        if getattr(instance, "__tablename__", None) == "roles":
+            changes[instance.role_name] = None
+    if changes:
+        session.info.setdefault("role_changes", {}).update(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_role_changes(session):
+    changes = session.info.pop("role_changes", None)
+    if changes:
+        permission_registry.update_roles(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_role_changes(session):
+    session.info.pop("role_changes", None)
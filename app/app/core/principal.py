@@ -0,0 +1,171 @@
+"""
+CervixAI Principal Cache
+The authenticated caller of a request, cached so that authentication does not
+query the users table on every request.
+
+A ``Principal`` holds only what authorization needs: id, email, role,
+is_active, and the role whose compiled permissions apply (see
+``app.core.permissions``). ``get_current_user`` looks it up by user ID and a
+digest of the bearer token. On a hit the request authenticates without
+touching the database. Entries live for ``PRINCIPAL_CACHE_TTL_SECONDS``. They are stored in
+Redis when ``REDIS_URL`` is set (see ``app.core.cache``), otherwise in a
+per-process LRU of ``PRINCIPAL_CACHE_MAX_ENTRIES``.
+
+A commit that changes a user's active flag, role, email or password, or
+deletes the user, evicts all of that user's entries. With Redis the eviction
+reaches every worker. With the in-process fallback it reaches only the
+committing worker, and the TTL bounds how long others keep the old entry.
+Out-of-band SQL changes can call ``principal_cache.invalidate(user_id)``.
+
+Eviction also bumps a per-user generation in the same backend. A miss reads
+it before loading the user and stores the principal only if it is unchanged,
+so a load that raced a change (in any worker) cannot re-cache the old
+principal.
+"""
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.cache import GENERATION_TTL_SECONDS, build_backend
+from app.core.config import settings
+from app.core.permissions import permission_registry
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cervixai:principal:"
+GENERATION_PREFIX = "cervixai:principal-gen:"
+
+# User columns a cached principal depends on
+PRINCIPAL_COLUMNS = ("is_active", "role", "role_id", "email", "hashed_password")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user of a request, detached from any session."""
+    id: str
+    email: str
+    role: str
+    is_active: bool
+    permission_role: Optional[str] = None  # role_ref's name, else the legacy role
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """From a ``User`` with ``role_ref`` loaded; the role is resolved here, once."""
+        return cls(
+            id=str(user.id), email=user.email, role=user.role, is_active=bool(user.is_active),
+            permission_role=user.role_ref.role_name if user.role_ref is not None else user.role
+        )
+
+    def has_permission(self, resource: str, action: str) -> bool:
+        return permission_registry.has_permission(self.permission_role or self.role, resource, action)
+
+
+class PrincipalCache:
+    """Principals by user ID and token digest; see the module docstring."""
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def _user_prefix(user_id: str) -> str:
+        return f"{KEY_PREFIX}{user_id}:"
+
+    def _key(self, user_id: str, token: str) -> str:
+        return self._user_prefix(user_id) + hashlib.sha256(token.encode()).hexdigest()[:32]
+
+    def get(self, user_id: str, token: str) -> Optional[Principal]:
+        try:
+            cached = self.backend.get(self._key(user_id, token))
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Principal cache read failed: %s", exc)
+            cached = None
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Principal(**json.loads(cached))
+
+    def generation(self, user_id: str) -> Optional[str]:
+        """The user's invalidation generation; read before loading, pass to ``set``."""
+        try:
+            return self.backend.generation(f"{GENERATION_PREFIX}{user_id}")
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Principal cache read failed: %s", exc)
+            return None
+
+    def set(self, token: str, principal: Principal, generation: Optional[str]):
+        """Store a principal unless the user was invalidated since ``generation`` was read."""
+        if generation is None:
+            return
+        try:
+            self.backend.set_if_generation(
+                self._key(principal.id, token), json.dumps(asdict(principal)), self.ttl,
+                f"{GENERATION_PREFIX}{principal.id}", generation
+            )
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Principal cache write failed: %s", exc)
+
+    def invalidate(self, user_id: str):
+        """Evict every cached token of a user."""
+        try:
+            # Bump first: a load that read the old generation can no longer store
+            self.backend.bump([f"{GENERATION_PREFIX}{user_id}"], GENERATION_TTL_SECONDS)
+            self.backend.delete_prefix(self._user_prefix(str(user_id)))
+        except Exception as exc:
+            # The entries expire within the TTL
+            self.errors += 1
+            logger.warning("Principal cache invalidation failed for user %s: %s", user_id, exc)
+
+    def status(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "errors": self.errors,
+        }
+
+
+principal_cache = PrincipalCache(
+    build_backend(settings.principal_cache_max_entries), settings.principal_cache_ttl_seconds
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_invalidations(session, flush_context):
+    user_ids = set()
+    for instance in list(session.dirty) + list(session.deleted):
+        if getattr(instance, "__tablename__", None) != "users":
+            continue
+        state = inspect(instance)
+        if instance in session.deleted or any(
+            state.attrs[column].history.has_changes() for column in PRINCIPAL_COLUMNS
+        ):
+            user_ids.add(instance.id)
+    if user_ids:
+        session.info.setdefault("principal_invalidations", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_principal_invalidations(session):
+    for user_id in session.info.pop("principal_invalidations", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_invalidations(session):
+    session.info.pop("principal_invalidations", None)
@@ -0,0 +1,247 @@
+"""
+CervixAI Audit Log Partitions
+Monthly range partitions of ``audit_logs`` on PostgreSQL, and retention.
+
+Migration ``0004_audit_partitions`` turns ``audit_logs`` into a table
+partitioned by ``timestamp``. Rows written before the migration stay in
+``audit_logs_legacy`` (everything up to the first month after the
+migration); later rows go to ``audit_logs_yYYYYmMM``; ``audit_logs_default``
+catches anything outside the partitions that exist.
+
+``maintain_audit_logs`` keeps ``AUDIT_PARTITION_MONTHS_AHEAD`` months of
+partitions ready and enforces ``audit_log_retention_days`` by detaching
+partitions that lie entirely before the cutoff and dropping them, or
+keeping them as standalone tables for archival with
+``AUDIT_RETENTION_MODE=detach``. ``audit_logs_legacy`` holds all history
+from before the migration and expires whole only once its newest month
+does, so in ``drop`` mode its expired rows are deleted in batches until
+then. On other databases retention deletes expired rows in batches.
+
+It runs at startup, every ``AUDIT_MAINTENANCE_INTERVAL_HOURS`` and from
+``python -m app.cli audit-maintenance``.
+"""
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT = "audit_logs"
+LEGACY_PARTITION = "audit_logs_legacy"
+DEFAULT_PARTITION = "audit_logs_default"
+
+_BOUND = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+DELETE_BATCH_SIZE = 5000
+
+
+@dataclass
+class AuditPartition:
+    """One partition of ``audit_logs`` and its range (None: unbounded)."""
+    name: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+    is_default: bool = False
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def _parse_bound(value: str) -> Optional[datetime]:
+    value = value.strip().strip("'")
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value)
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether ``audit_logs`` is a partitioned table (PostgreSQL only)."""
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :parent AND c.relnamespace = to_regnamespace(current_schema())"
+    ), {"parent": PARENT}).first())
+
+
+def list_partitions(connection: Connection) -> List[AuditPartition]:
+    """Attached partitions, oldest first."""
+    rows = connection.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT}).all()
+    partitions = []
+    for name, bound in rows:
+        if bound == "DEFAULT":
+            partitions.append(AuditPartition(name, None, None, is_default=True))
+            continue
+        match = _BOUND.search(bound)
+        partitions.append(AuditPartition(name, _parse_bound(match.group(1)), _parse_bound(match.group(2))))
+    return sorted(partitions, key=lambda p: (p.is_default, p.start or datetime.min))
+
+
+def _covered(partitions: List[AuditPartition], moment: datetime) -> bool:
+    return any(
+        not p.is_default and (p.start is None or p.start <= moment) and (p.end is None or moment < p.end)
+        for p in partitions
+    )
+
+
+def create_partition_sql(month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+def ensure_partitions(connection: Connection, months_ahead: Optional[int] = None,
+                      now: Optional[datetime] = None) -> List[str]:
+    """Create this month's and the next ``months_ahead`` months' partitions if missing."""
+    if months_ahead is None:
+        months_ahead = settings.audit_partition_months_ahead
+    first = month_start(now or datetime.utcnow())
+    existing = list_partitions(connection)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if _covered(existing, month):
+            continue
+        try:
+            connection.execute(text(create_partition_sql(month)))
+            connection.commit()
+        except DBAPIError as exc:
+            # Another worker got there first, or the default partition holds rows for this month
+            connection.rollback()
+            logger.warning("Could not create audit partition %s: %s", partition_name(month), exc)
+            continue
+        created.append(partition_name(month))
+    return created
+
+
+def expired_partitions(partitions: List[AuditPartition], cutoff: datetime) -> List[AuditPartition]:
+    """Partitions whose whole range lies before ``cutoff``."""
+    return [p for p in partitions if not p.is_default and p.end is not None and p.end <= cutoff]
+
+
+def _delete_expired_rows(connection: Connection, table: str, cutoff: datetime) -> int:
+    """Delete rows of ``table`` older than ``cutoff``, committing every batch."""
+    deleted = 0
+    while True:
+        result = connection.execute(text(
+            f"DELETE FROM {table} WHERE id IN "
+            f"(SELECT id FROM {table} WHERE timestamp < :cutoff LIMIT {DELETE_BATCH_SIZE})"
+        ), {"cutoff": cutoff})
+        connection.commit()
+        deleted += result.rowcount or 0
+        if (result.rowcount or 0) < DELETE_BATCH_SIZE:
+            break
+    if deleted:
+        logger.info("Deleted %d rows older than %s from %s", deleted, cutoff.date(), table)
+    return deleted
+
+
+def enforce_retention(connection: Connection, retention_days: Optional[int] = None,
+                      mode: Optional[str] = None, now: Optional[datetime] = None) -> List[str]:
+    """
+    Remove audit rows older than the retention period.
+
+    Partitioned: detach (and, in ``drop`` mode, drop) whole expired
+    partitions; in ``drop`` mode also delete expired rows of the legacy
+    partition in batches. Otherwise delete expired rows in batches.
+    """
+    retention_days = retention_days if retention_days is not None else settings.audit_log_retention_days
+    mode = mode or settings.audit_retention_mode
+    if mode not in ("drop", "detach"):
+        raise ValueError(f"Unknown AUDIT_RETENTION_MODE {mode!r}; expected 'drop' or 'detach'")
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+
+    if not is_partitioned(connection):
+        _delete_expired_rows(connection, PARENT, cutoff)
+        return []
+
+    partitions = list_partitions(connection)
+    removed = []
+    for partition in expired_partitions(partitions, cutoff):
+        try:
+            # Detaching is a catalog change, but it waits for queries on the
+            # parent; give up quickly rather than queue writers behind it
+            connection.execute(text("SET LOCAL lock_timeout = '5s'"))
+            connection.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name}"))
+            if mode == "drop":
+                connection.execute(text(f"DROP TABLE {partition.name}"))
+            connection.commit()
+        except DBAPIError as exc:
+            connection.rollback()
+            logger.warning("Could not remove audit partition %s, will retry: %s", partition.name, exc)
+            continue
+        logger.info("%s expired audit partition %s", "Dropped" if mode == "drop" else "Detached", partition.name)
+        removed.append(partition.name)
+
+    if mode == "drop" and any(p.name == LEGACY_PARTITION for p in partitions) and LEGACY_PARTITION not in removed:
+        _delete_expired_rows(connection, LEGACY_PARTITION, cutoff)
+    return removed
+
+
+def maintain_audit_logs(engine: Engine) -> dict:
+    """Create upcoming partitions and apply retention."""
+    with engine.connect() as connection:
+        created = ensure_partitions(connection) if is_partitioned(connection) else []
+        connection.commit()
+        removed = enforce_retention(connection)
+    return {"created": created, "removed": removed}
+
+
+class AuditMaintenance:
+    """Runs ``maintain_audit_logs`` periodically in a daemon thread."""
+
+    def __init__(self, engine: Engine, interval_hours: float):
+        self.engine = engine
+        self.interval = interval_hours * 3600
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self):
+        try:
+            return maintain_audit_logs(self.engine)
+        except Exception:
+            # Keep the maintenance thread alive; the next run retries
+            logger.exception("Audit log maintenance failed")
+            return None
+
+    def start(self):
+        """Run now, then keep running in a daemon thread."""
+        if self._thread is not None or self.interval <= 0:
+            return
+        self.run_once()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
@@ -0,0 +1,124 @@
+"""
+CervixAI List Counts
+Total-count strategies for paginated list endpoints.
+
+``exact``      COUNT(*) over the filtered query
+``estimated``  PostgreSQL planner statistics (``reltuples`` for a whole
+               table, the plan's row estimate for a filtered query);
+               falls back to ``exact`` on other databases, or when the
+               filter values cannot be inlined into ``EXPLAIN``
+``cached``     exact count memoized for ``count_cache_ttl_seconds``, in an
+               LRU of at most ``count_cache_max_entries`` queries
+``none``       no count
+
+Responses report the strategy actually used, including ``counter`` when the
+total came from the maintained ``status_counters`` table.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import CompileError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.status_counter import COUNTED_TABLES, status_counts
+
+COUNT_STRATEGIES = ("exact", "estimated", "cached", "none")
+
+# Query key -> (expiry, total), least recently used first
+_cache: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _statement(query):
+    # Accept both Session.query objects and select() statements
+    return getattr(query, "statement", query).order_by(None)
+
+
+def _exact(db: Session, stmt) -> int:
+    return db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
+
+
+def _estimated(db: Session, stmt, table_name: Optional[str]) -> Optional[int]:
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    if table_name and stmt.whereclause is None:
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": table_name}
+        ).scalar()
+        if estimate is not None and estimate >= 0:  # -1 until first ANALYZE
+            return int(estimate)
+    dialect = db.get_bind().dialect
+    try:
+        # Inline the values: EXPLAIN cannot take bind parameters on every driver
+        sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    except CompileError:
+        return None
+    if dialect.identifier_preparer._double_percents:
+        sql = sql.replace("%%", "%")  # Executed without parameters, so not un-escaped by the driver
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {sql}", execution_options={"no_parameters": True}
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached(db: Session, stmt) -> int:
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    key = f"{compiled}|{sorted(compiled.params.items(), key=str)}"
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit and hit[0] > now:
+            _cache.move_to_end(key)
+            return hit[1]
+    total = _exact(db, stmt)
+    with _cache_lock:
+        _store(key, (now + settings.count_cache_ttl_seconds, total), now)
+    return total
+
+
+def _store(key: str, entry: Tuple[float, int], now: float):
+    # Caller holds _cache_lock. Expired entries are pruned first, then the
+    # least recently used until the cache fits.
+    for stale in [k for k, (expires, _) in _cache.items() if expires <= now]:
+        del _cache[stale]
+    _cache[key] = entry
+    _cache.move_to_end(key)
+    while len(_cache) > settings.count_cache_max_entries:
+        _cache.popitem(last=False)
+
+
+def count_rows(
+    db: Session,
+    query,
+    strategy: str = "exact",
+    table_name: Optional[str] = None
+) -> Tuple[Optional[int], str]:
+    """Total rows for a list query; returns (count, strategy used)."""
+    stmt = _statement(query)
+    if strategy == "none":
+        return None, "none"
+    if strategy == "estimated":
+        estimate = _estimated(db, stmt, table_name)
+        if estimate is not None:
+            return estimate, "estimated"
+        strategy = "exact"
+    if strategy == "cached":
+        return _cached(db, stmt), "cached"
+    return _exact(db, stmt), "exact"
+
+
+def counter_total(db: Session, table_name: str, status: Optional[str] = None) -> Tuple[int, str]:
+    """Total from the maintained status counters (optionally for one status)."""
+    if table_name not in COUNTED_TABLES:
+        raise ValueError(f"{table_name} has no maintained counters")
+    counts = status_counts(db, table_name)
+    total = counts.get(status, 0) if status is not None else sum(counts.values())
+    return total, "counter"
@@ -2,27 +2,90 @@
 CervixAI Database Configuration
 Supports both sync and async operations with PostgreSQL/SQLite.
 """
+import uuid
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, AsyncGenerator, Optional
 
 from app.core.config import settings
+from app.db.pool_metrics import instrumented_pool
+
+# Async drivers for each sync URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_url_for(database_url: str) -> Optional[str]:
+    """Derive the async driver URL for a sync database URL, if one is known."""
+    scheme, sep, rest = database_url.partition("://")
+    driver = ASYNC_DRIVERS.get(scheme)
+    return f"{driver}{sep}{rest}" if driver else None
+
+
+def engine_options(url: str, name: str = "primary") -> dict:
+    """
+    Engine keyword arguments shared by the sync and async engines.
+
+    Pool sizing comes from the ``db_pool_*`` settings, and the pool reports
+    to ``app.db.pool_metrics`` as ``name``. With ``DB_POOL_MODE=transaction``
+    the app sits behind a transaction-pooling proxy (PgBouncer): it keeps no
+    pool of its own and disables server-side prepared statements, which
+    would not survive the proxy handing each transaction to a different
+    server connection.
+    """
+    url_obj = make_url(url)
+    dialect = url_obj.get_dialect()
+    options = {}
+    connect_args = {}
+    # Handle SQLite vs PostgreSQL connection args
+    if url_obj.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False
+
+    if settings.db_pool_mode == "transaction":
+        options["poolclass"] = instrumented_pool(NullPool, name)
+        if dialect.driver == "asyncpg":
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+            )
+        elif dialect.driver == "psycopg":
+            connect_args["prepare_threshold"] = None
+    elif settings.db_pool_mode == "queue":
+        pool_class = dialect.get_pool_class(url_obj)
+        if issubclass(pool_class, QueuePool):
+            options.update(
+                poolclass=instrumented_pool(pool_class, name),
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+                pool_recycle=settings.db_pool_recycle,
+            )
+        # else in-memory SQLite: keep its single shared connection
+        options["pool_pre_ping"] = settings.db_pool_pre_ping  # Verify connections before use
+    else:
+        raise ValueError(f"Unknown DB_POOL_MODE {settings.db_pool_mode!r}; expected 'queue' or 'transaction'")
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
 
-# Handle SQLite vs PostgreSQL connection args
-connect_args = {}
-if settings.database_url.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
 
 # Sync engine
-engine = create_engine(
-    settings.database_url,
-    connect_args=connect_args,
-    pool_pre_ping=True,  # Verify connections before use
-    pool_size=5,
-    max_overflow=10
-)
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+
+if engine.dialect.name == "sqlite" and settings.sqlite_profile == "production":
+    from app.db.sqlite import configure_sqlite
+    configure_sqlite(engine)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -55,47 +118,57 @@ def get_db_context():
 
 
 def init_db():
-    """Initialize database tables."""
-    # Import all models to ensure they're registered with Base
-    from app.models import (
-        User, Patient, Screening, ScreeningImage, 
-        Diagnosis, AuditLog
-    )
-    Base.metadata.create_all(bind=engine)
+    """
+    Bring the schema to the latest migration.
+
+    A single version check when the schema is current; see
+    ``app.db.migrations.ensure_schema``.
+    """
+    from app.db.migrations import ensure_schema
+    ensure_schema(engine)
 
 
 def reset_db():
     """Reset database - USE WITH CAUTION."""
+    from sqlalchemy import text
+    from app.db.migrations import ensure_schema
+
     Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    ensure_schema(engine, auto_migrate=True)
 
 
-# Async support (optional, for future use)
+# Async engine - same database and pool configuration, async driver
 async_engine = None
 AsyncSessionLocal = None
 
-if settings.async_database_url:
+ASYNC_DATABASE_URL = settings.async_database_url or async_url_for(settings.database_url)
+
+if ASYNC_DATABASE_URL:
     try:
-        from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-        from sqlalchemy.orm import sessionmaker as async_sessionmaker
-        
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
         async_engine = create_async_engine(
-            settings.async_database_url,
-            pool_pre_ping=True,
-            pool_size=5,
-            max_overflow=10
+            ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, "primary-async")
         )
-        
+        if async_engine.dialect.name == "sqlite" and settings.sqlite_profile == "production":
+            from app.db.sqlite import configure_sqlite
+            configure_sqlite(async_engine.sync_engine, is_async=True)
+
         AsyncSessionLocal = async_sessionmaker(
             async_engine,
             class_=AsyncSession,
+            autoflush=False,
             expire_on_commit=False
         )
     except ImportError:
-        pass
+        # Async driver (asyncpg / aiosqlite) not installed
+        async_engine = None
+        AsyncSessionLocal = None
 
 
-async def get_async_db():
+async def get_async_db() -> AsyncGenerator:
     """Async dependency for database session."""
     if AsyncSessionLocal is None:
         raise RuntimeError("Async database not configured")
@@ -107,3 +180,9 @@ async def get_async_db():
         except Exception:
             await session.rollback()
             raise
+
+
+async def dispose_async_engine():
+    """Close pooled async connections (application shutdown)."""
+    if async_engine is not None:
+        await async_engine.dispose()
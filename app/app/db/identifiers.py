@@ -0,0 +1,116 @@
+"""
+CervixAI Identifiers
+Time-ordered UUIDv7 keys stored compactly.
+
+Random ``uuid4`` keys in ``VARCHAR(36)`` columns cost 37 bytes per key and
+insert at random positions of every primary key and foreign key index, so
+busy tables (``audit_logs``, ``ai_results``, ``annotations``) fragment.
+UUIDv7 keys start with a millisecond timestamp, so new rows append at the
+right edge of the index. ``GUID`` stores them as native ``uuid`` on
+PostgreSQL and as 16-byte blobs on SQLite.
+
+Application code keeps handling keys as canonical strings
+(``"0190b5b2-..."``): ``GUID`` accepts strings or ``uuid.UUID`` values and
+returns strings.
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Optional, Union
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import CHAR, LargeBinary, TypeDecorator
+
+_lock = threading.Lock()
+_last_ms = 0
+_sequence = 0
+
+_SEQUENCE_MAX = 0xFFF
+
+
+class InvalidIdentifierError(ValueError):
+    """A value bound to a ``GUID`` column is not a UUID."""
+
+
+def uuid7() -> uuid.UUID:
+    """
+    A UUIDv7 (RFC 9562): 48-bit Unix milliseconds, then random bits.
+
+    The 12 ``rand_a`` bits are a counter seeded randomly each millisecond,
+    so keys generated by one process are strictly increasing.
+    """
+    global _last_ms, _sequence
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _sequence = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _sequence += 1
+            if _sequence > _SEQUENCE_MAX:
+                # Counter exhausted (or the clock went back): borrow the next millisecond
+                _last_ms += 1
+                _sequence = 0
+        timestamp, sequence = _last_ms, _sequence
+
+    value = (timestamp & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= sequence << 64
+    value |= 0b10 << 62
+    value |= int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """Default for primary key columns."""
+    return str(uuid7())
+
+
+def parse_id(value: Union[str, uuid.UUID]) -> uuid.UUID:
+    """Accept a UUID in any form ``uuid.UUID`` parses (hyphenated, hex, URN)."""
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise InvalidIdentifierError(f"Invalid identifier: {value!r}") from None
+
+
+class GUID(TypeDecorator):
+    """UUID column: native ``uuid`` on PostgreSQL, ``BLOB(16)`` elsewhere."""
+
+    impl = CHAR(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect) -> Optional[Union[uuid.UUID, bytes]]:
+        if value is None:
+            return None
+        parsed = parse_id(value)
+        return parsed if dialect.name == "postgresql" else parsed.bytes
+
+    def literal_processor(self, dialect):
+        # Rendered directly: the blob impl has no literal form of its own
+        def process(value) -> str:
+            parsed = parse_id(value)
+            if dialect.name == "postgresql":
+                return f"'{parsed}'::uuid"
+            return f"X'{parsed.hex}'"
+        return process
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            return str(uuid.UUID(bytes=value))
+        # uuid.UUID from psycopg/asyncpg, or a text key not yet converted
+        return str(value)
+
+    @property
+    def python_type(self):
+        return str
@@ -0,0 +1,158 @@
+"""
+CervixAI JSON Attributes
+Indexed filters on JSON clinical attributes (risk factors, contact details,
+sample metadata, AI confidence scores, annotation override flags).
+
+Columns use ``JSONDocument``, which is ``JSONB`` on PostgreSQL and ``JSON``
+elsewhere. List endpoints take filters as ``path:value`` (equality),
+``path:op:value`` with ``op`` one of ``gt``, ``gte``, ``lt`` or ``lte``, or a
+bare ``path`` (true). Paths may be dotted for nested objects. Values are
+booleans, numbers or strings; quote a value to compare it as a string::
+
+    /patients?risk_factor=hpv_positive
+    /patients?risk_factor=hpv_type:"16"
+    /ai-results?score=hsil:gt:0.3
+    /patients?contact=address.city:Pune
+
+PostgreSQL: equality is JSONB containment (``@>``), served by a GIN
+``jsonb_path_ops`` index on each column. Range filters on ``INDEXED_KEYS``
+use expression indexes on ``(column ->> key)::float``. SQLite: each indexed
+key has a virtual generated column ``jx_<column>_<key>`` with a B-tree index,
+and filters on it read that column. Other keys are filtered with
+``json_extract`` without an index. Migration ``0008_json_attributes``
+creates all of these; the models do not declare them.
+"""
+import json
+import operator
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple, Union
+
+from sqlalchemy import JSON, Float, String, cast, func, literal, literal_column, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSONB on PostgreSQL (indexable, compact), JSON elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+OPERATORS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+_PATH = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+
+Scalar = Union[bool, int, float, str]
+
+
+class InvalidAttributeFilterError(ValueError):
+    """Raised when a JSON attribute filter cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class IndexedKey:
+    """A top-level key with its own index (see the module docstring)."""
+    table: str
+    column: str
+    key: str
+    numeric: bool = False  # Range filters; PostgreSQL gets an expression index
+
+    @property
+    def generated_column(self) -> str:
+        return f"jx_{self.column}_{self.key}"
+
+    @property
+    def index_name(self) -> str:
+        return f"idx_{self.table}_{self.column}_{self.key}_jx"
+
+
+INDEXED_KEYS = (
+    IndexedKey("patients", "risk_factors", "hpv_positive"),
+    IndexedKey("patients", "risk_factors", "previous_abnormal"),
+    IndexedKey("patients", "risk_factors", "smoking"),
+    IndexedKey("ai_results", "confidence_scores", "hsil", numeric=True),
+    IndexedKey("ai_results", "confidence_scores", "asc_h", numeric=True),
+    IndexedKey("ai_results", "confidence_scores", "scc", numeric=True),
+)
+
+_INDEXED: Dict[Tuple[str, str, str], IndexedKey] = {(k.table, k.column, k.key): k for k in INDEXED_KEYS}
+
+
+@dataclass(frozen=True)
+class AttributeFilter:
+    """One parsed ``path[:op]:value`` filter."""
+    path: Tuple[str, ...]
+    op: str
+    value: Scalar
+
+
+def _scalar(raw: str) -> Scalar:
+    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+        return raw[1:-1]
+    lowered = raw.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    for parse in (int, float):
+        try:
+            return parse(raw)
+        except ValueError:
+            pass
+    return raw
+
+
+def parse_filter(spec: str) -> AttributeFilter:
+    """Parse ``path``, ``path:value`` or ``path:op:value``."""
+    parts = spec.split(":", 2)
+    if len(parts) == 1:
+        path, op, raw = parts[0], "eq", "true"
+    elif len(parts) == 3 and parts[1] in OPERATORS:
+        path, op, raw = parts
+    else:
+        # Equality; the value may itself contain colons
+        path, raw = spec.split(":", 1)
+        op = "eq"
+    if not _PATH.match(path):
+        raise InvalidAttributeFilterError(f"Invalid attribute path {path!r}: use letters, digits, _ and dots")
+    value = _scalar(raw)
+    if op != "eq" and (isinstance(value, bool) or not isinstance(value, (int, float))):
+        raise InvalidAttributeFilterError(f"'{op}' needs a number, got {raw!r}")
+    return AttributeFilter(tuple(path.split(".")), op, value)
+
+
+def _nested(path: Tuple[str, ...], value: Scalar) -> dict:
+    document = value
+    for key in reversed(path):
+        document = {key: document}
+    return document
+
+
+def attribute_condition(dialect: str, column, attribute_filter: AttributeFilter):
+    """SQL condition for one filter on a JSON column, shaped to hit its index."""
+    path, op, value = attribute_filter.path, attribute_filter.op, attribute_filter.value
+    if dialect == "postgresql":
+        document = type_coerce(column, JSONB)
+        if op == "eq":
+            # Bound as text cast to jsonb, so it also renders as a literal (EXPLAIN)
+            return document.contains(cast(literal(json.dumps(_nested(path, value)), String), JSONB))
+        # Keys inline (paths are validated), so the expression matches the
+        # index even under server-side parameters (asyncpg)
+        if len(path) == 1:
+            element = document.op("->>")(literal_column(f"'{path[0]}'"))
+        else:
+            element = document.op("#>>")(literal_column("'{" + ",".join(path) + "}'"))
+        return OPERATORS[op](cast(element, Float), value)
+
+    indexed = _INDEXED.get((column.table.name, column.name, path[0])) if len(path) == 1 else None
+    if indexed is not None:
+        element = literal_column(f"{column.table.name}.{indexed.generated_column}")
+    else:
+        element = func.json_extract(column, "$." + ".".join(path))
+    return OPERATORS[op](element, value)
+
+
+def attribute_conditions(db, column, specs: Iterable[str]) -> List:
+    """Conditions for ``path[:op]:value`` filters; ``db`` is a sync or async session."""
+    dialect = db.get_bind().dialect.name
+    return [attribute_condition(dialect, column, parse_filter(spec)) for spec in specs]
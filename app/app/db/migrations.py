@@ -0,0 +1,181 @@
+"""
+CervixAI Schema Migrations
+Alembic configuration and the startup schema check.
+
+Revisions live in ``app/migrations/versions``. On startup ``ensure_schema``
+compares the database's ``alembic_version`` with the head revision, a
+single-row query, and returns when they match. Otherwise, with
+``AUTO_MIGRATE`` enabled, one process upgrades under a lock (a PostgreSQL
+advisory lock) while other workers wait and then find the schema current.
+Behind a transaction-pooling proxy (``DB_POOL_MODE=transaction``) that lock
+cannot be held, so migrations must be run as a deploy step. Databases
+created by ``create_all`` before migrations existed are adopted:
+missing tables and baseline indexes are created, the baseline is stamped
+and later revisions applied.
+
+Manual use::
+
+    python -m app.cli db upgrade
+    python -m app.cli db revision -m "add column" --autogenerate
+"""
+import logging
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+# Revision matching the schema create_all produced before migrations were introduced
+BASELINE_REVISION = "0001_baseline"
+
+# Tables created by the baseline; adoption creates only these if missing, so
+# tables introduced by later revisions are still created by those revisions
+BASELINE_TABLES = (
+    "integration_metadata", "patients", "roles", "status_counters", "samples", "screenings",
+    "users", "ai_results", "audit_logs", "backfill_campaigns", "diagnoses", "screening_images",
+    "annotations",
+)
+
+# Baseline indexes added to the models after their tables existed; create_all
+# skips tables that exist, so adoption creates these on them explicitly
+BASELINE_INDEXES = (
+    ("patients", "idx_patients_created_id"),
+    ("screenings", "idx_screenings_created_id"),
+    ("samples", "idx_samples_created_id"),
+    ("ai_results", "idx_ai_results_processed_id"),
+    ("annotations", "idx_annotations_created_id"),
+    ("audit_logs", "idx_audit_timestamp_id"),
+)
+
+# pg_advisory_lock key serializing migrations across workers
+MIGRATION_LOCK_KEY = 7_231_946_011
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Raised at startup when the schema is behind and auto-migration is off."""
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Alembic config for this app; uses ``connection`` when given."""
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def head_revision() -> str:
+    """Latest revision in the migrations directory (read from files, not the database)."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Revision recorded in the database, or None if it is unversioned."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+@contextmanager
+def _migration_lock(connection: Connection):
+    if connection.dialect.name != "postgresql":
+        # SQLite serializes writers itself and every revision is idempotent
+        yield
+        return
+    connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    connection.commit()
+    try:
+        yield
+    finally:
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.commit()
+
+
+def drop_invalid_index(name: str):
+    """
+    Drop an index left INVALID by an interrupted ``CREATE INDEX CONCURRENTLY``.
+
+    ``IF NOT EXISTS`` would otherwise skip it and leave the table unindexed.
+    For use inside revisions; a no-op outside PostgreSQL.
+    """
+    from alembic import op
+
+    context = op.get_context()
+    if context.dialect.name != "postgresql" or context.as_sql:
+        return
+    invalid = op.get_bind().execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE NOT i.indisvalid AND c.relname = :name"
+    ), {"name": name}).first()
+    if invalid:
+        logger.warning("Rebuilding invalid index %s", name)
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def _adopt_legacy_schema(connection: Connection):
+    """Version a database created by ``create_all`` before migrations existed."""
+    from app.db.database import Base
+    from app.models.status_counter import StatusCounter, rebuild_status_counters
+    from sqlalchemy.orm import Session
+
+    import app.models  # noqa: F401
+
+    logger.info("Adopting unversioned schema at %s", BASELINE_REVISION)
+    Base.metadata.create_all(connection, tables=[Base.metadata.tables[name] for name in BASELINE_TABLES])
+    for table_name, index_name in BASELINE_INDEXES:
+        index = next(i for i in Base.metadata.tables[table_name].indexes if i.name == index_name)
+        index.create(connection, checkfirst=True)
+    with Session(bind=connection) as db:
+        if db.query(StatusCounter).first() is None:
+            rebuild_status_counters(db)
+    connection.commit()
+    command.stamp(alembic_config(connection), BASELINE_REVISION)
+    connection.commit()
+
+
+def upgrade(connection: Connection, revision: str = "head"):
+    """Apply migrations up to ``revision`` on an existing connection."""
+    if current_revision(connection) is None and inspect(connection).has_table("patients"):
+        _adopt_legacy_schema(connection)
+    connection.commit()
+    command.upgrade(alembic_config(connection), revision)
+    connection.commit()
+
+
+def ensure_schema(bind: Engine, auto_migrate: Optional[bool] = None):
+    """Startup check: return if the schema is current, else migrate or fail."""
+    if auto_migrate is None:
+        auto_migrate = settings.auto_migrate
+    head = head_revision()
+
+    with bind.connect() as connection:
+        current = current_revision(connection)
+        if current == head:
+            return
+        if not auto_migrate:
+            raise SchemaOutOfDateError(
+                f"Database schema is at {current or 'no revision'}, expected {head}; "
+                "run 'python -m app.cli db upgrade'"
+            )
+        if settings.db_pool_mode == "transaction" and connection.dialect.name == "postgresql":
+            # The advisory lock is session state, which a transaction-pooling proxy does not keep
+            raise SchemaOutOfDateError(
+                f"Database schema is at {current or 'no revision'}, expected {head}; with "
+                "DB_POOL_MODE=transaction run 'python -m app.cli db upgrade' against the database directly"
+            )
+        connection.commit()
+        with _migration_lock(connection):
+            # Another worker may have migrated while this one waited
+            if current_revision(connection) != head:
+                logger.info("Migrating database schema to %s", head)
+                upgrade(connection, head)
@@ -0,0 +1,177 @@
+"""
+CervixAI Keyset Pagination
+Cursor-based paging over an indexed (sort key, id) pair.
+
+Unlike OFFSET, the cost of a page does not grow with its depth, and rows
+inserted while a client pages through results do not shift later pages.
+Cursors are opaque, URL-safe tokens encoding the boundary row's sort key
+and ID plus the paging direction.
+
+Works with both ``Session.query`` and ``select()`` statements::
+
+    paginator = KeysetPaginator(Sample.created_at, Sample.id, limit, cursor)
+    rows = db.scalars(paginator.apply(stmt, offset)).all()
+    items, next_cursor, prev_cursor = paginator.page(rows)
+
+Passing an ``offset`` without a cursor keeps the legacy OFFSET behaviour for
+existing clients; such pages still return cursors to continue from.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+from app.db.identifiers import GUID, parse_id
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def _decode_id(column, value: Any) -> Any:
+    # A malformed key is a bad cursor (400), not a missing row
+    if isinstance(column.type, GUID):
+        return str(parse_id(value))
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: Any, direction: str = "next") -> str:
+    """Opaque cursor for the position after (or before) a row."""
+    payload = json.dumps({"k": _encode_value(sort_value), "i": row_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any, str]:
+    """Decode a cursor into (sort value, id, direction)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        row_id = payload["i"]
+        if isinstance(row_id, bool) or not isinstance(row_id, (str, int)):
+            raise TypeError(row_id)
+        return payload["k"], row_id, direction
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeDecodeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+class KeysetPaginator:
+    """
+    Keyset paging for one sort order.
+
+    ``sort_column`` and ``id_column`` should be covered by a composite index
+    in the same order, so each page is a short index range scan.
+    """
+
+    def __init__(
+        self,
+        sort_column,
+        id_column,
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = True
+    ):
+        self.sort_column = sort_column
+        self.id_column = id_column
+        self.limit = limit
+        self.descending = descending
+        self.direction = "next"
+        self.boundary = None
+        self.offset = 0
+        if cursor:
+            sort_value, row_id, self.direction = decode_cursor(cursor)
+            try:
+                self.boundary = (_decode_value(sort_column, sort_value), _decode_id(id_column, row_id))
+            except (TypeError, ValueError):
+                raise InvalidCursorError("Invalid pagination cursor")
+
+    @property
+    def _scan_descending(self) -> bool:
+        # Paging backwards scans the index in the opposite direction
+        return self.descending != (self.direction == "prev")
+
+    def apply(self, stmt, offset: int = 0):
+        """
+        Add the boundary filter, ordering and limit to a query or select.
+
+        ``offset`` is only honoured without a cursor (legacy offset paging).
+        """
+        key = tuple_(self.sort_column, self.id_column)
+        if self.boundary is not None:
+            stmt = stmt.filter(key < self.boundary if self._scan_descending else key > self.boundary)
+        if self._scan_descending:
+            order = (self.sort_column.desc(), self.id_column.desc())
+        else:
+            order = (self.sort_column.asc(), self.id_column.asc())
+        stmt = stmt.order_by(None).order_by(*order)
+        if self.boundary is None and offset:
+            self.offset = offset
+            stmt = stmt.offset(offset)
+        # One extra row tells whether another page exists
+        return stmt.limit(self.limit + 1)
+
+    def page(self, rows: List[Any]) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        """Trim the fetched rows to a page and build (items, next_cursor, prev_cursor)."""
+        rows = list(rows)
+        has_more = len(rows) > self.limit
+        items = rows[:self.limit]
+        if self.direction == "prev":
+            items.reverse()
+
+        if self.direction == "next":
+            has_next, has_prev = has_more, self.boundary is not None or self.offset > 0
+        else:
+            has_next, has_prev = True, has_more
+
+        next_cursor = self._cursor(items[-1], "next") if items and has_next else None
+        prev_cursor = self._cursor(items[0], "prev") if items and has_prev else None
+        return items, next_cursor, prev_cursor
+
+    def _cursor(self, row: Any, direction: str) -> str:
+        return encode_cursor(
+            getattr(row, self.sort_column.key),
+            getattr(row, self.id_column.key),
+            direction
+        )
+
+
+def count_headers(total: Optional[int], strategy: str) -> dict:
+    """Response headers carrying the total count for bare-list endpoints."""
+    if total is None:
+        return {}
+    return {"X-Total-Count": str(total), "X-Count-Strategy": strategy}
+
+
+def cursor_headers(next_cursor: Optional[str], prev_cursor: Optional[str]) -> dict:
+    """Response headers carrying cursors for endpoints that return a bare list."""
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if prev_cursor:
+        headers["X-Prev-Cursor"] = prev_cursor
+    return headers
@@ -0,0 +1,141 @@
+"""
+CervixAI Connection Pool Metrics
+Checkout wait time, connections in use, overflow and timeouts per engine.
+
+``engine_options`` gives every engine (primary, async, replicas) its own
+instrumented pool class. Wait time is measured around the pool's own
+checkout, so it covers both queueing for a free connection and opening a
+new one; a checkout that gives up after ``DB_POOL_TIMEOUT`` is counted as a
+timeout. ``pool_metrics()`` returns a snapshot of every pool for
+``GET /admin/db-pool``.
+"""
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Type
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolStats:
+    """Counters for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[Pool] = None  # Current pool (replaced on dispose)
+        self.pool_class: Optional[str] = None
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+        self.timeouts = 0
+        self.connects = 0
+        self.in_use = 0
+        self.in_use_peak = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, pool: Pool, waited: float):
+        with self._lock:
+            self.pool = pool
+            self.checkouts += 1
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, waited)] += 1
+
+    def record_timeout(self, pool: Pool, waited: float):
+        with self._lock:
+            self.pool = pool
+            self.timeouts += 1
+        logger.warning("Pool %s exhausted: no connection after %.1fs (%s)", self.name, waited, pool.status())
+
+    def released(self):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            data = {
+                "name": self.name,
+                "pool": self.pool_class,
+                "in_use": self.in_use,
+                "in_use_peak": self.in_use_peak,
+                "checkouts": self.checkouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_histogram": {
+                    ("+Inf" if bound is None else str(bound)): count
+                    for bound, count in zip(WAIT_BUCKETS + (None,), self.wait_buckets)
+                },
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+            }
+        # Live figures from queue pools (NullPool keeps none)
+        for key in ("size", "checkedin", "overflow"):
+            method = getattr(pool, key, None)
+            data[key] = method() if callable(method) else None
+        return data
+
+
+POOL_STATS: Dict[str, PoolStats] = {}
+
+
+class _InstrumentedPoolMixin:
+    """
+    Pool hooks feeding ``stats``, which is set per generated subclass.
+
+    Overrides the pool's own checkout/return/connect steps rather than
+    listening to pool events, which cannot be attached to the asyncio pool
+    classes.
+    """
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout(self, time.perf_counter() - start)
+            raise
+        self.stats.record_checkout(self, time.perf_counter() - start)
+        return record
+
+    def _do_return_conn(self, record):
+        self.stats.released()
+        super()._do_return_conn(record)
+
+    def _create_connection(self):
+        self.stats.record_connect()
+        return super()._create_connection()
+
+
+def instrumented_pool(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    A ``base`` pool subclass reporting to the stats registered as ``name``.
+
+    A subclass per engine rather than attributes on the pool instance, since
+    ``engine.dispose()`` recreates the pool from its class.
+    """
+    stats = POOL_STATS.setdefault(name, PoolStats(name))
+    stats.pool_class = base.__name__
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"stats": stats})
+
+
+def pool_metrics() -> List[dict]:
+    """Snapshot of every instrumented pool."""
+    return [stats.snapshot() for stats in POOL_STATS.values()]
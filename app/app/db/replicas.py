@@ -0,0 +1,248 @@
+"""
+CervixAI Read Replicas
+Routes read-only request sessions to replica databases.
+
+Replicas are configured with ``DATABASE_REPLICA_URLS`` (comma-separated).
+A background thread checks each one every ``replica_health_check_seconds``
+(connectivity and, on PostgreSQL, replay lag against
+``replica_max_lag_seconds``); read sessions go round-robin to the healthy
+ones. A replica that fails on checkout is taken out of rotation and the
+request falls back to the primary, as it does when none are configured.
+
+Read-your-writes: after a user's successful mutation, their reads stay on
+the primary for ``read_your_writes_seconds``. The window is tracked per
+user in-process and in a cookie, so browser clients stay sticky across
+workers.
+"""
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal, async_url_for, engine_options
+
+logger = logging.getLogger(__name__)
+
+# Cookie holding the epoch until which a client's reads stay on the primary
+PRIMARY_COOKIE = "cervixai_primary_until"
+
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+# Connect argument bounding connection setup, by driver
+_CONNECT_TIMEOUT_ARGS = {"psycopg2": "connect_timeout", "psycopg": "connect_timeout", "asyncpg": "timeout", "pg8000": "timeout"}
+
+
+def _replica_engine_options(url: str, name: str) -> dict:
+    """``engine_options`` plus a connect timeout, so a probe of an unreachable replica cannot hang."""
+    options = engine_options(url, name)
+    argument = _CONNECT_TIMEOUT_ARGS.get(make_url(url).get_dialect().driver)
+    if argument:
+        timeout = settings.replica_connect_timeout_seconds
+        options["connect_args"] = {
+            **options.get("connect_args", {}),
+            argument: max(1, round(timeout)) if argument == "connect_timeout" else timeout,
+        }
+    return options
+
+
+@dataclass
+class Replica:
+    """One replica database and its last known health."""
+    name: str
+    engine: Engine
+    async_sessionmaker: Optional[object] = None
+    healthy: bool = True  # Assumed until the first check says otherwise
+    lag_seconds: Optional[float] = None
+    checked_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ReplicaSet:
+    """Healthy-replica selection with periodic background health checks."""
+
+    def __init__(self, urls: List[str], check_interval: float, max_lag: float):
+        self.replicas = [self._build(url) for url in urls]
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _build(url: str) -> Replica:
+        name = make_url(url).render_as_string(hide_password=True)
+        replica = Replica(name=name, engine=create_engine(url, **_replica_engine_options(url, f"replica {name}")))
+        async_url = async_url_for(url)
+        if async_url:
+            try:
+                from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+                replica.async_sessionmaker = async_sessionmaker(
+                    create_async_engine(async_url, **_replica_engine_options(async_url, f"replica {name} (async)")),
+                    class_=AsyncSession,
+                    autoflush=False,
+                    expire_on_commit=False
+                )
+            except ImportError:
+                pass
+        return replica
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """Next healthy replica (round-robin), or None to use the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_unhealthy(self, replica: Replica, error: Exception):
+        """Take a replica out of rotation until its next successful check."""
+        if replica.healthy:
+            logger.warning("Replica %s unavailable, reading from primary: %s", replica.name, error)
+        replica.healthy = False
+        replica.error = str(error)
+
+    def check(self, replica: Replica):
+        """Probe one replica's connectivity and replication lag."""
+        try:
+            with replica.engine.connect() as connection:
+                if connection.dialect.name == "postgresql":
+                    lag = float(connection.execute(_LAG_QUERY).scalar() or 0)
+                else:
+                    connection.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception as exc:  # Any failure, not only driver errors, takes it out of rotation
+            self.mark_unhealthy(replica, exc)
+        else:
+            replica.lag_seconds = lag
+            replica.healthy = lag <= self.max_lag
+            replica.error = None if replica.healthy else f"replication lag {lag:.1f}s"
+        replica.checked_at = time.time()
+
+    def check_all(self):
+        for replica in self.replicas:
+            try:
+                self.check(replica)
+            except Exception:
+                # Keep checking the others, and keep the health thread alive
+                logger.exception("Health check of replica %s failed", replica.name)
+
+    def start(self):
+        """Check now, then keep checking in a daemon thread."""
+        if not self.enabled or self._thread is not None:
+            return
+        self.check_all()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            self.check_all()
+
+    def status(self) -> List[dict]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "checked_at": replica.checked_at,
+                "error": replica.error,
+            }
+            for replica in self.replicas
+        ]
+
+
+class WriteTracker:
+    """Per-user time of the last successful write, for read-your-writes."""
+
+    def __init__(self, window_seconds: float):
+        self.window = window_seconds
+        self._writes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: str) -> float:
+        """Record a write; returns the epoch until which reads use the primary."""
+        now = time.time()
+        with self._lock:
+            self._writes[user_id] = now
+            if len(self._writes) > 10_000:
+                cutoff = now - self.window
+                self._writes = {uid: at for uid, at in self._writes.items() if at > cutoff}
+        return now + self.window
+
+    def recent(self, user_id: str) -> bool:
+        written_at = self._writes.get(user_id)
+        return written_at is not None and time.time() - written_at < self.window
+
+
+def _replica_urls() -> List[str]:
+    return [url.strip() for url in (settings.database_replica_urls or "").split(",") if url.strip()]
+
+
+replicas = ReplicaSet(
+    _replica_urls(),
+    check_interval=settings.replica_health_check_seconds,
+    max_lag=settings.replica_max_lag_seconds
+)
+write_tracker = WriteTracker(settings.read_your_writes_seconds)
+
+
+def primary_pinned(user_id: Optional[str], cookie: Optional[str]) -> bool:
+    """Whether this user's reads must stay on the primary (recent write)."""
+    if user_id and write_tracker.recent(user_id):
+        return True
+    try:
+        return cookie is not None and float(cookie) > time.time()
+    except ValueError:
+        return False
+
+
+def read_session(pinned: bool = False) -> Session:
+    """Session on a healthy replica, falling back to the primary."""
+    replica = None if pinned else replicas.choose()
+    if replica is None:
+        return SessionLocal()
+    session = Session(bind=replica.engine, autoflush=False)
+    try:
+        session.connection()
+    except DBAPIError as exc:
+        session.close()
+        replicas.mark_unhealthy(replica, exc)
+        return SessionLocal()
+    return session
+
+
+async def async_read_session(pinned: bool = False):
+    """Async session on a healthy replica, or None to use the primary."""
+    replica = None if pinned else replicas.choose()
+    if replica is None or replica.async_sessionmaker is None:
+        return None
+    session = replica.async_sessionmaker()
+    try:
+        await session.connection()
+    except DBAPIError as exc:
+        await session.close()
+        replicas.mark_unhealthy(replica, exc)
+        return None
+    return session
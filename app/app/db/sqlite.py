@@ -0,0 +1,155 @@
+"""
+CervixAI SQLite Profile
+Connection tuning and write serialization for deployments on SQLite.
+
+With ``SQLITE_PROFILE=production`` (default) every connection is opened with:
+
+- ``journal_mode=WAL``: readers no longer block the writer or each other
+- ``synchronous=NORMAL``: fsync at WAL checkpoints rather than every commit;
+  a power loss can drop the last transactions but never corrupts the file
+- ``busy_timeout``: wait for a lock held by another process instead of
+  failing at once with "database is locked"
+- ``mmap_size`` and ``cache_size``: serve reads from memory
+
+SQLite allows one writer at a time. Rather than letting concurrent request
+threads race for the file lock and retry, the first write statement of a
+transaction waits its turn at a process-wide gate, held until the
+connection goes back to the pool (a committed or rolled-back session).
+Reads never touch the gate, so they stay parallel. Across processes the
+busy timeout does the queueing.
+
+``SQLITE_PROFILE=default`` leaves the driver defaults, for comparison
+(``benchmarks/sqlite_benchmark.py``).
+"""
+import asyncio
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+
+_WRITE_STATEMENT = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+
+# connection_record.info key marking a connection that holds the gate
+_HOLDS_GATE = "sqlite_writer_gate"
+
+
+def profile_pragmas() -> Dict[str, object]:
+    """PRAGMAs for the production profile, from settings."""
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+        "cache_size": -settings.sqlite_cache_size_mb * 1024,  # Negative: KiB rather than pages
+        "temp_store": "MEMORY",
+    }
+
+
+class WriterGate:
+    """Process-wide turn-taking for SQLite write transactions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.acquisitions = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def _record(self, acquired: bool, waited: float):
+        with self._stats_lock:
+            if acquired:
+                self.acquisitions += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            else:
+                self.timeouts += 1
+
+    def acquire(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds; False means proceed ungated."""
+        start = time.perf_counter()
+        acquired = self._lock.acquire(timeout=timeout)
+        self._record(acquired, time.perf_counter() - start)
+        return acquired
+
+    async def acquire_async(self, timeout: float) -> bool:
+        """As ``acquire``, without blocking the event loop."""
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking=False)
+        while not acquired and time.perf_counter() - start < timeout:
+            await asyncio.sleep(0.002)
+            acquired = self._lock.acquire(blocking=False)
+        self._record(acquired, time.perf_counter() - start)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def status(self) -> dict:
+        with self._stats_lock:
+            return {
+                "held": self._lock.locked(),
+                "acquisitions": self.acquisitions,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "timeouts": self.timeouts,
+            }
+
+
+writer_gate = WriterGate()
+
+
+def configure_sqlite(
+    engine: Engine,
+    pragmas: Optional[Dict[str, object]] = None,
+    gate: Optional[WriterGate] = writer_gate,
+    is_async: bool = False,
+    timeout: Optional[float] = None,
+):
+    """
+    Apply ``pragmas`` on every new connection and serialize writes through
+    ``gate`` (``None`` disables it). For an async engine pass its
+    ``sync_engine`` with ``is_async=True``.
+    """
+    if pragmas is None:
+        pragmas = profile_pragmas()
+    if timeout is None:
+        timeout = int(pragmas.get("busy_timeout", 5000)) / 1000.0
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    if gate is None:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def wait_for_turn(connection, cursor, statement, parameters, context, executemany):
+        info = connection.info
+        if info.get(_HOLDS_GATE) or not _WRITE_STATEMENT.match(statement):
+            return
+        if is_async:
+            acquired = await_only(gate.acquire_async(timeout))
+        else:
+            acquired = gate.acquire(timeout)
+        # On timeout carry on without the gate; SQLite's busy timeout still applies
+        info[_HOLDS_GATE] = acquired
+
+    @event.listens_for(engine, "checkin")
+    def end_turn(dbapi_connection, connection_record):
+        if connection_record is not None and connection_record.info.pop(_HOLDS_GATE, False):
+            gate.release()
+
+    @event.listens_for(engine, "invalidate")
+    def end_turn_on_invalidate(dbapi_connection, connection_record, exception):
+        # An invalidated connection's info is discarded before it is checked in
+        end_turn(dbapi_connection, connection_record)
@@ -0,0 +1,126 @@
+"""
+CervixAI Unit of Work
+Request-scoped transaction that commits entity changes and their audit
+entries together.
+
+Routes stage changes with ``add``/``delete`` and audit events with ``audit``,
+then call ``commit`` once. Audit entries are written in the same transaction
+as the changes they describe, so neither can be persisted without the other.
+"""
+from typing import Any, List, Optional
+
+from app.models import AuditLog
+
+
+class _AuditEvent:
+    __slots__ = ("action", "resource_type", "resource", "details", "severity")
+
+    def __init__(self, action, resource_type, resource, details, severity):
+        self.action = action
+        self.resource_type = resource_type
+        self.resource = resource
+        self.details = details
+        self.severity = severity
+
+    @property
+    def resource_id(self) -> Optional[str]:
+        # Entities get their ID at flush time, so resolve it lazily
+        if self.resource is None or isinstance(self.resource, str):
+            return self.resource
+        return self.resource.id
+
+
+class _BaseUnitOfWork:
+    def __init__(self, session, user=None, ip_address: Optional[str] = None):
+        self.session = session
+        self.user = user
+        self.ip_address = ip_address
+        self._events: List[_AuditEvent] = []
+
+    def add(self, instance: Any):
+        """Stage a new or changed entity."""
+        self.session.add(instance)
+
+    def add_all(self, instances):
+        self.session.add_all(instances)
+
+    def audit(
+        self,
+        action: str,
+        resource_type: str = None,
+        resource: Any = None,
+        details: dict = None,
+        severity: str = "info"
+    ):
+        """
+        Record an audit event for this transaction.
+
+        ``resource`` is an entity or its ID; an entity's ID is read at commit
+        time, so it may be audited before it has been flushed.
+        """
+        self._events.append(_AuditEvent(action, resource_type, resource, details, severity))
+
+    def _needs_flush(self) -> bool:
+        return any(
+            event.resource is not None
+            and not isinstance(event.resource, str)
+            and event.resource.id is None
+            for event in self._events
+        )
+
+    def _stage_audit_logs(self):
+        for event in self._events:
+            AuditLog.log_action(
+                self.session,
+                action=event.action,
+                user=self.user,
+                resource_type=event.resource_type,
+                resource_id=event.resource_id,
+                details=event.details,
+                ip_address=self.ip_address,
+                severity=event.severity
+            )
+        self._events.clear()
+
+
+class UnitOfWork(_BaseUnitOfWork):
+    """Unit of work over a synchronous ``Session``."""
+
+    def delete(self, instance: Any):
+        self.session.delete(instance)
+
+    def flush(self):
+        """Write pending changes (assigning IDs) without committing."""
+        self.session.flush()
+
+    def commit(self):
+        """Write staged changes and audit entries in one transaction."""
+        if self._needs_flush():
+            self.session.flush()
+        self._stage_audit_logs()
+        self.session.commit()
+
+    def rollback(self):
+        self._events.clear()
+        self.session.rollback()
+
+
+class AsyncUnitOfWork(_BaseUnitOfWork):
+    """Unit of work over an ``AsyncSession``."""
+
+    async def delete(self, instance: Any):
+        await self.session.delete(instance)
+
+    async def flush(self):
+        await self.session.flush()
+
+    async def commit(self):
+        """Write staged changes and audit entries in one transaction."""
+        if self._needs_flush():
+            await self.session.flush()
+        self._stage_audit_logs()
+        await self.session.commit()
+
+    async def rollback(self):
+        self._events.clear()
+        await self.session.rollback()
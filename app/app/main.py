@@ -2,11 +2,20 @@
 CervixAI - FastAPI Application Entry Point
 AI-Powered Cervical Cancer Screening Platform
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import StatementError, TimeoutError as PoolTimeoutError
 
 from app.core.config import settings
-from app.db.database import init_db
+from app.core.permissions import permission_registry
+from app.core.security import decode_token
+from app.db.audit_partitions import AuditMaintenance
+from app.db.database import engine, init_db, dispose_async_engine, SessionLocal
+from app.db.identifiers import InvalidIdentifierError
+from app.db.replicas import PRIMARY_COOKIE, replicas, write_tracker
+from app.db.json_attributes import InvalidAttributeFilterError
+from app.db.pagination import InvalidCursorError
 from app.api import api_router
 
 # Create FastAPI app
@@ -47,10 +56,84 @@ app.add_middleware(
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
 
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """Malformed or tampered pagination cursors are client errors."""
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
+@app.exception_handler(InvalidAttributeFilterError)
+async def invalid_attribute_filter_handler(request: Request, exc: InvalidAttributeFilterError):
+    """Malformed JSON attribute filters are client errors."""
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
+@app.exception_handler(StatementError)
+async def statement_error_handler(request: Request, exc: StatementError):
+    """A malformed ID cannot match any row; anything else is a server error."""
+    if isinstance(exc.orig, InvalidIdentifierError):
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": str(exc.orig)})
+    raise exc
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """No database connection freed up within DB_POOL_TIMEOUT: shed load."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database busy, retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Pin a user's reads to the primary for a short window after their writes."""
+    response = await call_next(request)
+    if replicas.enabled and request.method in MUTATING_METHODS and response.status_code < 400:
+        user_id = _request_user_id(request)
+        if user_id:
+            until = write_tracker.mark(user_id)
+            response.set_cookie(
+                PRIMARY_COOKIE, f"{until:.3f}",
+                max_age=max(1, int(settings.read_your_writes_seconds)), httponly=True, samesite="lax"
+            )
+    return response
+
+
+def _request_user_id(request: Request):
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token).get("sub")
+    except HTTPException:
+        return None
+
+
+audit_maintenance = AuditMaintenance(engine, settings.audit_maintenance_interval_hours)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup."""
     init_db()
+    with SessionLocal() as db:
+        permission_registry.refresh(db)
+    replicas.start()
+    audit_maintenance.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled async database connections."""
+    replicas.stop()
+    audit_maintenance.stop()
+    await dispose_async_engine()
 
 
 @app.get("/", tags=["Root"])
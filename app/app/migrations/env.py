@@ -0,0 +1,75 @@
+"""
+CervixAI Alembic Environment
+Runs migrations against ``settings.database_url``, or against the
+connection handed over by ``app.db.migrations`` at startup.
+"""
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.db.database import Base
+from app.db.identifiers import GUID
+import app.models  # noqa: F401 - register every model on Base.metadata
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Search structures, JSON attribute indexes and generated columns, and
+    # audit log partitions are created by raw SQL revisions and maintenance,
+    # not by the models
+    if reflected and compare_to is None and name and (
+        name.startswith(("patients_fts", "audit_logs_", "jx_")) or name.endswith(("_trgm", "_jx"))
+    ):
+        return False
+    return True
+
+
+def compare_type(context, inspected_column, metadata_column, inspected_type, metadata_type):
+    # SQLite key columns keep their declared VARCHAR(36); 0005_uuid_keys
+    # converts their values to 16-byte blobs in place
+    if context.dialect.name == "sqlite" and isinstance(metadata_column.type, GUID):
+        return False
+    return None
+
+
+def _configure(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        compare_type=compare_type,
+        include_object=include_object,
+        # SQLite cannot ALTER most constraints in place
+        render_as_batch=kwargs.pop("dialect_name", None) == "sqlite",
+        **kwargs
+    )
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of executing it (``db upgrade --sql``)."""
+    url = config.get_main_option("sqlalchemy.url") or settings.database_url
+    _configure(url=url, literal_binds=True, dialect_name=url.split(":", 1)[0].split("+")[0])
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection, dialect_name=connection.dialect.name)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(settings.database_url, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configure(connection=connection, dialect_name=connection.dialect.name)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
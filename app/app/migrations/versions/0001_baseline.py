@@ -0,0 +1,287 @@
+"""Baseline: every table as created by create_all before migrations
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+
+Existing databases without an alembic_version table are stamped at this
+revision on first start (see app.db.migrations).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('integration_metadata',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('system_name', sa.String(length=255), nullable=False),
+    sa.Column('system_type', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('connector_config', sa.JSON(), nullable=False),
+    sa.Column('field_mappings', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_sync_at', sa.DateTime(), nullable=True),
+    sa.Column('last_sync_status', sa.String(length=50), nullable=True),
+    sa.Column('rate_limit_requests', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_integration_metadata_system_name'), 'integration_metadata', ['system_name'], unique=True)
+
+    op.create_table('patients',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('date_of_birth', sa.Date(), nullable=False),
+    sa.Column('gender', sa.String(length=10), nullable=True),
+    sa.Column('contact_info', sa.JSON(), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('medical_record_number', sa.String(length=50), nullable=True),
+    sa.Column('consent_given', sa.Boolean(), nullable=True),
+    sa.Column('consent_date', sa.DateTime(), nullable=True),
+    sa.Column('consent_document_path', sa.String(length=500), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('risk_factors', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_patients_created_id', 'patients', ['created_at', 'id'])
+    op.create_index('idx_patients_dob', 'patients', ['date_of_birth'])
+    op.create_index('idx_patients_name', 'patients', ['last_name', 'first_name'])
+    op.create_index(op.f('ix_patients_medical_record_number'), 'patients', ['medical_record_number'], unique=True)
+
+    op.create_table('roles',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('role_name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('permissions', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_roles_role_name'), 'roles', ['role_name'], unique=True)
+
+    op.create_table('status_counters',
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('entity', 'status')
+    )
+
+    op.create_table('samples',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('patient_id', sa.String(length=36), nullable=False),
+    sa.Column('collection_date', sa.DateTime(), nullable=False),
+    sa.Column('batch_id', sa.String(length=36), nullable=True),
+    sa.Column('sample_type', sa.String(length=50), nullable=True),
+    sa.Column('metadata', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('image_path', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_samples_collection_date', 'samples', ['collection_date'])
+    op.create_index('idx_samples_created_id', 'samples', ['created_at', 'id'])
+    op.create_index('idx_samples_status', 'samples', ['status'])
+    op.create_index(op.f('ix_samples_batch_id'), 'samples', ['batch_id'])
+    op.create_index(op.f('ix_samples_patient_id'), 'samples', ['patient_id'])
+
+    op.create_table('screenings',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('patient_id', sa.String(length=36), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('clinical_notes', sa.Text(), nullable=True),
+    sa.Column('reason_for_screening', sa.String(length=255), nullable=True),
+    sa.Column('screening_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_screenings_created_id', 'screenings', ['created_at', 'id'])
+
+    op.create_table('users',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('username', sa.String(length=150), nullable=True),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.Column('role_id', sa.String(length=36), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('mfa_enabled', sa.Boolean(), nullable=True),
+    sa.Column('mfa_secret', sa.String(length=255), nullable=True),
+    sa.Column('last_login_at', sa.DateTime(), nullable=True),
+    sa.Column('failed_login_attempts', sa.String(length=10), nullable=True),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    op.create_table('ai_results',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('sample_id', sa.String(length=36), nullable=False),
+    sa.Column('diagnosis', sa.JSON(), nullable=False),
+    sa.Column('confidence_scores', sa.JSON(), nullable=False),
+    sa.Column('primary_prediction', sa.String(length=50), nullable=True),
+    sa.Column('primary_confidence', sa.Float(), nullable=True),
+    sa.Column('heatmap_path', sa.String(length=500), nullable=True),
+    sa.Column('model_version', sa.String(length=100), nullable=True),
+    sa.Column('model_name', sa.String(length=100), nullable=True),
+    sa.Column('ai_notes', sa.Text(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['sample_id'], ['samples.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_ai_results_primary_prediction', 'ai_results', ['primary_prediction'])
+    op.create_index('idx_ai_results_processed_at', 'ai_results', ['processed_at'])
+    op.create_index('idx_ai_results_processed_id', 'ai_results', ['processed_at', 'id'])
+    op.create_index(op.f('ix_ai_results_sample_id'), 'ai_results', ['sample_id'])
+
+    op.create_table('audit_logs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=True),
+    sa.Column('user_email', sa.String(length=255), nullable=True),
+    sa.Column('action', sa.String(length=100), nullable=False),
+    sa.Column('resource_type', sa.String(length=100), nullable=True),
+    sa.Column('resource_id', sa.String(length=36), nullable=True),
+    sa.Column('details', sa.JSON(), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.String(length=500), nullable=True),
+    sa.Column('request_id', sa.String(length=36), nullable=True),
+    sa.Column('severity', sa.String(length=20), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_audit_resource', 'audit_logs', ['resource_type', 'resource_id'])
+    op.create_index('idx_audit_timestamp', 'audit_logs', ['timestamp'])
+    op.create_index('idx_audit_timestamp_id', 'audit_logs', ['timestamp', 'id'])
+    op.create_index('idx_audit_user', 'audit_logs', ['user_id'])
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'])
+
+    op.create_table('backfill_campaigns',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('target_model_version', sa.String(length=100), nullable=False),
+    sa.Column('created_by_id', sa.String(length=36), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('chunk_size', sa.Integer(), nullable=False),
+    sa.Column('rate_limit', sa.Float(), nullable=True),
+    sa.Column('last_sample_id', sa.String(length=36), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('processed', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('run_processed', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('resumed_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_backfill_campaigns_status', 'backfill_campaigns', ['status'])
+
+    op.create_table('diagnoses',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('screening_id', sa.String(length=36), nullable=False),
+    sa.Column('ai_prediction', sa.String(length=50), nullable=True),
+    sa.Column('ai_confidence', sa.Float(), nullable=True),
+    sa.Column('ai_analysis_date', sa.DateTime(), nullable=True),
+    sa.Column('ai_notes', sa.Text(), nullable=True),
+    sa.Column('reviewer_id', sa.String(length=36), nullable=True),
+    sa.Column('clinician_agrees_with_ai', sa.Boolean(), nullable=True),
+    sa.Column('clinician_diagnosis', sa.String(length=50), nullable=True),
+    sa.Column('clinician_notes', sa.Text(), nullable=True),
+    sa.Column('review_date', sa.DateTime(), nullable=True),
+    sa.Column('final_diagnosis', sa.String(length=50), nullable=True),
+    sa.Column('final_notes', sa.Text(), nullable=True),
+    sa.Column('finalized_at', sa.DateTime(), nullable=True),
+    sa.Column('follow_up_recommended', sa.Boolean(), nullable=True),
+    sa.Column('follow_up_notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['reviewer_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['screening_id'], ['screenings.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('screening_id')
+    )
+
+    op.create_table('screening_images',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('screening_id', sa.String(length=36), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('original_filename', sa.String(length=255), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('mime_type', sa.String(length=50), nullable=True),
+    sa.Column('image_type', sa.String(length=50), nullable=True),
+    sa.Column('heatmap_path', sa.String(length=500), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['screening_id'], ['screenings.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('annotations',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('result_id', sa.String(length=36), nullable=False),
+    sa.Column('clinician_id', sa.String(length=36), nullable=False),
+    sa.Column('agrees_with_ai', sa.Boolean(), nullable=True),
+    sa.Column('clinician_diagnosis', sa.String(length=50), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('override_flags', sa.JSON(), nullable=True),
+    sa.Column('follow_up_recommended', sa.Boolean(), nullable=True),
+    sa.Column('follow_up_notes', sa.Text(), nullable=True),
+    sa.Column('follow_up_date', sa.DateTime(), nullable=True),
+    sa.Column('signed_off', sa.Boolean(), nullable=True),
+    sa.Column('signed_off_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['clinician_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['result_id'], ['ai_results.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_annotations_created_at', 'annotations', ['created_at'])
+    op.create_index('idx_annotations_created_id', 'annotations', ['created_at', 'id'])
+    op.create_index('idx_annotations_signed_off', 'annotations', ['signed_off'])
+    op.create_index(op.f('ix_annotations_clinician_id'), 'annotations', ['clinician_id'])
+    op.create_index(op.f('ix_annotations_result_id'), 'annotations', ['result_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('annotations')
+    op.drop_table('screening_images')
+    op.drop_table('diagnoses')
+    op.drop_table('backfill_campaigns')
+    op.drop_table('audit_logs')
+    op.drop_table('ai_results')
+    op.drop_table('users')
+    op.drop_table('screenings')
+    op.drop_table('samples')
+    op.drop_table('status_counters')
+    op.drop_table('roles')
+    op.drop_table('patients')
+    op.drop_table('integration_metadata')
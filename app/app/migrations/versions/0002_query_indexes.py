@@ -0,0 +1,45 @@
+"""Indexes for hot list and lookup filters
+
+Revision ID: 0002_query_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+
+Built with CREATE INDEX CONCURRENTLY on PostgreSQL, so large tables stay
+writable while the indexes build.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.migrations import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_query_indexes'
+down_revision: Union[str, Sequence[str], None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('idx_screenings_patient_created', 'screenings', ['patient_id', 'created_at', 'id']),
+    ('idx_screenings_status_created', 'screenings', ['status', 'created_at', 'id']),
+    ('idx_screening_images_screening', 'screening_images', ['screening_id', 'uploaded_at']),
+    ('idx_diagnoses_reviewer', 'diagnoses', ['reviewer_id']),
+    ('idx_annotations_clinician_signed', 'annotations', ['clinician_id', 'signed_off']),
+    ('idx_ai_results_sample_version', 'ai_results', ['sample_id', 'model_version']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            drop_invalid_index(name)
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,85 @@
+"""Patient search indexes: pg_trgm on PostgreSQL, FTS5 on SQLite
+
+Revision ID: 0003_patient_search
+Revises: 0002_query_indexes
+Create Date: 2026-10-18
+
+Without the pg_trgm extension (it needs a privileged role) the trigram
+indexes are skipped and search falls back to prefix matching.
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.exc import DBAPIError
+
+from app.db.migrations import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_patient_search'
+down_revision: Union[str, Sequence[str], None] = '0002_query_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+TRIGRAM_INDEXES = {
+    'idx_patients_full_name_trgm': "((first_name || ' ' || last_name) gin_trgm_ops)",
+    'idx_patients_mrn_trgm': "(medical_record_number gin_trgm_ops)",
+}
+
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5(
+        first_name, last_name, medical_record_number,
+        content='patients', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS patients_fts_insert AFTER INSERT ON patients BEGIN
+        INSERT INTO patients_fts(rowid, first_name, last_name, medical_record_number)
+        VALUES (new.rowid, new.first_name, new.last_name, new.medical_record_number);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS patients_fts_delete AFTER DELETE ON patients BEGIN
+        INSERT INTO patients_fts(patients_fts, rowid, first_name, last_name, medical_record_number)
+        VALUES ('delete', old.rowid, old.first_name, old.last_name, old.medical_record_number);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS patients_fts_update
+        AFTER UPDATE OF first_name, last_name, medical_record_number ON patients BEGIN
+        INSERT INTO patients_fts(patients_fts, rowid, first_name, last_name, medical_record_number)
+        VALUES ('delete', old.rowid, old.first_name, old.last_name, old.medical_record_number);
+        INSERT INTO patients_fts(rowid, first_name, last_name, medical_record_number)
+        VALUES (new.rowid, new.first_name, new.last_name, new.medical_record_number);
+    END""",
+    # Index patients that existed before the FTS table
+    "INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            try:
+                op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            except DBAPIError as exc:
+                logger.warning("pg_trgm unavailable, skipping trigram indexes: %s", exc)
+                return
+            for name, definition in TRIGRAM_INDEXES.items():
+                drop_invalid_index(name)
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON patients USING gin {definition}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('patients_fts_insert', 'patients_fts_delete', 'patients_fts_update'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS patients_fts")
+    elif dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name in TRIGRAM_INDEXES:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,113 @@
+"""Partition audit_logs by month on PostgreSQL
+
+Revision ID: 0004_audit_partitions
+Revises: 0003_patient_search
+Create Date: 2026-10-18
+
+The existing table is not copied: it becomes the partition holding
+everything before the first month after this migration. A CHECK constraint
+validated beforehand (without blocking writes) lets ATTACH skip its scan,
+and a unique index on (id, timestamp) built concurrently becomes its
+primary key. Later months get their own partitions; see
+``app.db.audit_partitions``. A no-op on SQLite.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.config import settings
+from app.db.audit_partitions import (
+    DEFAULT_PARTITION, LEGACY_PARTITION, add_months, create_partition_sql, month_start
+)
+from app.db.migrations import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_audit_partitions'
+down_revision: Union[str, Sequence[str], None] = '0003_patient_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'idx_audit_resource': '(resource_type, resource_id)',
+    'idx_audit_timestamp': '("timestamp")',
+    'idx_audit_timestamp_id': '("timestamp", id)',
+    'idx_audit_user': '(user_id)',
+    'ix_audit_logs_action': '(action)',
+}
+
+COLUMNS = """
+    id VARCHAR(36) NOT NULL,
+    user_id VARCHAR(36) REFERENCES users (id),
+    user_email VARCHAR(255),
+    action VARCHAR(100) NOT NULL,
+    resource_type VARCHAR(100),
+    resource_id VARCHAR(36),
+    details JSON,
+    ip_address VARCHAR(45),
+    user_agent VARCHAR(500),
+    request_id VARCHAR(36),
+    severity VARCHAR(20),
+    "timestamp" TIMESTAMP WITHOUT TIME ZONE NOT NULL
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    bound = add_months(month_start(datetime.utcnow()), 1)
+
+    # Prepare the current table to become a partition without long locks
+    with op.get_context().autocommit_block():
+        drop_invalid_index('audit_logs_id_timestamp_key')
+        op.execute(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS audit_logs_id_timestamp_key '
+            'ON audit_logs (id, "timestamp")'
+        )
+        op.execute('ALTER TABLE audit_logs DROP CONSTRAINT IF EXISTS audit_logs_legacy_bound')
+        op.execute(
+            f'ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_legacy_bound '
+            f"CHECK (\"timestamp\" < '{bound:%Y-%m-%d}') NOT VALID"
+        )
+        op.execute('ALTER TABLE audit_logs VALIDATE CONSTRAINT audit_logs_legacy_bound')
+
+    op.execute(f'ALTER TABLE audit_logs RENAME TO {LEGACY_PARTITION}')
+    for name in INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_legacy')
+    op.execute(
+        f'ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT audit_logs_pkey, '
+        f'ADD CONSTRAINT {LEGACY_PARTITION}_pkey PRIMARY KEY USING INDEX audit_logs_id_timestamp_key'
+    )
+
+    op.execute(
+        f'CREATE TABLE audit_logs ({COLUMNS}, PRIMARY KEY (id, "timestamp")) '
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    for name, columns in INDEXES.items():
+        op.execute(f'CREATE INDEX {name} ON audit_logs {columns}')
+
+    # Existing indexes on the old table match the parent's and are attached as they are
+    op.execute(
+        f'ALTER TABLE audit_logs ATTACH PARTITION {LEGACY_PARTITION} '
+        f"FOR VALUES FROM (MINVALUE) TO ('{bound:%Y-%m-%d}')"
+    )
+    op.execute(f'ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT audit_logs_legacy_bound')
+
+    for offset in range(settings.audit_partition_months_ahead + 1):
+        op.execute(create_partition_sql(add_months(bound, offset)))
+    op.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF audit_logs DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    # Rows in partitions already detached by retention are not brought back
+    op.execute(f'CREATE TABLE audit_logs_unpartitioned ({COLUMNS}, PRIMARY KEY (id))')
+    op.execute('INSERT INTO audit_logs_unpartitioned SELECT * FROM audit_logs')
+    op.execute('DROP TABLE audit_logs CASCADE')
+    op.execute('ALTER TABLE audit_logs_unpartitioned RENAME TO audit_logs')
+    op.execute('ALTER TABLE audit_logs RENAME CONSTRAINT audit_logs_unpartitioned_pkey TO audit_logs_pkey')
+    for name, columns in INDEXES.items():
+        op.execute(f'CREATE INDEX {name} ON audit_logs {columns}')
@@ -0,0 +1,117 @@
+"""Store primary and foreign keys as UUIDs
+
+Revision ID: 0005_uuid_keys
+Revises: 0004_audit_partitions
+Create Date: 2026-10-18
+
+PostgreSQL: key columns change from VARCHAR(36) to native ``uuid`` (16
+bytes). Each table is rewritten once under an exclusive lock, so run this
+in a maintenance window on large databases. Foreign keys are dropped first
+and re-created after every column has the new type.
+
+SQLite: values are converted in place to 16-byte blobs; the declared
+column types stay as they are (SQLite does not enforce them). Offline SQL
+for SQLite needs ``unhex()`` (SQLite 3.41+).
+
+New keys are UUIDv7 (``app.db.identifiers``); existing keys keep their
+value.
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_uuid_keys'
+down_revision: Union[str, Sequence[str], None] = '0004_audit_partitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEY_COLUMNS = {
+    'roles': ['id'],
+    'users': ['id', 'role_id'],
+    'patients': ['id'],
+    'screenings': ['id', 'patient_id'],
+    'screening_images': ['id', 'screening_id'],
+    'diagnoses': ['id', 'screening_id', 'reviewer_id'],
+    'samples': ['id', 'patient_id'],
+    'ai_results': ['id', 'sample_id'],
+    'annotations': ['id', 'result_id', 'clinician_id'],
+    'audit_logs': ['id', 'user_id'],
+    'backfill_campaigns': ['id', 'created_by_id', 'last_sample_id'],
+    'integration_metadata': ['id'],
+}
+
+# (table, column, referenced table) - named by PostgreSQL's default convention
+FOREIGN_KEYS = [
+    ('users', 'role_id', 'roles'),
+    ('screenings', 'patient_id', 'patients'),
+    ('screening_images', 'screening_id', 'screenings'),
+    ('diagnoses', 'screening_id', 'screenings'),
+    ('diagnoses', 'reviewer_id', 'users'),
+    ('samples', 'patient_id', 'patients'),
+    ('ai_results', 'sample_id', 'samples'),
+    ('annotations', 'result_id', 'ai_results'),
+    ('annotations', 'clinician_id', 'users'),
+    ('audit_logs', 'user_id', 'users'),
+    ('backfill_campaigns', 'created_by_id', 'users'),
+]
+
+
+def _to_bytes(value):
+    return uuid.UUID(value).bytes if isinstance(value, str) else value
+
+
+def _to_text(value):
+    return str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value
+
+
+def _alter_postgresql(new_type: str, using: str) -> None:
+    for table, column, _ in FOREIGN_KEYS:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_{column}_fkey')
+    for table, columns in KEY_COLUMNS.items():
+        op.execute(f'ALTER TABLE {table} ' + ', '.join(
+            f'ALTER COLUMN {column} TYPE {new_type} USING {column}::{using}' for column in columns
+        ))
+    for table, column, referent in FOREIGN_KEYS:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referent, [column], ['id'])
+
+
+def _convert_sqlite(function: str, sql_expression: str, stored_as: str) -> None:
+    if op.get_context().as_sql:
+        expression = sql_expression
+    else:
+        # The bundled SQLite may predate unhex(); convert in Python instead
+        raw = op.get_bind().connection.driver_connection
+        raw.create_function(function, 1, _to_bytes if stored_as == 'text' else _to_text, deterministic=True)
+        expression = f'{function}({{column}})'
+    for table, columns in KEY_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f'UPDATE {table} SET {column} = {expression.format(column=column)} '
+                f"WHERE typeof({column}) = '{stored_as}'"
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        _alter_postgresql('uuid', 'uuid')
+    elif dialect == 'sqlite':
+        _convert_sqlite('cervixai_uuid_bytes', "unhex(replace({column}, '-', ''))", 'text')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        _alter_postgresql('VARCHAR(36)', 'text')
+    elif dialect == 'sqlite':
+        _convert_sqlite(
+            'cervixai_uuid_text',
+            "lower(substr(hex({column}), 1, 8) || '-' || substr(hex({column}), 9, 4) || '-' || "
+            "substr(hex({column}), 13, 4) || '-' || substr(hex({column}), 17, 4) || '-' || "
+            "substr(hex({column}), 21))",
+            'blob',
+        )
@@ -0,0 +1,41 @@
+"""Dashboard counters
+
+Revision ID: 0006_dashboard_counters
+Revises: 0005_uuid_keys
+Create Date: 2026-10-18
+
+Filled from the base tables when applied to a database; after
+``db upgrade --sql`` run ``python -m app.cli rebuild-counters``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_dashboard_counters'
+down_revision: Union[str, Sequence[str], None] = '0005_uuid_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dashboard_counters',
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('scope', sa.String(length=36), nullable=False),
+    sa.Column('bucket', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'scope', 'bucket')
+    )
+    if not op.get_context().as_sql:
+        from app.models.dashboard_counter import rebuild_dashboard_counters
+
+        with Session(bind=op.get_bind()) as db:
+            rebuild_dashboard_counters(db)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dashboard_counters')
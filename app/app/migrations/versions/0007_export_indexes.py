@@ -0,0 +1,45 @@
+"""Indexes for incremental research exports
+
+Revision ID: 0007_export_indexes
+Revises: 0006_dashboard_counters
+Create Date: 2026-10-18
+
+Incremental exports read rows changed since a watermark in
+``(updated_at, id)`` order. Built with CREATE INDEX CONCURRENTLY on
+PostgreSQL, as in ``0002_query_indexes``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.migrations import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_export_indexes'
+down_revision: Union[str, Sequence[str], None] = '0006_dashboard_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('idx_patients_updated_id', 'patients', ['updated_at', 'id']),
+    ('idx_screenings_updated_id', 'screenings', ['updated_at', 'id']),
+    ('idx_diagnoses_updated_id', 'diagnoses', ['updated_at', 'id']),
+    ('idx_samples_updated_id', 'samples', ['updated_at', 'id']),
+    ('idx_annotations_updated_id', 'annotations', ['updated_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            drop_invalid_index(name)
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
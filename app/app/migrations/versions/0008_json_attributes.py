@@ -0,0 +1,100 @@
+"""JSONB clinical attributes and their filter indexes
+
+Revision ID: 0008_json_attributes
+Revises: 0007_export_indexes
+Create Date: 2026-10-18
+
+PostgreSQL: the JSON attribute columns become JSONB (a table rewrite under
+an exclusive lock; run in a maintenance window on large tables). They get
+GIN ``jsonb_path_ops`` indexes for containment filters, and the numeric keys
+get expression indexes. SQLite: indexed keys get virtual generated columns
+with B-tree indexes. Keys and names mirror ``app.db.json_attributes``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.migrations import drop_invalid_index
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_json_attributes'
+down_revision: Union[str, Sequence[str], None] = '0007_export_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('patients', 'contact_info'),
+    ('patients', 'risk_factors'),
+    ('samples', 'metadata'),
+    ('ai_results', 'confidence_scores'),
+    ('annotations', 'override_flags'),
+]
+
+# (table, column, key, numeric)
+INDEXED_KEYS = [
+    ('patients', 'risk_factors', 'hpv_positive', False),
+    ('patients', 'risk_factors', 'previous_abnormal', False),
+    ('patients', 'risk_factors', 'smoking', False),
+    ('ai_results', 'confidence_scores', 'hsil', True),
+    ('ai_results', 'confidence_scores', 'asc_h', True),
+    ('ai_results', 'confidence_scores', 'scc', True),
+]
+
+
+def _gin_index(table: str, column: str) -> str:
+    return f'idx_{table}_{column}_gin_jx'
+
+
+def _key_index(table: str, column: str, key: str) -> str:
+    return f'idx_{table}_{column}_{key}_jx'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        for table, column in JSON_COLUMNS:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE jsonb USING "{column}"::jsonb')
+        # CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for table, column in JSON_COLUMNS:
+                name = _gin_index(table, column)
+                drop_invalid_index(name)
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} '
+                    f'USING gin ("{column}" jsonb_path_ops)'
+                )
+            for table, column, key, numeric in INDEXED_KEYS:
+                if numeric:
+                    name = _key_index(table, column, key)
+                    drop_invalid_index(name)
+                    op.execute(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} '
+                        f"(((\"{column}\" ->> '{key}')::double precision))"
+                    )
+    elif dialect == 'sqlite':
+        for table, column, key, _ in INDEXED_KEYS:
+            generated = f'jx_{column}_{key}'
+            op.execute(
+                f'ALTER TABLE {table} ADD COLUMN {generated} '
+                f"GENERATED ALWAYS AS (json_extract(\"{column}\", '$.{key}')) VIRTUAL"
+            )
+            op.execute(f'CREATE INDEX IF NOT EXISTS {_key_index(table, column, key)} ON {table} ({generated})')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            for table, column, key, numeric in reversed(INDEXED_KEYS):
+                if numeric:
+                    op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {_key_index(table, column, key)}')
+            for table, column in reversed(JSON_COLUMNS):
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {_gin_index(table, column)}')
+        for table, column in reversed(JSON_COLUMNS):
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE json USING "{column}"::json')
+    elif dialect == 'sqlite':
+        for table, column, key, _ in reversed(INDEXED_KEYS):
+            op.execute(f'DROP INDEX IF EXISTS {_key_index(table, column, key)}')
+            op.execute(f'ALTER TABLE {table} DROP COLUMN jx_{column}_{key}')
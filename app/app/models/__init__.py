@@ -13,6 +13,11 @@ from app.models.ai_result import AIResult
 from app.models.annotation import Annotation
 from app.models.audit import AuditLog
 from app.models.integration_metadata import IntegrationMetadata
+from app.models.backfill import BackfillCampaign
+from app.models.status_counter import StatusCounter
+from app.models.dashboard_counter import DashboardCounter
+import app.core.cache  # noqa: F401,E402  (evicts cached entities when their rows change)
+import app.core.principal  # noqa: F401,E402  (evicts cached principals on role or status changes)
 
 __all__ = [
     # User & Auth
@@ -38,4 +43,9 @@ __all__ = [
     # Compliance & Integration
     "AuditLog",
     "IntegrationMetadata",
+    
+    # Operations
+    "BackfillCampaign",
+    "StatusCounter",
+    "DashboardCounter",
 ]
@@ -4,27 +4,28 @@ CervixAI AI Result Model - AI inference outcomes with explainability
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Text, Float, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
+from app.db.json_attributes import JSONDocument
 
 
 class AIResult(Base):
     """AI Result model storing inference outcomes, confidence, and explainability data."""
     __tablename__ = "ai_results"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     
     # Sample reference
-    sample_id = Column(String(36), ForeignKey("samples.id"), nullable=False, index=True)
+    sample_id = Column(GUID, ForeignKey("samples.id"), nullable=False, index=True)
     
     # Diagnosis results as JSON
     # Structure: {"primary": "lsil", "secondary": null, "raw_predictions": {...}}
     diagnosis = Column(JSON, nullable=False)
     
-    # Confidence scores as JSON
+    # Confidence scores as JSON (JSONB on PostgreSQL; high-grade scores indexed for filtering)
     # Structure: {"nilm": 0.05, "asc_us": 0.1, "lsil": 0.75, "hsil": 0.1, ...}
-    confidence_scores = Column(JSON, nullable=False)
+    confidence_scores = Column(JSONDocument, nullable=False)
     
     # Primary prediction for quick access
     primary_prediction = Column(String(50), nullable=True)
@@ -51,7 +52,9 @@ class AIResult(Base):
     # Indexes
     __table_args__ = (
         Index("idx_ai_results_processed_at", "processed_at"),
+        Index("idx_ai_results_processed_id", "processed_at", "id"),  # Keyset pagination
         Index("idx_ai_results_primary_prediction", "primary_prediction"),
+        Index("idx_ai_results_sample_version", "sample_id", "model_version"),  # Batch/backfill skips
     )
     
     def __repr__(self):
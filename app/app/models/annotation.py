@@ -2,24 +2,25 @@
 CervixAI Annotation Model - Clinician overrides and sign-offs
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Text, Boolean, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
+from app.db.json_attributes import JSONDocument
 
 
 class Annotation(Base):
     """Annotation model for clinician review, overrides, and mandatory sign-offs."""
     __tablename__ = "annotations"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     
     # AI Result reference
-    result_id = Column(String(36), ForeignKey("ai_results.id"), nullable=False, index=True)
+    result_id = Column(GUID, ForeignKey("ai_results.id"), nullable=False, index=True)
     
     # Clinician reference
-    clinician_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    clinician_id = Column(GUID, ForeignKey("users.id"), nullable=False, index=True)
     
     # Clinical assessment
     agrees_with_ai = Column(Boolean, nullable=True)
@@ -30,7 +31,7 @@ class Annotation(Base):
     
     # Override flags as JSON for flexibility
     # Structure: {"diagnosis_override": true, "urgency_elevated": true, "reason": "..."}
-    override_flags = Column(JSON, nullable=True, default=dict)
+    override_flags = Column(JSONDocument, nullable=True, default=dict)
     
     # Follow-up recommendations
     follow_up_recommended = Column(Boolean, default=False)
@@ -53,6 +54,9 @@ class Annotation(Base):
     __table_args__ = (
         Index("idx_annotations_signed_off", "signed_off"),
         Index("idx_annotations_created_at", "created_at"),
+        Index("idx_annotations_created_id", "created_at", "id"),  # Keyset pagination
+        Index("idx_annotations_clinician_signed", "clinician_id", "signed_off"),  # Pending sign-offs
+        Index("idx_annotations_updated_id", "updated_at", "id"),  # Incremental exports
     )
     
     def __repr__(self):
@@ -5,19 +5,24 @@ Enhanced with resource tracking and JSON details.
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
 
 
 class AuditLog(Base):
-    """Immutable audit log for HIPAA/GDPR compliance."""
+    """
+    Immutable audit log for HIPAA/GDPR compliance.
+
+    On PostgreSQL the table is partitioned by month on ``timestamp`` with
+    primary key (id, timestamp); see ``app.db.audit_partitions``.
+    """
     __tablename__ = "audit_logs"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     
     # Who performed the action
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    user_id = Column(GUID, ForeignKey("users.id"), nullable=True)
     user_email = Column(String(255), nullable=True)  # Denormalized for historical record
     
     # What action was performed
@@ -49,6 +54,7 @@ class AuditLog(Base):
     # Indexes for efficient querying
     __table_args__ = (
         Index("idx_audit_timestamp", "timestamp"),
+        Index("idx_audit_timestamp_id", "timestamp", "id"),  # Keyset pagination
         Index("idx_audit_user", "user_id"),
         Index("idx_audit_resource", "resource_type", "resource_id"),
     )
@@ -0,0 +1,72 @@
+"""
+CervixAI Backfill Campaign Model - Re-analysis of historical samples for a model version
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Text, Index
+
+from app.db.database import Base
+from app.db.identifiers import GUID, new_id
+
+
+class BackfillCampaign(Base):
+    """Checkpointed campaign that re-analyzes samples lacking a result for a model version."""
+    __tablename__ = "backfill_campaigns"
+
+    id = Column(GUID, primary_key=True, default=new_id)
+
+    # Target model and who started it
+    target_model_version = Column(String(100), nullable=False)
+    created_by_id = Column(GUID, ForeignKey("users.id"), nullable=True)
+
+    # Status: pending, running, paused, completed, failed, cancelled
+    status = Column(String(20), nullable=False, default="pending")
+    error = Column(Text, nullable=True)
+
+    # Processing parameters
+    chunk_size = Column(Integer, nullable=False, default=32)
+    rate_limit = Column(Float, nullable=True)  # images per second, None = unthrottled
+
+    # Checkpoint - samples are processed in id order after this one
+    last_sample_id = Column(GUID, nullable=True)
+
+    # Progress counters
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    run_processed = Column(Integer, nullable=False, default=0)  # since last (re)start
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    resumed_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_backfill_campaigns_status", "status"),
+    )
+
+    def __repr__(self):
+        return f"<BackfillCampaign {self.id[:8]} -> {self.target_model_version} ({self.status})>"
+
+    @property
+    def remaining(self) -> int:
+        """Samples left to process."""
+        return max(self.total - self.processed - self.failed, 0)
+
+    @property
+    def throughput(self) -> float:
+        """Images per second since the campaign was last (re)started."""
+        if not self.resumed_at or not self.run_processed:
+            return 0.0
+        end = self.finished_at or datetime.utcnow()
+        elapsed = (end - self.resumed_at).total_seconds()
+        return self.run_processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self):
+        """Estimated seconds to completion at the current throughput."""
+        if self.status == "completed":
+            return 0
+        rate = self.throughput
+        return round(self.remaining / rate) if rate else None
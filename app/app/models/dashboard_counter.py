@@ -0,0 +1,221 @@
+"""
+CervixAI Dashboard Counter Model - Workload and daily throughput, maintained on write
+"""
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, String, Integer, event, inspect, select, text
+from sqlalchemy.orm import Mapper, Session
+
+from app.db.database import Base
+from app.models.status_counter import TOTAL, rebuild_status_counters, upsert_count
+
+# Scope of counters over all users
+ALL_USERS = ""
+
+
+@dataclass(frozen=True)
+class CounterRule:
+    """
+    One dashboard metric derived from rows of ``table``.
+
+    A row counts when ``condition`` (which reads ``condition_columns``)
+    holds, in the bucket of the UTC day of ``day_column`` (rows without one
+    are skipped) or in ``TOTAL`` when there is no day column. With
+    ``user_column`` it also counts for that user.
+    """
+    metric: str
+    table: str
+    day_column: Optional[str] = None
+    user_column: Optional[str] = None
+    condition: Optional[Callable[[dict], bool]] = None
+    condition_columns: Tuple[str, ...] = ()
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(c for c in (self.day_column, self.user_column, *self.condition_columns) if c)
+
+
+RULES = (
+    CounterRule("pending_signoffs", "annotations", user_column="clinician_id",
+                condition=lambda row: not row["signed_off"], condition_columns=("signed_off",)),
+    CounterRule("signoffs", "annotations", day_column="signed_off_at", user_column="clinician_id",
+                condition=lambda row: bool(row["signed_off"]), condition_columns=("signed_off",)),
+    CounterRule("reviews", "diagnoses", day_column="review_date", user_column="reviewer_id"),
+    CounterRule("screening_analyses", "diagnoses", day_column="ai_analysis_date"),
+    CounterRule("sample_analyses", "ai_results", day_column="processed_at"),
+    CounterRule("screenings_created", "screenings", day_column="created_at"),
+)
+
+RULES_BY_TABLE: Dict[str, List[CounterRule]] = {}
+for _rule in RULES:
+    RULES_BY_TABLE.setdefault(_rule.table, []).append(_rule)
+
+
+class DashboardCounter(Base):
+    """
+    Current value of one dashboard metric for a scope and bucket.
+
+    ``scope`` is a user ID or ``ALL_USERS``; ``bucket`` is a UTC day
+    (``YYYY-MM-DD``) for throughput metrics or ``TOTAL`` for workload
+    metrics. Maintained like ``StatusCounter``: by session flush hooks in the
+    same transaction as the rows counted. Bulk ``query.update()``/``delete()``
+    bypass the hooks; run ``rebuild_counters`` after those.
+    """
+    __tablename__ = "dashboard_counters"
+
+    metric = Column(String(50), primary_key=True)
+    scope = Column(String(36), primary_key=True, default=ALL_USERS)
+    bucket = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DashboardCounter {self.metric}/{self.scope or '*'}/{self.bucket}={self.count}>"
+
+
+def day_bucket(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+def _rule_keys(rule: CounterRule, row: dict) -> List[Tuple[str, str, str]]:
+    if rule.condition is not None and not rule.condition(row):
+        return []
+    bucket = day_bucket(row[rule.day_column]) if rule.day_column else TOTAL
+    if bucket is None:
+        return []
+    keys = [(rule.metric, ALL_USERS, bucket)]
+    if rule.user_column and row[rule.user_column] is not None:
+        keys.append((rule.metric, str(row[rule.user_column]), bucket))
+    return keys
+
+
+def _keys(table: str, row: Optional[dict]) -> Counter:
+    keys = Counter()
+    if row is not None:
+        for rule in RULES_BY_TABLE[table]:
+            keys.update(_rule_keys(rule, row))
+    return keys
+
+
+def _tracked_columns(table: str) -> set:
+    return {column for rule in RULES_BY_TABLE[table] for column in rule.columns}
+
+
+def _new_value(instance, column: str):
+    value = getattr(instance, column)
+    if value is None:
+        # Column defaults are applied at INSERT, after this hook runs
+        default = instance.__table__.c[column].default
+        if default is not None and default.is_scalar:
+            value = default.arg
+        elif default is not None and default.is_callable:
+            value = datetime.utcnow()  # timestamp defaults are utcnow
+    return value
+
+
+def _previous_value(instance, column: str):
+    history = inspect(instance).attrs[column].history
+    return history.deleted[0] if history.deleted else getattr(instance, column)
+
+
+def _deltas(session: Session) -> Counter:
+    """Per-(metric, scope, bucket) changes in the session's pending flush."""
+    deltas = Counter()
+    for instance in session.new:
+        table = getattr(instance, "__tablename__", None)
+        if table in RULES_BY_TABLE:
+            deltas.update(_keys(table, {c: _new_value(instance, c) for c in _tracked_columns(table)}))
+    for instance in session.deleted:
+        table = getattr(instance, "__tablename__", None)
+        if table in RULES_BY_TABLE:
+            deltas.subtract(_keys(table, {c: _previous_value(instance, c) for c in _tracked_columns(table)}))
+    for instance in session.dirty:
+        table = getattr(instance, "__tablename__", None)
+        if table not in RULES_BY_TABLE or instance in session.deleted:
+            continue
+        columns = _tracked_columns(table)
+        state = inspect(instance)
+        if not any(state.attrs[c].history.has_changes() for c in columns):
+            continue
+        deltas.update(_keys(table, {c: getattr(instance, c) for c in columns}))
+        deltas.subtract(_keys(table, {c: _previous_value(instance, c) for c in columns}))
+    return deltas
+
+
+def _keep_previous(target, value, oldvalue, initiator):
+    return value
+
+
+@event.listens_for(Mapper, "mapper_configured")
+def _track_counted_history(mapper, class_):
+    # Load previous values on assignment, even on expired instances, so the
+    # flush hook knows which counters to decrement
+    table = getattr(mapper.local_table, "name", None)
+    if table in RULES_BY_TABLE:
+        for column in _tracked_columns(table):
+            event.listen(getattr(class_, column), "set", _keep_previous, active_history=True, retval=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_dashboard_deltas(session, flush_context, instances):
+    deltas = _deltas(session)
+    if deltas:
+        session.info.setdefault("dashboard_counter_deltas", Counter()).update(deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_dashboard_deltas(session, flush_context):
+    deltas = session.info.pop("dashboard_counter_deltas", None)
+    if not deltas:
+        return
+    connection = session.connection()
+    for (metric, scope, bucket), delta in sorted(deltas.items()):
+        if delta:
+            upsert_count(
+                connection, DashboardCounter.__table__,
+                {"metric": metric, "scope": scope, "bucket": bucket}, delta
+            )
+
+
+def dashboard_counts(db: Session, buckets: List[str], scopes: List[str]) -> Dict[Tuple[str, str, str], int]:
+    """``{(metric, scope, bucket): count}`` for the given buckets and scopes."""
+    rows = db.execute(
+        select(DashboardCounter.metric, DashboardCounter.scope, DashboardCounter.bucket, DashboardCounter.count)
+        .where(DashboardCounter.bucket.in_(buckets), DashboardCounter.scope.in_(scopes))
+    ).all()
+    return {(metric, scope, bucket): count for metric, scope, bucket, count in rows}
+
+
+def rebuild_dashboard_counters(db: Session):
+    """Recompute every dashboard counter from the base tables."""
+    db.execute(DashboardCounter.__table__.delete())
+    totals = Counter()
+    for table_name in RULES_BY_TABLE:
+        table = Base.metadata.tables[table_name]
+        columns = sorted(_tracked_columns(table_name))
+        rows = db.execute(select(*[table.c[c] for c in columns]).execution_options(yield_per=5000))
+        for values in rows:
+            totals.update(_keys(table_name, dict(zip(columns, values))))
+    for (metric, scope, bucket), count in totals.items():
+        if count:
+            db.add(DashboardCounter(metric=metric, scope=scope, bucket=bucket, count=count))
+    db.flush()
+
+
+def rebuild_counters(db: Session):
+    """
+    Recount status and dashboard counters in one transaction.
+
+    On PostgreSQL the counter tables are locked first, so writes that commit
+    meanwhile wait and then apply their deltas on top of the new counts.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE status_counters, dashboard_counters IN EXCLUSIVE MODE"))
+    rebuild_status_counters(db)
+    rebuild_dashboard_counters(db)
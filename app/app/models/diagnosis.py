@@ -3,11 +3,11 @@ CervixAI Diagnosis Model - AI predictions and clinician reviews
 """
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Text, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Text, Boolean, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
 
 
 class DiagnosisCategory(str, enum.Enum):
@@ -32,8 +32,8 @@ class Diagnosis(Base):
     """
     __tablename__ = "diagnoses"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    screening_id = Column(String(36), ForeignKey("screenings.id"), unique=True, nullable=False)
+    id = Column(GUID, primary_key=True, default=new_id)
+    screening_id = Column(GUID, ForeignKey("screenings.id"), unique=True, nullable=False)
     
     # AI Prediction
     ai_prediction = Column(String(50), nullable=True)
@@ -42,7 +42,7 @@ class Diagnosis(Base):
     ai_notes = Column(Text, nullable=True)  # AI explanation
     
     # Clinician Review
-    reviewer_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    reviewer_id = Column(GUID, ForeignKey("users.id"), nullable=True)
     clinician_agrees_with_ai = Column(Boolean, nullable=True)
     clinician_diagnosis = Column(String(50), nullable=True)
     clinician_notes = Column(Text, nullable=True)
@@ -65,5 +65,11 @@ class Diagnosis(Base):
     screening = relationship("Screening", back_populates="diagnosis")
     reviewer = relationship("User", back_populates="diagnoses")
     
+    # Indexes
+    __table_args__ = (
+        Index("idx_diagnoses_reviewer", "reviewer_id"),
+        Index("idx_diagnoses_updated_id", "updated_at", "id"),  # Incremental exports
+    )
+    
     def __repr__(self):
         return f"<Diagnosis {self.id} - {self.final_diagnosis or 'Pending'}>"
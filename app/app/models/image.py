@@ -3,11 +3,11 @@ CervixAI Image Model - Screening images (Pap smears, colposcopy)
 """
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
 
 
 class ImageType(str, enum.Enum):
@@ -21,8 +21,8 @@ class ScreeningImage(Base):
     """Uploaded screening image."""
     __tablename__ = "screening_images"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    screening_id = Column(String(36), ForeignKey("screenings.id"), nullable=False)
+    id = Column(GUID, primary_key=True, default=new_id)
+    screening_id = Column(GUID, ForeignKey("screenings.id"), nullable=False)
     
     # File info
     filename = Column(String(255), nullable=False)
@@ -43,5 +43,10 @@ class ScreeningImage(Base):
     # Relationships
     screening = relationship("Screening", back_populates="images")
     
+    # Indexes
+    __table_args__ = (
+        Index("idx_screening_images_screening", "screening_id", "uploaded_at"),
+    )
+    
     def __repr__(self):
         return f"<ScreeningImage {self.filename}>"
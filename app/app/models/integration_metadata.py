@@ -3,16 +3,16 @@ CervixAI Integration Metadata Model - External system connector configurations
 """
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, JSON, Boolean, Text
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
 
 
 class IntegrationMetadata(Base):
     """Integration metadata for managing external system connectors."""
     __tablename__ = "integration_metadata"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     
     # System identification
     system_name = Column(String(255), unique=True, nullable=False, index=True)
@@ -3,18 +3,19 @@ CervixAI Patient Model
 Enhanced with JSONB contact_info and longitudinal tracking support.
 """
 from datetime import datetime, date
-from sqlalchemy import Column, String, Date, DateTime, Boolean, Text, JSON, Index
+from sqlalchemy import Column, String, Date, DateTime, Boolean, Text, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
+from app.db.json_attributes import JSONDocument
 
 
 class Patient(Base):
     """Patient model for tracking individuals undergoing screening."""
     __tablename__ = "patients"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     
     # Demographics
     first_name = Column(String(100), nullable=False)
@@ -24,7 +25,7 @@ class Patient(Base):
     
     # Contact as JSONB for flexibility
     # Structure: {"email": "...", "phone": "...", "address": {...}}
-    contact_info = Column(JSON, nullable=True, default=dict)
+    contact_info = Column(JSONDocument, nullable=True, default=dict)
     
     # Legacy contact fields for compatibility
     email = Column(String(255), nullable=True)
@@ -41,9 +42,9 @@ class Patient(Base):
     # Clinical notes
     notes = Column(Text, nullable=True)
     
-    # Risk factors and history as JSON
+    # Risk factors and history as JSON (JSONB on PostgreSQL; boolean flags indexed for filtering)
     # Structure: {"hpv_positive": true, "previous_abnormal": false, "smoking": false, ...}
-    risk_factors = Column(JSON, nullable=True, default=dict)
+    risk_factors = Column(JSONDocument, nullable=True, default=dict)
     
     # Status
     is_active = Column(Boolean, default=True)
@@ -60,6 +61,8 @@ class Patient(Base):
     __table_args__ = (
         Index("idx_patients_name", "last_name", "first_name"),
         Index("idx_patients_dob", "date_of_birth"),
+        Index("idx_patients_created_id", "created_at", "id"),  # Keyset pagination
+        Index("idx_patients_updated_id", "updated_at", "id"),  # Incremental exports
     )
     
     @property
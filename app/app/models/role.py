@@ -4,16 +4,16 @@ CervixAI Role Model - RBAC permissions management
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, Text, JSON
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
 
 
 class Role(Base):
     """Role model for Role-Based Access Control."""
     __tablename__ = "roles"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     role_name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
     
@@ -32,9 +32,10 @@ class Role(Base):
         return f"<Role {self.role_name}>"
     
     def has_permission(self, resource: str, action: str) -> bool:
-        """Check if role has specific permission."""
-        resource_perms = self.permissions.get(resource, [])
-        return action in resource_perms or "*" in resource_perms
+        """Check if role has specific permission (as committed and compiled for ``require_permission``)."""
+        from app.core.permissions import permission_registry
+
+        return permission_registry.has_permission(self.role_name, resource, action)
 
 
 # Default roles to seed
@@ -2,21 +2,22 @@
 CervixAI Sample Model - Cervical sample metadata and batch info
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
+from app.db.json_attributes import JSONDocument
 
 
 class Sample(Base):
     """Sample model for cervical samples collected for analysis."""
     __tablename__ = "samples"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     
     # Patient reference
-    patient_id = Column(String(36), ForeignKey("patients.id"), nullable=False, index=True)
+    patient_id = Column(GUID, ForeignKey("patients.id"), nullable=False, index=True)
     
     # Sample details
     collection_date = Column(DateTime, nullable=False)
@@ -25,7 +26,7 @@ class Sample(Base):
     
     # Flexible metadata as JSON
     # Can store: collection_site, preparation_method, quality_indicators, etc.
-    metadata = Column(JSON, nullable=True, default=dict)
+    metadata = Column(JSONDocument, nullable=True, default=dict)
     
     # Processing status
     status = Column(String(50), default="pending")  # pending, processing, analyzed, reviewed
@@ -45,6 +46,8 @@ class Sample(Base):
     __table_args__ = (
         Index("idx_samples_collection_date", "collection_date"),
         Index("idx_samples_status", "status"),
+        Index("idx_samples_created_id", "created_at", "id"),  # Keyset pagination
+        Index("idx_samples_updated_id", "updated_at", "id"),  # Incremental exports
     )
     
     def __repr__(self):
@@ -3,11 +3,11 @@ CervixAI Screening Model - Episodes linking patients, images, and diagnoses
 """
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
 
 
 class ScreeningStatus(str, enum.Enum):
@@ -23,8 +23,8 @@ class Screening(Base):
     """Screening episode - a single screening session for a patient."""
     __tablename__ = "screenings"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    patient_id = Column(String(36), ForeignKey("patients.id"), nullable=False)
+    id = Column(GUID, primary_key=True, default=new_id)
+    patient_id = Column(GUID, ForeignKey("patients.id"), nullable=False)
     
     # Status tracking
     status = Column(String(50), default=ScreeningStatus.PENDING.value)
@@ -43,5 +43,13 @@ class Screening(Base):
     images = relationship("ScreeningImage", back_populates="screening")
     diagnosis = relationship("Diagnosis", back_populates="screening", uselist=False)
     
+    # Indexes
+    __table_args__ = (
+        Index("idx_screenings_created_id", "created_at", "id"),  # Keyset pagination
+        Index("idx_screenings_patient_created", "patient_id", "created_at", "id"),
+        Index("idx_screenings_status_created", "status", "created_at", "id"),
+        Index("idx_screenings_updated_id", "updated_at", "id"),  # Incremental exports
+    )
+    
     def __repr__(self):
         return f"<Screening {self.id} for Patient {self.patient_id}>"
@@ -0,0 +1,159 @@
+"""
+CervixAI Status Counter Model - Row counts per status, maintained on write
+"""
+from collections import Counter
+from sqlalchemy import Column, String, Integer, event, inspect, select, func
+from sqlalchemy.orm import Mapper, Session
+
+from app.db.database import Base
+
+# Tables whose rows are counted, and the column counted by (None = totals only)
+COUNTED_TABLES = {
+    "patients": None,
+    "screenings": "status",
+    "samples": "status",
+}
+
+# Status key used for tables counted by total only
+TOTAL = "all"
+
+
+class StatusCounter(Base):
+    """
+    Current row count for one (table, status) pair.
+
+    Kept up to date by a session flush hook in the same transaction as the
+    rows it counts, so dashboards and list totals read a handful of rows
+    instead of scanning large tables. Bulk ``query.update()``/``delete()``
+    bypass the hook; run ``rebuild_status_counters`` after those.
+    """
+    __tablename__ = "status_counters"
+
+    entity = Column(String(50), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<StatusCounter {self.entity}/{self.status}={self.count}>"
+
+
+def _status_of(instance, column: str):
+    if not column:
+        return TOTAL
+    value = getattr(instance, column)
+    if value is None:
+        # Column defaults are applied at INSERT, after this hook runs
+        default = instance.__table__.c[column].default
+        if default is not None and default.is_scalar:
+            value = default.arg
+    return value
+
+
+def _deltas(session: Session) -> Counter:
+    """Per-(table, status) count changes in the session's pending flush."""
+    deltas = Counter()
+    for instance in session.new:
+        table = getattr(instance, "__tablename__", None)
+        if table in COUNTED_TABLES:
+            deltas[(table, _status_of(instance, COUNTED_TABLES[table]))] += 1
+    for instance in session.deleted:
+        table = getattr(instance, "__tablename__", None)
+        if table in COUNTED_TABLES:
+            column = COUNTED_TABLES[table]
+            if column:
+                history = inspect(instance).attrs[column].history
+                status = history.deleted[0] if history.deleted else getattr(instance, column)
+            else:
+                status = TOTAL
+            deltas[(table, status)] -= 1
+    for instance in session.dirty:
+        table = getattr(instance, "__tablename__", None)
+        column = COUNTED_TABLES.get(table)
+        if not column or instance in session.deleted:
+            continue
+        history = inspect(instance).attrs[column].history
+        if history.added and history.deleted and history.added[0] != history.deleted[0]:
+            deltas[(table, history.deleted[0])] -= 1
+            deltas[(table, history.added[0])] += 1
+    return deltas
+
+
+def upsert_count(connection, table, key: dict, delta: int):
+    """Add ``delta`` to the counter row of ``table`` identified by ``key``, creating it if missing."""
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        stmt = insert(table).values(**key, count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in key],
+            set_={"count": table.c.count + delta}
+        )
+        connection.execute(stmt)
+        return
+
+    updated = connection.execute(
+        table.update()
+        .where(*[table.c[name] == value for name, value in key.items()])
+        .values(count=table.c.count + delta)
+    )
+    if not updated.rowcount:
+        connection.execute(table.insert().values(**key, count=delta))
+
+
+def _keep_previous(target, value, oldvalue, initiator):
+    return value
+
+
+@event.listens_for(Mapper, "mapper_configured")
+def _track_status_history(mapper, class_):
+    # Load the previous status on assignment, even on expired instances,
+    # so the flush hook knows which counter to decrement
+    column = COUNTED_TABLES.get(getattr(mapper.local_table, "name", None))
+    if column:
+        event.listen(getattr(class_, column), "set", _keep_previous, active_history=True, retval=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_status_deltas(session, flush_context, instances):
+    deltas = _deltas(session)
+    if deltas:
+        session.info.setdefault("status_counter_deltas", Counter()).update(deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_status_deltas(session, flush_context):
+    deltas = session.info.pop("status_counter_deltas", None)
+    if not deltas:
+        return
+    connection = session.connection()
+    for (entity, status), delta in sorted(deltas.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        if delta and status is not None:
+            upsert_count(connection, StatusCounter.__table__, {"entity": entity, "status": status}, delta)
+
+
+def status_counts(db: Session, entity: str) -> dict:
+    """Current ``{status: count}`` for a counted table."""
+    rows = db.execute(
+        select(StatusCounter.status, StatusCounter.count).where(StatusCounter.entity == entity)
+    ).all()
+    return {status: count for status, count in rows if count}
+
+
+def rebuild_status_counters(db: Session):
+    """Recompute every counter from the base tables (after bulk changes or on first start)."""
+    db.execute(StatusCounter.__table__.delete())
+    for entity, column in COUNTED_TABLES.items():
+        table = Base.metadata.tables[entity]
+        if column:
+            rows = db.execute(select(table.c[column], func.count()).group_by(table.c[column])).all()
+        else:
+            rows = [(TOTAL, db.execute(select(func.count()).select_from(table)).scalar())]
+        for status, count in rows:
+            if status is not None and count:
+                db.add(StatusCounter(entity=entity, status=status, count=count))
+    db.flush()
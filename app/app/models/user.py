@@ -6,9 +6,9 @@ import enum
 from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.database import Base
+from app.db.identifiers import GUID, new_id
 
 
 class UserRole(str, enum.Enum):
@@ -24,7 +24,7 @@ class User(Base):
     """User model for authentication and authorization."""
     __tablename__ = "users"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     
     # Authentication
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -36,7 +36,7 @@ class User(Base):
     
     # Role - supports both legacy string role and new RBAC
     role = Column(String(50), nullable=False, default=UserRole.PHYSICIAN.value)
-    role_id = Column(String(36), ForeignKey("roles.id"), nullable=True)
+    role_id = Column(GUID, ForeignKey("roles.id"), nullable=True)
     
     # Status
     is_active = Column(Boolean, default=True)
@@ -71,8 +71,8 @@ class User(Base):
         return datetime.utcnow() < self.locked_until
     
     def has_permission(self, resource: str, action: str) -> bool:
-        """Check if user has specific permission via role."""
-        if self.role_ref:
-            return self.role_ref.has_permission(resource, action)
-        # Fallback for legacy role
-        return self.role == UserRole.ADMIN.value
+        """Check if user has specific permission via role (``role_ref``, else the legacy role)."""
+        from app.core.permissions import permission_registry
+
+        role = self.role_ref.role_name if self.role_ref else self.role
+        return permission_registry.has_permission(role, resource, action)
@@ -6,10 +6,11 @@ from app.schemas.user import (
     UserBase, UserCreate, UserLogin, UserUpdate, UserResponse, Token, TokenRefresh
 )
 from app.schemas.patient import (
-    PatientBase, PatientCreate, PatientUpdate, PatientResponse, PatientListResponse
+    PatientBase, PatientCreate, PatientUpdate, PatientResponse, PatientListResponse,
+    PatientSearchHit, PatientSearchResponse, PatientSummary, PatientImportError, PatientImportReport
 )
 from app.schemas.screening import (
-    ScreeningCreate, ScreeningUpdate, ScreeningResponse, ScreeningListResponse
+    ScreeningCreate, ScreeningUpdate, ScreeningResponse, ScreeningListResponse, ScreeningBundle
 )
 from app.schemas.image import ImageResponse, ImageListResponse
 from app.schemas.diagnosis import (
@@ -20,6 +21,8 @@ from app.schemas.sample import SampleBase, SampleCreate, SampleUpdate, SampleRea
 from app.schemas.ai_result import AIResultBase, AIResultCreate, AIResultRead
 from app.schemas.annotation import AnnotationBase, AnnotationCreate, AnnotationRead, AnnotationSignOff
 from app.schemas.role import RoleBase, RoleCreate, RoleRead
+from app.schemas.backfill import BackfillCreate, BackfillRead
+from app.schemas.stats import DashboardStats, ThroughputStats, UserDashboardStats
 
 __all__ = [
     # User
@@ -27,8 +30,11 @@ __all__ = [
     "Token", "TokenRefresh",
     # Patient
     "PatientBase", "PatientCreate", "PatientUpdate", "PatientResponse", "PatientListResponse",
+    "PatientSearchHit", "PatientSearchResponse", "PatientSummary", "PatientImportError",
+    "PatientImportReport",
     # Screening
     "ScreeningCreate", "ScreeningUpdate", "ScreeningResponse", "ScreeningListResponse",
+    "ScreeningBundle",
     # Image
     "ImageResponse", "ImageListResponse",
     # Diagnosis
@@ -43,4 +49,8 @@ __all__ = [
     "AnnotationBase", "AnnotationCreate", "AnnotationRead", "AnnotationSignOff",
     # Role
     "RoleBase", "RoleCreate", "RoleRead",
+    # Backfill
+    "BackfillCreate", "BackfillRead",
+    # Statistics
+    "DashboardStats", "ThroughputStats", "UserDashboardStats",
 ]
@@ -3,7 +3,7 @@ CervixAI AI Result Schemas
 Pydantic models for AIResult API requests and responses.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List, Tuple
+from typing import Any, Optional, Dict, List, Tuple
 from datetime import datetime
 from uuid import UUID
 
@@ -11,7 +11,7 @@ from uuid import UUID
 class AIResultBase(BaseModel):
     """Base AI result schema."""
     sample_id: UUID
-    diagnosis: Dict[str, float] = Field(
+    diagnosis: Dict[str, Any] = Field(
         ..., 
         example={"primary": "lsil", "raw_predictions": {"nilm": 0.1, "lsil": 0.8}}
     )
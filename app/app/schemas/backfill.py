@@ -0,0 +1,41 @@
+"""
+CervixAI Backfill Schemas
+Pydantic models for model-version backfill campaigns.
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class BackfillCreate(BaseModel):
+    """Schema for starting a backfill campaign."""
+    target_model_version: Optional[str] = Field(
+        None, description="Defaults to the loaded model's version"
+    )
+    chunk_size: Optional[int] = Field(None, ge=1, le=1000)
+    rate_limit: Optional[float] = Field(
+        None, gt=0, description="Images per second; defaults to settings.backfill_rate_limit"
+    )
+
+
+class BackfillRead(BaseModel):
+    """Schema for campaign progress."""
+    id: str
+    target_model_version: str
+    status: str
+    chunk_size: int
+    rate_limit: Optional[float] = None
+    total: int
+    processed: int
+    failed: int
+    remaining: int
+    throughput: float = Field(..., description="Images per second since the last (re)start")
+    eta_seconds: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
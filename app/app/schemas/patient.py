@@ -2,8 +2,8 @@
 CervixAI Patient Schemas
 """
 from datetime import datetime, date
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr
+from typing import Any, Dict, Optional, List
+from pydantic import BaseModel, EmailStr, Field
 
 
 class PatientBase(BaseModel):
@@ -15,20 +15,30 @@ class PatientBase(BaseModel):
     phone: Optional[str] = None
     medical_record_number: Optional[str] = None
     notes: Optional[str] = None
+    risk_factors: Optional[Dict[str, Any]] = Field(
+        default_factory=dict,
+        examples=[{"hpv_positive": True, "previous_abnormal": False, "smoking": False}]
+    )
 
 
 class PatientCreate(PatientBase):
     """Schema for creating a patient."""
+    # Column lengths, checked here so an over-long value fails validation, not the insert
+    first_name: str = Field(..., max_length=100)
+    last_name: str = Field(..., max_length=100)
+    phone: Optional[str] = Field(None, max_length=20)
+    medical_record_number: Optional[str] = Field(None, max_length=50)
     consent_given: bool = False
 
 
 class PatientUpdate(BaseModel):
     """Schema for updating a patient."""
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
+    first_name: Optional[str] = Field(None, max_length=100)
+    last_name: Optional[str] = Field(None, max_length=100)
     email: Optional[EmailStr] = None
-    phone: Optional[str] = None
+    phone: Optional[str] = Field(None, max_length=20)
     notes: Optional[str] = None
+    risk_factors: Optional[Dict[str, Any]] = None
     consent_given: Optional[bool] = None
 
 
@@ -44,7 +54,53 @@ class PatientResponse(PatientBase):
         from_attributes = True
 
 
+class PatientSummary(BaseModel):
+    """Identifying fields shown alongside a patient's records."""
+    id: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    medical_record_number: Optional[str] = None
+    consent_given: bool
+    
+    class Config:
+        from_attributes = True
+
+
+class PatientSearchHit(PatientResponse):
+    """Patient search result with its relevance score."""
+    score: Optional[float] = None
+
+
+class PatientSearchResponse(BaseModel):
+    """Schema for ranked patient search results."""
+    items: List[PatientSearchHit]
+    exact_mrn: bool = False
+
+
 class PatientListResponse(BaseModel):
     """Schema for paginated patient list."""
-    total: int
+    total: Optional[int] = None  # None when count=none
+    count_strategy: str = "exact"  # exact, estimated, cached, counter or none
     items: List[PatientResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class PatientImportError(BaseModel):
+    """A row that was not imported, and why."""
+    row: int
+    medical_record_number: Optional[str] = None
+    error: str
+
+
+class PatientImportReport(BaseModel):
+    """Outcome of a bulk patient import."""
+    import_id: str
+    rows: int = 0
+    created: int = 0
+    skipped_existing: int = 0
+    failed: int = 0
+    dry_run: bool = False
+    errors: List[PatientImportError] = []
+    errors_truncated: bool = False
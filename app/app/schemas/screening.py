@@ -5,6 +5,11 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel
 
+from app.schemas.ai_result import AIResultRead
+from app.schemas.diagnosis import DiagnosisResponse
+from app.schemas.image import ImageResponse
+from app.schemas.patient import PatientSummary
+
 
 class ScreeningCreate(BaseModel):
     """Schema for creating a screening episode."""
@@ -36,5 +41,16 @@ class ScreeningResponse(BaseModel):
 
 class ScreeningListResponse(BaseModel):
     """Schema for paginated screening list."""
-    total: int
+    total: Optional[int] = None  # None when count=none
+    count_strategy: str = "exact"  # exact, estimated, cached, counter or none
     items: List[ScreeningResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class ScreeningBundle(ScreeningResponse):
+    """A screening with everything needed to display the case."""
+    patient: PatientSummary
+    images: List[ImageResponse]
+    diagnosis: Optional[DiagnosisResponse] = None
+    latest_ai_results: List[AIResultRead]  # The patient's most recent, newest first
@@ -0,0 +1,34 @@
+"""
+CervixAI Statistics Schemas
+"""
+from datetime import date
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class ThroughputStats(BaseModel):
+    """Work completed on one (UTC) day."""
+    screenings_created: int = 0
+    screening_analyses: int = 0
+    sample_analyses: int = 0
+    reviews: int = 0
+    signoffs: int = 0
+
+
+class UserDashboardStats(BaseModel):
+    """One clinician's workload and output."""
+    user_id: str
+    pending_signoffs: int = 0
+    reviews_today: int = 0
+    signoffs_today: int = 0
+
+
+class DashboardStats(BaseModel):
+    """Dashboard totals, read from maintained counters."""
+    day: date
+    patients: int = 0
+    screenings_by_status: Dict[str, int] = {}
+    pending_reviews: int = 0
+    pending_signoffs: int = 0
+    today: ThroughputStats
+    user: Optional[UserDashboardStats] = None
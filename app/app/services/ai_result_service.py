@@ -2,151 +2,340 @@
 CervixAI AI Result Service
 Business logic for AI inference and results.
 """
-import random
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Iterator, Dict, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import and_, select, update
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models import AIResult, Sample, Screening, AuditLog
+from app.models.status_counter import StatusCounter, upsert_count
 from app.schemas.ai_result import AIResultCreate
+from app.services.inference import (
+    DIAGNOSIS_CATEGORIES,
+    InferenceEngine,
+    get_inference_engine,
+    get_inference_pool,
+)
+from app.services.tensor_store import get_tensor_store, source_fingerprint
 
 
-# Diagnosis categories for cervical screening
-DIAGNOSIS_CATEGORIES = [
-    "nilm",        # Negative for intraepithelial lesion or malignancy
-    "asc_us",      # Atypical squamous cells of undetermined significance
-    "asc_h",       # Atypical squamous cells, cannot exclude HSIL
-    "lsil",        # Low-grade squamous intraepithelial lesion
-    "hsil",        # High-grade squamous intraepithelial lesion
-    "scc",         # Squamous cell carcinoma
-    "agc",         # Atypical glandular cells
-    "adenocarcinoma",
-    "unsatisfactory"
-]
+# Sample statuses eligible for batch analysis
+ANALYZABLE_SAMPLE_STATUSES = ("pending", "uploaded")
+
+# Status of samples claimed by a running batch analysis
+PROCESSING_STATUS = "processing"
+
+# A claim this old is assumed to belong to a run that died
+STALE_CLAIM_AFTER = timedelta(minutes=30)
 
 
 class AIResultService:
     """Service for AI inference and result management."""
-    
-    def __init__(self, db: Session, current_user=None):
+
+    def __init__(self, db: Session, current_user=None, engine: Optional[InferenceEngine] = None):
         self.db = db
         self.user = current_user
-    
+        self.engine = engine or get_inference_engine()
+
     def run_analysis(self, screening_id: str = None, sample_id: str = None) -> Optional[AIResult]:
-        """Run AI analysis on a screening or sample."""
+        """
+        Run AI analysis on a screening or sample.
+
+        The result and its audit entry are staged on the session; the caller
+        commits them together.
+        """
         # Get the sample/screening
         if screening_id:
             screening = self.db.query(Screening).filter(Screening.id == screening_id).first()
             if not screening:
                 return None
-            
-            # Simulate AI inference
-            result = self._simulate_ai_inference()
-            
+
+            # Run AI inference on the primary image
+            primary_image = screening.images[0] if screening.images else None
+            result = self.engine.analyze(primary_image.file_path if primary_image else None)
+
             # Create result (store in existing Diagnosis model or new AIResult)
             from app.models import Diagnosis, DiagnosisCategory
-            
+
             diagnosis = Diagnosis(
                 screening_id=screening_id,
                 ai_prediction=result["primary_prediction"],
                 ai_confidence=result["primary_confidence"],
                 ai_notes=result["ai_notes"],
-                status="pending_review"
+                ai_analysis_date=datetime.utcnow()
             )
             self.db.add(diagnosis)
-            
+
             # Update screening status
             screening.status = "ai_analyzed"
-            
-            self.db.commit()
-            self.db.refresh(diagnosis)
-            
+
+            self.db.flush()
+
             self._log_action("diagnosis.ai_analyze", diagnosis.id, {
                 "prediction": result["primary_prediction"],
                 "confidence": result["primary_confidence"]
             })
-            
+
             return diagnosis
-            
+
         elif sample_id:
             sample = self.db.query(Sample).filter(Sample.id == sample_id).first()
             if not sample:
                 return None
-            
-            # Simulate AI inference
-            result = self._simulate_ai_inference()
-            
+
+            # Run AI inference
+            result = self.engine.analyze(sample.image_path)
+
             # Create AIResult
-            ai_result = AIResult(
-                sample_id=sample_id,
-                diagnosis=result["diagnosis"],
-                confidence_scores=result["confidence_scores"],
-                primary_prediction=result["primary_prediction"],
-                primary_confidence=result["primary_confidence"],
-                model_version="1.0.0",
-                model_name="CervixAI-ResNet50",
-                ai_notes=result["ai_notes"]
-            )
+            ai_result = self._build_ai_result(sample, result)
             self.db.add(ai_result)
-            
+
             # Update sample status
             sample.status = "analyzed"
-            
-            self.db.commit()
-            self.db.refresh(ai_result)
-            
+
+            self.db.flush()
+
             self._log_action("ai_result.create", ai_result.id, {
                 "prediction": result["primary_prediction"],
                 "confidence": result["primary_confidence"]
             })
-            
+
             return ai_result
-        
+
         return None
-    
+
+    def get_pending_batch_samples(self, batch_id: str, model_version: str = None) -> List[Sample]:
+        """
+        Get samples in a batch that still need analysis.
+
+        Samples that already have a result for the model version are skipped,
+        so re-running an interrupted batch only picks up the remainder.
+        """
+        model_version = model_version or self.engine.model_version
+        already_analyzed = (
+            self.db.query(AIResult.id)
+            .filter(
+                AIResult.sample_id == Sample.id,
+                AIResult.model_version == model_version
+            )
+            .exists()
+        )
+        return (
+            self.db.query(Sample)
+            .filter(
+                Sample.batch_id == batch_id,
+                Sample.status.in_(ANALYZABLE_SAMPLE_STATUSES),
+                ~already_analyzed
+            )
+            .order_by(Sample.collection_date, Sample.id)
+            .all()
+        )
+
+    def claim_batch_samples(
+        self,
+        batch_id: str,
+        model_version: str = None
+    ) -> Tuple[List[Sample], Dict[str, str]]:
+        """
+        Atomically mark a batch's samples that still need analysis as
+        ``processing`` for this run.
+
+        A conditional UPDATE per source status, so of concurrent runs of the
+        same batch (in any process) each sample is claimed by exactly one.
+        Claims older than ``STALE_CLAIM_AFTER`` are taken over. Returns the
+        claimed samples and, by sample id, the status ``release_samples``
+        puts each back to if it is not analyzed.
+        """
+        model_version = model_version or self.engine.model_version
+        now = datetime.utcnow()
+        unanalyzed = ~(
+            select(AIResult.id)
+            .where(AIResult.sample_id == Sample.id, AIResult.model_version == model_version)
+            .exists()
+        )
+        # (status counted before the claim, status to release to, condition)
+        sources = [(status, status, Sample.status == status) for status in ANALYZABLE_SAMPLE_STATUSES]
+        sources.append((
+            PROCESSING_STATUS, "pending",
+            and_(Sample.status == PROCESSING_STATUS, Sample.updated_at < now - STALE_CLAIM_AFTER)
+        ))
+
+        previous = {}
+        for counted, release_to, condition in sources:
+            claimed = self.db.execute(
+                update(Sample)
+                .where(Sample.batch_id == batch_id, condition, unanalyzed)
+                .values(status=PROCESSING_STATUS, updated_at=now)
+                .returning(Sample.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            previous.update(dict.fromkeys(claimed, release_to))
+            if claimed and counted != PROCESSING_STATUS:
+                # Bulk updates bypass the ORM flush hook that maintains the counters
+                connection = self.db.connection()
+                upsert_count(connection, StatusCounter.__table__,
+                             {"entity": "samples", "status": counted}, -len(claimed))
+                upsert_count(connection, StatusCounter.__table__,
+                             {"entity": "samples", "status": PROCESSING_STATUS}, len(claimed))
+        self.db.commit()
+
+        if not previous:
+            return [], previous
+        samples = (
+            self.db.query(Sample)
+            .filter(Sample.id.in_(previous))
+            .order_by(Sample.collection_date, Sample.id)
+            .all()
+        )
+        return samples, previous
+
+    def release_samples(self, previous: Dict[str, str]):
+        """
+        Return claimed samples that were not analyzed to their status before
+        ``claim_batch_samples``, so a later run picks them up again.
+        """
+        if not previous:
+            return
+        unfinished = (
+            self.db.query(Sample)
+            .filter(Sample.id.in_(previous), Sample.status == PROCESSING_STATUS)
+            .all()
+        )
+        for sample in unfinished:
+            sample.status = previous[sample.id]
+        self.db.commit()
+
+    def analyze_samples(
+        self,
+        samples: List[Sample],
+        chunk_size: int = None,
+        update_status: bool = True
+    ) -> Iterator[dict]:
+        """
+        Analyze samples on the inference pool and persist results in bulk.
+
+        Each chunk's images are decoded and preprocessed on the pool (or read
+        from the tensor store), predicted as one batch, and its AIResult rows,
+        sample status updates and audit entries are committed together.
+        Yields one progress event per sample as chunks complete.
+
+        ``update_status=False`` leaves sample status untouched, for
+        re-analysis of samples that are already further along the workflow.
+        """
+        chunk_size = chunk_size or settings.ai_batch_chunk_size
+        total = len(samples)
+        processed = 0
+
+        for start in range(0, total, chunk_size):
+            chunk = samples[start:start + chunk_size]
+            tensors = self._load_tensors(chunk)
+
+            events = {}
+            ready = []
+            for sample, tensor in zip(chunk, tensors):
+                if isinstance(tensor, Exception):
+                    events[sample.id] = {"sample_id": sample.id, "status": "failed", "error": str(tensor)}
+                elif tensor is None and self.engine.model is not None:
+                    events[sample.id] = {"sample_id": sample.id, "status": "failed",
+                                         "error": "No image available for analysis"}
+                else:
+                    ready.append((sample, tensor))
+
+            ai_results = []
+            if ready:
+                try:
+                    predictions = self.engine.predict_batch([tensor for _, tensor in ready])
+                except Exception as exc:
+                    predictions = []
+                    for sample, _ in ready:
+                        events[sample.id] = {"sample_id": sample.id, "status": "failed", "error": str(exc)}
+                for (sample, _), result in zip(ready, predictions):
+                    ai_result = self._build_ai_result(sample, result)
+                    ai_results.append(ai_result)
+                    if update_status:
+                        sample.status = "analyzed"
+                    events[sample.id] = {"sample_id": sample.id, "status": "analyzed", "result": ai_result}
+
+            self.db.add_all(ai_results)
+            self.db.flush()
+            for ai_result in ai_results:
+                self._log_action("ai_result.create", ai_result.id, {
+                    "prediction": ai_result.primary_prediction,
+                    "confidence": ai_result.primary_confidence,
+                    "batch_id": ai_result.sample.batch_id
+                })
+            self.db.commit()
+
+            for sample in chunk:
+                event = events[sample.id]
+                processed += 1
+                ai_result = event.pop("result", None)
+                if ai_result is not None:
+                    event.update({
+                        "result_id": ai_result.id,
+                        "prediction": ai_result.primary_prediction,
+                        "confidence": ai_result.primary_confidence,
+                    })
+                event.update({"processed": processed, "total": total})
+                yield event
+
+    def _load_tensors(self, samples: List[Sample]) -> list:
+        """
+        Preprocessed tensors for samples, in order.
+
+        Served from the tensor store when enabled; the rest are decoded on
+        the inference pool and added to the store. Entries are None when a
+        sample has no image, or the exception raised while loading it.
+        """
+        store = get_tensor_store()
+        keys = [sample.id for sample in samples]
+        fingerprints = [source_fingerprint(sample.image_path) for sample in samples]
+        tensors = store.get_many(keys, fingerprints) if store is not None else [None] * len(samples)
+
+        pool = get_inference_pool()
+        futures = {
+            i: pool.submit(self.engine.load_tensor, samples[i].image_path)
+            for i, tensor in enumerate(tensors)
+            if tensor is None and fingerprints[i] is not None
+        }
+        fresh = {}
+        for i, future in futures.items():
+            try:
+                tensors[i] = future.result()
+            except Exception as exc:
+                tensors[i] = exc
+                continue
+            fresh[keys[i]] = (tensors[i], fingerprints[i])
+
+        if store is not None and fresh:
+            store.put_many(fresh)
+        return tensors
+
     def get_result_by_id(self, result_id: str) -> Optional[AIResult]:
         """Get AI result by ID."""
         return self.db.query(AIResult).filter(AIResult.id == result_id).first()
-    
+
     def get_results_by_sample(self, sample_id: str) -> List[AIResult]:
         """Get all AI results for a sample."""
         return self.db.query(AIResult).filter(AIResult.sample_id == sample_id).all()
-    
-    def _simulate_ai_inference(self) -> dict:
-        """Simulate AI inference for demo purposes."""
-        # Generate random confidence scores
-        scores = {}
-        remaining = 1.0
-        
-        for i, category in enumerate(DIAGNOSIS_CATEGORIES[:-1]):
-            if i == len(DIAGNOSIS_CATEGORIES) - 2:
-                scores[category] = remaining
-            else:
-                score = random.uniform(0, remaining * 0.8)
-                scores[category] = round(score, 4)
-                remaining -= score
-        
-        scores[DIAGNOSIS_CATEGORIES[-1]] = 0.0  # Unsatisfactory usually 0
-        
-        # Find primary prediction
-        primary = max(scores, key=scores.get)
-        primary_confidence = scores[primary]
-        
-        # Generate notes
-        notes = f"AI analysis complete. Primary finding: {primary.upper()} with {primary_confidence:.1%} confidence."
-        if primary_confidence < 0.7:
-            notes += " Low confidence - recommend manual review."
-        
-        return {
-            "diagnosis": {"primary": primary, "raw_predictions": scores},
-            "confidence_scores": scores,
-            "primary_prediction": primary,
-            "primary_confidence": primary_confidence,
-            "ai_notes": notes
-        }
-    
+
+    def _build_ai_result(self, sample: Sample, result: dict) -> AIResult:
+        """Create an AIResult row from an inference result."""
+        return AIResult(
+            sample=sample,
+            diagnosis=result["diagnosis"],
+            confidence_scores=result["confidence_scores"],
+            primary_prediction=result["primary_prediction"],
+            primary_confidence=result["primary_confidence"],
+            model_version=self.engine.model_version,
+            model_name=self.engine.model_name,
+            ai_notes=result["ai_notes"],
+            processed_at=datetime.utcnow()
+        )
+
     def _log_action(self, action: str, resource_id: str, details: dict = None):
-        """Log action to audit trail."""
+        """Stage an audit entry; it commits with the caller's transaction."""
         if self.user:
             AuditLog.log_action(
                 self.db,
@@ -156,4 +345,3 @@ class AIResultService:
                 resource_id=resource_id,
                 details=details
             )
-            self.db.commit()
@@ -11,7 +11,12 @@ from app.schemas.annotation import AnnotationCreate, AnnotationUpdate
 
 
 class AnnotationService:
-    """Service for clinician annotation and review operations."""
+    """
+    Service for clinician annotation and review operations.
+
+    Mutating methods stage their changes and audit entries on the session
+    without committing; the caller commits once (see ``UnitOfWork``).
+    """
     
     def __init__(self, db: Session, current_user=None):
         self.db = db
@@ -31,8 +36,7 @@ class AnnotationService:
             follow_up_date=annotation_data.follow_up_date,
         )
         self.db.add(annotation)
-        self.db.commit()
-        self.db.refresh(annotation)
+        self.db.flush()
         
         self._log_action("annotation.create", annotation.id, {
             "agrees_with_ai": annotation.agrees_with_ai,
@@ -69,9 +73,6 @@ class AnnotationService:
         if diagnosis.screening:
             diagnosis.screening.status = "completed"
         
-        self.db.commit()
-        self.db.refresh(diagnosis)
-        
         self._log_action("diagnosis.review", diagnosis.id, {
             "agrees_with_ai": agrees_with_ai,
             "clinician_diagnosis": clinician_diagnosis,
@@ -90,8 +91,6 @@ class AnnotationService:
             return annotation  # Already signed off
         
         annotation.sign_off()
-        self.db.commit()
-        self.db.refresh(annotation)
         
         self._log_action("annotation.sign_off", annotation.id, severity="critical")
         
@@ -113,7 +112,7 @@ class AnnotationService:
         return query.all()
     
     def _log_action(self, action: str, resource_id: str, details: dict = None, severity: str = "info"):
-        """Log action to audit trail."""
+        """Stage an audit entry; it commits with the caller's transaction."""
         if self.user:
             AuditLog.log_action(
                 self.db,
@@ -124,4 +123,3 @@ class AnnotationService:
                 details=details,
                 severity=severity
             )
-            self.db.commit()
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
+from app.core.config import settings
 from app.models import AuditLog
 
 
@@ -26,7 +27,7 @@ class AuditService:
         ip_address: str = None,
         severity: str = "info"
     ) -> AuditLog:
-        """Create an audit log entry."""
+        """Stage an audit log entry; it commits with the caller's transaction."""
         log = AuditLog(
             action=action,
             user_id=self.user.id if self.user else None,
@@ -38,8 +39,7 @@ class AuditService:
             severity=severity
         )
         self.db.add(log)
-        self.db.commit()
-        self.db.refresh(log)
+        self.db.flush()
         return log
     
     def get_logs(
@@ -67,13 +67,16 @@ class AuditService:
             query = query.filter(AuditLog.user_id == user_id)
         if severity:
             query = query.filter(AuditLog.severity == severity)
-        if start_date:
-            query = query.filter(AuditLog.timestamp >= start_date)
+        # Always bound the timestamp so PostgreSQL only scans the partitions
+        # in range; older rows are past retention anyway
+        if not start_date:
+            start_date = datetime.utcnow() - timedelta(days=settings.audit_log_retention_days)
+        query = query.filter(AuditLog.timestamp >= start_date)
         if end_date:
             query = query.filter(AuditLog.timestamp <= end_date)
         
         total = query.count()
-        logs = query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
+        logs = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).offset(skip).limit(limit).all()
         
         return logs, total
     
@@ -0,0 +1,245 @@
+"""
+CervixAI Backfill Service
+Business logic for re-analyzing historical samples when the model version changes.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, List, Callable
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import AIResult, Sample, AuditLog, BackfillCampaign
+from app.services.ai_result_service import AIResultService
+from app.services.inference import InferenceEngine, get_inference_engine
+
+# Campaign statuses a runner may pick up
+RESUMABLE_STATUSES = ("pending", "paused", "failed")
+
+# A running campaign with no checkpoint for this long is treated as abandoned
+STALE_RUN_AFTER = timedelta(minutes=10)
+
+
+class CampaignNotRunnableError(ValueError):
+    """Raised when a campaign is claimed by another runner or cannot be resumed."""
+
+
+class BackfillService:
+    """Service for model-version backfill campaigns."""
+
+    def __init__(self, db: Session, current_user=None, engine: Optional[InferenceEngine] = None):
+        self.db = db
+        self.user = current_user
+        self.engine = engine or get_inference_engine()
+
+    def create_campaign(
+        self,
+        target_model_version: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        rate_limit: Optional[float] = None
+    ) -> BackfillCampaign:
+        """Create a campaign for the loaded model version."""
+        target = target_model_version or self.engine.model_version
+        if target != self.engine.model_version:
+            raise ValueError(
+                f"Loaded model is version {self.engine.model_version}; "
+                f"cannot backfill results for {target}"
+            )
+
+        campaign = BackfillCampaign(
+            target_model_version=target,
+            created_by_id=self.user.id if self.user else None,
+            chunk_size=chunk_size or settings.backfill_chunk_size,
+            rate_limit=rate_limit if rate_limit is not None else settings.backfill_rate_limit,
+            total=self._remaining_query(target).count(),
+        )
+        self.db.add(campaign)
+        self.db.flush()
+
+        self._log_action("backfill.create", campaign.id, {
+            "target_model_version": target,
+            "total": campaign.total
+        })
+        self.db.commit()
+        return campaign
+
+    def get_campaign(self, campaign_id: str) -> Optional[BackfillCampaign]:
+        """Get campaign by ID."""
+        return self.db.query(BackfillCampaign).filter(BackfillCampaign.id == campaign_id).first()
+
+    def list_campaigns(self, limit: int = 20) -> List[BackfillCampaign]:
+        """Most recent campaigns first."""
+        return self.db.query(BackfillCampaign).order_by(BackfillCampaign.created_at.desc()).limit(limit).all()
+
+    def can_run(self, campaign: BackfillCampaign) -> bool:
+        """Whether a runner may (re)start the campaign."""
+        if campaign.status in RESUMABLE_STATUSES:
+            return True
+        # A crashed runner leaves the campaign "running" without checkpoints
+        return (
+            campaign.status == "running"
+            and campaign.updated_at is not None
+            and datetime.utcnow() - campaign.updated_at > STALE_RUN_AFTER
+        )
+
+    def claim_campaign(self, campaign: BackfillCampaign) -> bool:
+        """
+        Atomically mark the campaign running for this runner. A conditional
+        UPDATE, so of concurrent start/resume calls (in any process) exactly
+        one wins; the others get False.
+        """
+        now = datetime.utcnow()
+        claimable = or_(
+            BackfillCampaign.status.in_(RESUMABLE_STATUSES),
+            and_(
+                BackfillCampaign.status == "running",
+                BackfillCampaign.updated_at < now - STALE_RUN_AFTER
+            )
+        )
+        result = self.db.execute(
+            update(BackfillCampaign)
+            .where(BackfillCampaign.id == campaign.id, claimable)
+            .values(
+                status="running",
+                started_at=func.coalesce(BackfillCampaign.started_at, now),
+                resumed_at=now,
+                run_processed=0,
+                error=None,
+                updated_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        self.db.refresh(campaign)
+        return result.rowcount == 1
+
+    def cancel_campaign(self, campaign: BackfillCampaign) -> BackfillCampaign:
+        """Stop a campaign after its current chunk; it can be resumed later."""
+        if campaign.status in ("pending", "running"):
+            campaign.status = "paused"
+            self._log_action("backfill.pause", campaign.id)
+            self.db.commit()
+        return campaign
+
+    def run_campaign(
+        self,
+        campaign_id: str,
+        stop_event: Optional[threading.Event] = None,
+        on_progress: Optional[Callable[[BackfillCampaign], None]] = None,
+        claimed: bool = False
+    ) -> Optional[BackfillCampaign]:
+        """
+        Process a campaign chunk by chunk until done, paused or stopped.
+
+        The campaign is claimed first (see ``claim_campaign``) unless the
+        caller already did; ``CampaignNotRunnableError`` if another runner has it.
+
+        After each chunk the campaign's checkpoint and counters are
+        committed, so an interrupted run resumes where it left off. Samples
+        that gained a result for the target version in the meantime are
+        skipped. Throughput is capped at ``campaign.rate_limit`` images/s.
+        """
+        campaign = self.get_campaign(campaign_id)
+        if campaign is None:
+            return None
+        if campaign.target_model_version != self.engine.model_version:
+            raise ValueError(
+                f"Campaign targets {campaign.target_model_version} but the loaded "
+                f"model is {self.engine.model_version}"
+            )
+
+        if not claimed and not self.claim_campaign(campaign):
+            raise CampaignNotRunnableError(f"Campaign is {campaign.status} and cannot be resumed")
+
+        analyzer = AIResultService(self.db, self.user, self.engine)
+        try:
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    campaign.status = "paused"
+                    break
+
+                # Pick up pause requests made from other sessions/processes
+                self.db.refresh(campaign, ["status"])
+                if campaign.status != "running":
+                    break
+
+                chunk = self._next_chunk(campaign)
+                if not chunk:
+                    campaign.status = "completed"
+                    campaign.finished_at = datetime.utcnow()
+                    break
+
+                chunk_started = time.monotonic()
+                for event in analyzer.analyze_samples(chunk, chunk_size=len(chunk), update_status=False):
+                    if event["status"] == "analyzed":
+                        campaign.processed += 1
+                        campaign.run_processed += 1
+                    else:
+                        campaign.failed += 1
+                campaign.last_sample_id = chunk[-1].id
+                self.db.commit()
+
+                if on_progress:
+                    on_progress(campaign)
+                self._throttle(campaign, len(chunk), time.monotonic() - chunk_started, stop_event)
+        except Exception as exc:
+            self.db.rollback()
+            campaign.status = "failed"
+            campaign.error = str(exc)
+
+        self._log_action(f"backfill.{campaign.status}", campaign.id, {
+            "processed": campaign.processed,
+            "failed": campaign.failed
+        })
+        self.db.commit()
+        return campaign
+
+    def _remaining_query(self, target_model_version: str):
+        """Samples with an image and no result for the target model version."""
+        has_result = (
+            self.db.query(AIResult.id)
+            .filter(
+                AIResult.sample_id == Sample.id,
+                AIResult.model_version == target_model_version
+            )
+            .exists()
+        )
+        return self.db.query(Sample).filter(Sample.image_path.isnot(None), ~has_result)
+
+    def _next_chunk(self, campaign: BackfillCampaign) -> List[Sample]:
+        query = self._remaining_query(campaign.target_model_version)
+        if campaign.last_sample_id:
+            query = query.filter(Sample.id > campaign.last_sample_id)
+        return query.order_by(Sample.id).limit(campaign.chunk_size).all()
+
+    @staticmethod
+    def _throttle(
+        campaign: BackfillCampaign,
+        images: int,
+        elapsed: float,
+        stop_event: Optional[threading.Event]
+    ):
+        """Sleep long enough to keep the chunk at or below the rate limit."""
+        if not campaign.rate_limit:
+            return
+        delay = images / campaign.rate_limit - elapsed
+        if delay <= 0:
+            return
+        if stop_event is not None:
+            stop_event.wait(delay)
+        else:
+            time.sleep(delay)
+
+    def _log_action(self, action: str, resource_id: str, details: dict = None):
+        """Stage an audit entry; it commits with the campaign update."""
+        if self.user:
+            AuditLog.log_action(
+                self.db,
+                action=action,
+                user=self.user,
+                resource_type="backfill_campaign",
+                resource_id=resource_id,
+                details=details
+            )
+
@@ -0,0 +1,180 @@
+"""
+CervixAI Inference Engine
+Image decoding, preprocessing and model execution for AI analysis.
+"""
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, List, Sequence
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import settings
+from app.services.model_loader import OnnxClassifier, load_model
+
+
+# Diagnosis categories for cervical screening
+DIAGNOSIS_CATEGORIES = [
+    "nilm",        # Negative for intraepithelial lesion or malignancy
+    "asc_us",      # Atypical squamous cells of undetermined significance
+    "asc_h",       # Atypical squamous cells, cannot exclude HSIL
+    "lsil",        # Low-grade squamous intraepithelial lesion
+    "hsil",        # High-grade squamous intraepithelial lesion
+    "scc",         # Squamous cell carcinoma
+    "agc",         # Atypical glandular cells
+    "adenocarcinoma",
+    "unsatisfactory"
+]
+
+MODEL_NAME = "CervixAI-ResNet50"
+MODEL_VERSION = "1.0.0"
+
+# Model input configuration (ImageNet normalization)
+INPUT_SIZE = (224, 224)
+CHANNEL_MEAN = (0.485, 0.456, 0.406)
+CHANNEL_STD = (0.229, 0.224, 0.225)
+
+
+class InferenceEngine:
+    """
+    Runs the cervical cytology classifier on images or preprocessed tensors.
+
+    Without a loaded model the engine simulates predictions (demo mode).
+    """
+
+    def __init__(
+        self,
+        model: Optional[OnnxClassifier] = None,
+        model_name: str = MODEL_NAME,
+        model_version: str = MODEL_VERSION
+    ):
+        self.model = model
+        self.model_name = model_name
+        self.model_version = model_version
+        if model is not None:
+            self.model_version = model.version or model_version
+            if model.precision != "fp32":
+                # Quantized variants are recorded distinctly for the audit trail
+                self.model_version = f"{self.model_version}+{model.precision}"
+        self.input_size = INPUT_SIZE
+        self._mean = np.array(CHANNEL_MEAN, dtype=np.float32)
+        self._std = np.array(CHANNEL_STD, dtype=np.float32)
+
+    @classmethod
+    def from_settings(cls, precision: Optional[str] = None) -> "InferenceEngine":
+        """Create an engine for the model configured in settings."""
+        return cls(model=load_model(settings.ai_model_path, precision or settings.ai_model_precision))
+
+    @property
+    def precision(self) -> str:
+        """Numeric precision of the loaded model."""
+        return self.model.precision if self.model is not None else "fp32"
+
+    def preprocessing_config(self) -> dict:
+        """Parameters that determine the preprocessed tensor for an image."""
+        return {
+            "input_size": list(self.input_size),
+            "mean": [float(v) for v in self._mean],
+            "std": [float(v) for v in self._std],
+            "resample": "bilinear",
+            "layout": "chw",
+            "dtype": "float32",
+        }
+
+    def decode(self, image_path: str) -> np.ndarray:
+        """Decode an image file to an RGB uint8 array."""
+        with Image.open(image_path) as img:
+            return np.asarray(img.convert("RGB"))
+
+    def preprocess(self, pixels: np.ndarray) -> np.ndarray:
+        """Resize and normalize to a CHW float32 tensor at the model input size."""
+        resized = Image.fromarray(pixels).resize(self.input_size, Image.BILINEAR)
+        tensor = np.asarray(resized, dtype=np.float32) / 255.0
+        tensor = (tensor - self._mean) / self._std
+        return np.ascontiguousarray(tensor.transpose(2, 0, 1))
+
+    def load_tensor(self, image_path: Optional[str]) -> Optional[np.ndarray]:
+        """Decode and preprocess an image, or None if there is no readable file."""
+        if not image_path or not os.path.exists(image_path):
+            return None
+        return self.preprocess(self.decode(image_path))
+
+    def predict(self, tensor: Optional[np.ndarray]) -> dict:
+        """Run the classifier on a single preprocessed tensor."""
+        return self.predict_batch([tensor])[0]
+
+    def predict_batch(self, tensors: Sequence[Optional[np.ndarray]]) -> List[dict]:
+        """Run the classifier on a batch of preprocessed tensors."""
+        if self.model is None:
+            return [self._build_result(self._simulate_scores()) for _ in tensors]
+
+        if any(tensor is None for tensor in tensors):
+            raise ValueError("No image available for analysis")
+
+        probabilities = self.model.run(np.stack(tensors))
+        return [
+            self._build_result({
+                category: round(float(p), 4)
+                for category, p in zip(DIAGNOSIS_CATEGORIES, row)
+            })
+            for row in probabilities
+        ]
+
+    def analyze(self, image_path: Optional[str]) -> dict:
+        """Full path for one image: decode, preprocess and predict."""
+        return self.predict(self.load_tensor(image_path))
+
+    def analyze_many(self, image_paths: Sequence[Optional[str]]) -> List[dict]:
+        """Decode and preprocess each image, then predict them as one batch."""
+        return self.predict_batch([self.load_tensor(path) for path in image_paths])
+
+    def _simulate_scores(self) -> dict:
+        """Simulate classifier output for demo purposes."""
+        # Generate random confidence scores
+        scores = {}
+        remaining = 1.0
+
+        for i, category in enumerate(DIAGNOSIS_CATEGORIES[:-1]):
+            if i == len(DIAGNOSIS_CATEGORIES) - 2:
+                scores[category] = remaining
+            else:
+                score = random.uniform(0, remaining * 0.8)
+                scores[category] = round(score, 4)
+                remaining -= score
+
+        scores[DIAGNOSIS_CATEGORIES[-1]] = 0.0  # Unsatisfactory usually 0
+        return scores
+
+    def _build_result(self, scores: dict) -> dict:
+        """Shape per-class scores into the result structure stored on AIResult."""
+        primary = max(scores, key=scores.get)
+        primary_confidence = scores[primary]
+
+        notes = f"AI analysis complete. Primary finding: {primary.upper()} with {primary_confidence:.1%} confidence."
+        if primary_confidence < 0.7:
+            notes += " Low confidence - recommend manual review."
+
+        return {
+            "diagnosis": {"primary": primary, "raw_predictions": scores},
+            "confidence_scores": scores,
+            "primary_prediction": primary,
+            "primary_confidence": primary_confidence,
+            "ai_notes": notes
+        }
+
+
+@lru_cache()
+def get_inference_engine() -> InferenceEngine:
+    """Get the process-wide inference engine."""
+    return InferenceEngine.from_settings()
+
+
+@lru_cache()
+def get_inference_pool() -> ThreadPoolExecutor:
+    """Get the worker pool used to fan out image analysis."""
+    return ThreadPoolExecutor(
+        max_workers=settings.ai_inference_workers,
+        thread_name_prefix="cervixai-inference"
+    )
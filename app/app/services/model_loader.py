@@ -0,0 +1,196 @@
+"""
+CervixAI Model Loader
+Loads the ONNX classifier behind ``settings.ai_model_path`` in FP32 or int8
+precision, builds quantized variants and measures their accuracy drift.
+
+Model directory layout::
+
+    <ai_model_path>/cervixai.onnx               FP32 reference model
+    <ai_model_path>/cervixai.int8_dynamic.onnx  dynamic-range int8 weights
+    <ai_model_path>/cervixai.int8_static.onnx   int8 weights and activations
+
+The model takes a float32 NCHW batch and returns one logit per entry of
+``DIAGNOSIS_CATEGORIES``.
+"""
+import logging
+import os
+from typing import Optional, List, Iterable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ("fp32", "int8_dynamic", "int8_static")
+MODEL_BASENAME = "cervixai"
+
+
+def model_file(model_dir: str, precision: str = "fp32") -> str:
+    """Path of the model file for a precision."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown model precision '{precision}'. Expected one of: {', '.join(PRECISIONS)}")
+    suffix = "" if precision == "fp32" else f".{precision}"
+    return os.path.join(model_dir, f"{MODEL_BASENAME}{suffix}.onnx")
+
+
+class OnnxClassifier:
+    """Thin wrapper around an ONNX Runtime session for the cytology classifier."""
+
+    def __init__(self, path: str, precision: str = "fp32", intra_op_threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.path = path
+        self.precision = precision
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.metadata = dict(self.session.get_modelmeta().custom_metadata_map)
+
+    @property
+    def version(self) -> Optional[str]:
+        """Model version recorded in the ONNX metadata, if any."""
+        return self.metadata.get("model_version")
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        """Return class probabilities for an NCHW float32 batch."""
+        logits = self.session.run(None, {self.input_name: batch.astype(np.float32, copy=False)})[0]
+        return softmax(logits)
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax."""
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def load_model(model_dir: str, precision: str = "fp32", intra_op_threads: int = 0) -> Optional[OnnxClassifier]:
+    """
+    Load the classifier for a precision.
+
+    Returns None when ONNX Runtime is not installed or no FP32 model exists,
+    in which case the engine falls back to simulated predictions. Asking for
+    a quantized precision whose file is missing is a configuration error.
+    """
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        logger.warning("onnxruntime not installed; using simulated AI predictions")
+        return None
+
+    path = model_file(model_dir, precision)
+    if not os.path.exists(path):
+        if precision == "fp32":
+            logger.warning("No model at %s; using simulated AI predictions", path)
+            return None
+        raise FileNotFoundError(
+            f"{precision} model not found at {path}. Build it with "
+            f"`python -m app.cli quantize --mode {precision.split('_', 1)[1]}`."
+        )
+    return OnnxClassifier(path, precision, intra_op_threads)
+
+
+class _TensorCalibrationReader:
+    """Feeds preprocessed tensors to the static quantization calibrator."""
+
+    def __init__(self, input_name: str, tensors: Iterable[np.ndarray]):
+        self.input_name = input_name
+        self._tensors = iter(tensors)
+
+    def get_next(self) -> Optional[dict]:
+        tensor = next(self._tensors, None)
+        if tensor is None:
+            return None
+        return {self.input_name: tensor[np.newaxis].astype(np.float32)}
+
+
+def quantize_dynamic_model(model_dir: str) -> str:
+    """Build the dynamic-range int8 variant (int8 weights, runtime activation scales)."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    source, target = model_file(model_dir, "fp32"), model_file(model_dir, "int8_dynamic")
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+    return target
+
+
+def quantize_static_model(model_dir: str, calibration_tensors: Iterable[np.ndarray]) -> str:
+    """Build the static int8 variant, calibrating activation ranges on the given tensors."""
+    from onnxruntime.quantization import quantize_static, QuantFormat, QuantType, CalibrationMethod
+
+    source, target = model_file(model_dir, "fp32"), model_file(model_dir, "int8_static")
+    reader = _TensorCalibrationReader(OnnxClassifier(source).input_name, calibration_tensors)
+    quantize_static(
+        source,
+        target,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=CalibrationMethod.MinMax,
+    )
+    return target
+
+
+def drift_report(
+    reference: OnnxClassifier,
+    candidate: OnnxClassifier,
+    tensors: Sequence[np.ndarray],
+    categories: Sequence[str],
+    image_ids: Optional[Sequence[str]] = None,
+    batch_size: int = 16,
+) -> dict:
+    """
+    Compare ``confidence_scores`` of two model variants on the same images.
+
+    Reports top-1 agreement, per-class absolute score differences and the
+    images whose primary prediction changed.
+    """
+    ref_scores: List[np.ndarray] = []
+    cand_scores: List[np.ndarray] = []
+    for start in range(0, len(tensors), batch_size):
+        batch = np.stack(tensors[start:start + batch_size])
+        ref_scores.append(reference.run(batch))
+        cand_scores.append(candidate.run(batch))
+
+    if not ref_scores:
+        return {"images": 0}
+
+    ref = np.concatenate(ref_scores)
+    cand = np.concatenate(cand_scores)
+    diff = np.abs(ref - cand)
+    ref_top, cand_top = ref.argmax(axis=1), cand.argmax(axis=1)
+    eps = 1e-12
+    kl = np.sum(ref * (np.log(ref + eps) - np.log(cand + eps)), axis=1)
+
+    flips = [
+        {
+            "image": image_ids[i] if image_ids else i,
+            "reference": categories[ref_top[i]],
+            "candidate": categories[cand_top[i]],
+            "reference_confidence": round(float(ref[i, ref_top[i]]), 4),
+            "candidate_confidence": round(float(cand[i, cand_top[i]]), 4),
+        }
+        for i in np.flatnonzero(ref_top != cand_top)
+    ]
+
+    return {
+        "images": int(len(ref)),
+        "reference": {"path": reference.path, "precision": reference.precision},
+        "candidate": {"path": candidate.path, "precision": candidate.precision},
+        "top1_agreement": round(float((ref_top == cand_top).mean()), 4),
+        "max_abs_diff": round(float(diff.max()), 6),
+        "mean_abs_diff": round(float(diff.mean()), 6),
+        "mean_kl_divergence": round(float(kl.mean()), 6),
+        "per_class": {
+            category: {
+                "mean_abs_diff": round(float(diff[:, i].mean()), 6),
+                "max_abs_diff": round(float(diff[:, i].max()), 6),
+            }
+            for i, category in enumerate(categories)
+        },
+        "prediction_changes": flips,
+    }
@@ -0,0 +1,237 @@
+"""
+CervixAI Patient Import
+Bulk patient onboarding from CSV or NDJSON.
+
+Rows are validated with ``PatientCreate`` and written in chunks: one
+set-based lookup of the chunk's medical record numbers, one multi-row
+insert of the new patients and one of their audit entries, then a commit.
+A row that fails validation or repeats an MRN is reported and skipped; the
+rest of the file is still imported. If the database rejects a chunk, its
+rows are retried one at a time, so only the offending rows are reported.
+"""
+import csv
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.identifiers import new_id
+from app.models import AuditLog, Patient
+from app.models.status_counter import TOTAL, StatusCounter, upsert_count
+from app.schemas.patient import PatientCreate
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+DEFAULT_CHUNK_SIZE = 1000
+
+MAX_REPORTED_ERRORS = 1000
+
+# A parsed row (field -> value) or the reason it could not be parsed
+ParsedRow = Tuple[int, Union[dict, str]]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    """``csv`` or ``ndjson`` from a file name or content type, if recognizable."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def parse_rows(lines: Iterable[str], fmt: str) -> Iterator[ParsedRow]:
+    """Yield ``(row number, fields or error)``; row numbers start at 1 after any header."""
+    if fmt == "csv":
+        for number, record in enumerate(csv.DictReader(lines), start=1):
+            # Empty cells are missing values (schema defaults apply), not empty strings
+            yield number, {
+                key.strip(): value.strip() for key, value in record.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+    elif fmt == "ndjson":
+        number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield number, f"Invalid JSON: {exc.msg}"
+                continue
+            yield number, record if isinstance(record, dict) else "Expected a JSON object"
+    else:
+        raise ValueError(f"Unknown import format {fmt!r}; expected one of {', '.join(IMPORT_FORMATS)}")
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class PatientImportService:
+    """
+    Imports patients in chunks of ``chunk_size`` rows, committing each chunk.
+
+    Existing MRNs (and repeats within the file) are skipped, not updated.
+    Inserts use ``ON CONFLICT DO NOTHING`` on PostgreSQL and SQLite, so a
+    patient created concurrently with the same MRN is skipped too instead of
+    failing the chunk.
+    """
+
+    def __init__(self, db: Session, current_user=None, ip_address: Optional[str] = None):
+        self.db = db
+        self.user = current_user
+        self.ip_address = ip_address
+
+    def import_rows(self, rows: Iterable[ParsedRow], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    dry_run: bool = False) -> dict:
+        """Validate, deduplicate and insert parsed rows; returns a ``PatientImportReport`` dict."""
+        report = {
+            "import_id": new_id(), "rows": 0, "created": 0, "skipped_existing": 0, "failed": 0,
+            "dry_run": dry_run, "errors": [], "errors_truncated": False,
+        }
+        seen_mrns = set()
+        chunk: List[Tuple[int, PatientCreate]] = []
+
+        for number, record in rows:
+            report["rows"] += 1
+            if isinstance(record, str):
+                self._reject(report, number, None, record)
+                continue
+            try:
+                patient = PatientCreate.model_validate(record)
+            except ValidationError as exc:
+                self._reject(report, number, record.get("medical_record_number"), _validation_message(exc))
+                continue
+            mrn = (patient.medical_record_number or "").strip() or None
+            patient.medical_record_number = mrn
+            if mrn is not None:
+                if mrn in seen_mrns:
+                    self._reject(report, number, mrn, "Medical record number repeated in this import")
+                    continue
+                seen_mrns.add(mrn)
+            chunk.append((number, patient))
+            if len(chunk) >= chunk_size:
+                self._write_chunk(chunk, report, dry_run)
+                chunk = []
+        if chunk:
+            self._write_chunk(chunk, report, dry_run)
+
+        if not dry_run and report["created"]:
+            AuditLog.log_action(
+                self.db, action="patient.bulk_import", user=self.user, resource_type="patient",
+                details={key: report[key] for key in ("import_id", "rows", "created", "skipped_existing", "failed")},
+                ip_address=self.ip_address,
+            )
+            self.db.commit()
+        return report
+
+    def _reject(self, report: dict, number: int, mrn: Optional[str], error: str):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({
+                "row": number, "medical_record_number": None if mrn is None else str(mrn), "error": error
+            })
+        else:
+            report["errors_truncated"] = True
+
+    def _existing_mrns(self, mrns: List[str]) -> set:
+        if not mrns:
+            return set()
+        return set(self.db.execute(
+            select(Patient.medical_record_number).where(Patient.medical_record_number.in_(mrns))
+        ).scalars())
+
+    def _insert_statement(self):
+        table = Patient.__table__
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return insert(table).returning(table.c.id)
+        return (
+            dialect_insert(table)
+            .on_conflict_do_nothing(index_elements=[table.c.medical_record_number])
+            .returning(table.c.id)
+        )
+
+    def _write_chunk(self, chunk: List[Tuple[int, PatientCreate]], report: dict, dry_run: bool):
+        existing = self._existing_mrns([p.medical_record_number for _, p in chunk if p.medical_record_number])
+        now = datetime.utcnow()
+        rows: Dict[str, dict] = {}
+        numbers: Dict[str, int] = {}
+        for number, patient in chunk:
+            if patient.medical_record_number in existing:
+                report["skipped_existing"] += 1
+                continue
+            patient_id = new_id()
+            rows[patient_id] = {
+                "id": patient_id,
+                **patient.model_dump(),
+                "risk_factors": patient.risk_factors or {},
+                "consent_date": now if patient.consent_given else None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            numbers[patient_id] = number
+        if not rows:
+            return
+        if dry_run:
+            report["created"] += len(rows)
+            return
+
+        try:
+            self._insert_rows(rows, numbers, report, now)
+        except DBAPIError:
+            self.db.rollback()
+            # One bad row fails the whole statement; retry alone to find it
+            for patient_id, row in rows.items():
+                try:
+                    self._insert_rows({patient_id: row}, numbers, report, now)
+                except DBAPIError as exc:
+                    self.db.rollback()
+                    self._reject(report, numbers[patient_id], row["medical_record_number"],
+                                 f"Rejected by the database: {exc.orig}")
+
+    def _insert_rows(self, rows: Dict[str, dict], numbers: Dict[str, int], report: dict, now: datetime):
+        """Insert patients with their audit entries and commit."""
+        # executemany; batched into multi-row INSERT ... RETURNING by the driver dialect
+        created = set(self.db.execute(self._insert_statement(), list(rows.values())).scalars())
+        if created:
+            self.db.execute(insert(AuditLog.__table__), [
+                {
+                    "id": new_id(),
+                    "user_id": self.user.id if self.user else None,
+                    "user_email": self.user.email if self.user else None,
+                    "action": "patient.create",
+                    "resource_type": "patient",
+                    "resource_id": patient_id,
+                    "details": {"source": "bulk_import", "import_id": report["import_id"],
+                                "row": numbers[patient_id]},
+                    "ip_address": self.ip_address,
+                    "severity": "info",
+                    "timestamp": now,
+                }
+                for patient_id in rows if patient_id in created
+            ])
+            # Bulk inserts bypass the ORM flush hooks that maintain the counters
+            upsert_count(self.db.connection(), StatusCounter.__table__,
+                         {"entity": "patients", "status": TOTAL}, len(created))
+        self.db.commit()
+        report["created"] += len(created)
+        # Rows missing from RETURNING lost an MRN race with a concurrent insert
+        report["skipped_existing"] += len(rows) - len(created)
@@ -0,0 +1,173 @@
+"""
+CervixAI Patient Search
+Indexed, ranked patient lookup by name, MRN and date of birth.
+
+PostgreSQL uses ``pg_trgm`` GIN indexes on the full name and MRN, so
+substring, typo-tolerant and prefix matches are index scans ranked by
+trigram similarity. SQLite uses an FTS5 table kept in sync by triggers,
+queried with prefix terms and ranked by BM25. Other databases, or
+PostgreSQL without ``pg_trgm``, fall back to prefix ``ILIKE`` matching.
+The indexes and FTS table are created by migration ``0003_patient_search``.
+
+An exact MRN match short-circuits the search and returns that patient only.
+"""
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import (
+    String, case, column, false, func, literal, literal_column, or_, select, table, text
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models import Patient
+
+FTS_TABLE = "patients_fts"
+
+
+def _has_trigram(connection: Connection) -> bool:
+    cached = connection.info.get("pg_trgm")
+    if cached is None:
+        cached = connection.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first() is not None
+        connection.info["pg_trgm"] = cached
+    return cached
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_query(term: str) -> Optional[str]:
+    # Every word must match, each as a prefix (typeahead)
+    words = re.findall(r"\w+", term.lower())
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+class PatientSearchService:
+    """Ranked patient search using the database's native text index."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        connection = db.connection()
+        self.dialect = connection.dialect.name
+        self.trigram = self.dialect == "postgresql" and _has_trigram(connection)
+
+    @property
+    def _full_name(self):
+        # Same expression as idx_patients_full_name_trgm
+        return Patient.first_name.op("||")(literal_column("' '", String)).op("||")(Patient.last_name)
+
+    def match_clause(self, term: str):
+        """Index-backed filter for patients matching ``term`` (unranked)."""
+        pattern = _escape_like(term.strip())
+        if self.dialect == "sqlite":
+            query = _fts_query(term)
+            if query is None:
+                return false()
+            matches = (
+                select(literal_column("rowid"))
+                .select_from(table(FTS_TABLE))
+                .where(text(f"{FTS_TABLE} MATCH :patient_fts_query").bindparams(patient_fts_query=query))
+            )
+            return literal_column("patients.rowid").in_(matches)
+        if self.trigram:
+            return or_(
+                self._full_name.ilike(f"%{pattern}%", escape="\\"),
+                literal(term.strip()).op("<%")(self._full_name),
+                Patient.medical_record_number.ilike(f"%{pattern}%", escape="\\"),
+            )
+        return or_(
+            Patient.first_name.ilike(f"{pattern}%", escape="\\"),
+            Patient.last_name.ilike(f"{pattern}%", escape="\\"),
+            Patient.medical_record_number.ilike(f"{pattern}%", escape="\\"),
+        )
+
+    def search(
+        self,
+        term: Optional[str] = None,
+        dob: Optional[date] = None,
+        dob_from: Optional[date] = None,
+        dob_to: Optional[date] = None,
+        limit: int = 20
+    ) -> Tuple[List[Tuple[Patient, Optional[float]]], bool]:
+        """
+        Best matches first, as ``([(patient, score), ...], exact_mrn)``.
+
+        Scores are comparable within one result set only; ``None`` when the
+        database offers no ranking or no term was given.
+        """
+        dob_filters = []
+        if dob:
+            dob_filters.append(Patient.date_of_birth == dob)
+        if dob_from:
+            dob_filters.append(Patient.date_of_birth >= dob_from)
+        if dob_to:
+            dob_filters.append(Patient.date_of_birth <= dob_to)
+
+        term = (term or "").strip()
+        if term:
+            exact = self.db.scalars(
+                select(Patient).where(Patient.medical_record_number == term, *dob_filters)
+            ).first()
+            if exact is not None:
+                return [(exact, 1.0)], True
+
+        if not term:
+            stmt = (
+                select(Patient, literal(None).label("score"))
+                .where(*dob_filters)
+                .order_by(Patient.last_name, Patient.first_name)
+            )
+        elif self.dialect == "sqlite":
+            stmt = self._sqlite_ranked(term)
+            if stmt is None:
+                return [], False
+            stmt = stmt.where(*dob_filters)
+        elif self.trigram:
+            stmt = self._trigram_ranked(term).where(*dob_filters)
+        else:
+            stmt = (
+                select(Patient, literal(None).label("score"))
+                .where(self.match_clause(term), *dob_filters)
+                .order_by(Patient.last_name, Patient.first_name)
+            )
+
+        rows = self.db.execute(stmt.limit(limit)).all()
+        return [(patient, float(score) if score is not None else None) for patient, score in rows], False
+
+    def _sqlite_ranked(self, term: str):
+        query = _fts_query(term)
+        if query is None:
+            return None
+        fts = table(FTS_TABLE, column("rowid"), column("rank"))
+        # FTS5 rank is BM25, lower is better
+        return (
+            select(Patient, (-fts.c.rank).label("score"))
+            .join(fts, literal_column("patients.rowid") == fts.c.rowid)
+            .where(text(f"{FTS_TABLE} MATCH :patient_fts_query").bindparams(patient_fts_query=query))
+            .order_by(fts.c.rank, Patient.last_name, Patient.first_name)
+        )
+
+    def _trigram_ranked(self, term: str):
+        prefix = f"{_escape_like(term)}%"
+        starts = case(
+            (or_(
+                Patient.last_name.ilike(prefix, escape="\\"),
+                Patient.first_name.ilike(prefix, escape="\\"),
+                Patient.medical_record_number.ilike(prefix, escape="\\"),
+            ), 1),
+            else_=0
+        )
+        score = func.greatest(
+            func.similarity(self._full_name, term),
+            func.word_similarity(term, self._full_name),
+            func.similarity(func.coalesce(Patient.medical_record_number, ""), term),
+        )
+        return (
+            select(Patient, (starts + score).label("score"))
+            .where(self.match_clause(term))
+            .order_by(starts.desc(), score.desc(), Patient.last_name, Patient.first_name)
+        )
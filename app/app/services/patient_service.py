@@ -3,15 +3,20 @@ CervixAI Patient Service
 Business logic for patient management.
 """
 from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.models import Patient, AuditLog
+from app.models import Patient, AuditLog, Sample, Screening
 from app.schemas.patient import PatientCreate, PatientUpdate
+from app.services.patient_search import PatientSearchService
 
 
 class PatientService:
-    """Service for patient-related operations."""
+    """
+    Service for patient-related operations.
+
+    Mutating methods stage their changes and audit entries on the session
+    without committing; the caller commits once (see ``UnitOfWork``).
+    """
     
     def __init__(self, db: Session, current_user=None):
         self.db = db
@@ -27,10 +32,10 @@ class PatientService:
             phone=patient_data.phone,
             medical_record_number=patient_data.medical_record_number,
             consent_given=patient_data.consent_given,
+            risk_factors=patient_data.risk_factors or {},
         )
         self.db.add(patient)
-        self.db.commit()
-        self.db.refresh(patient)
+        self.db.flush()
         
         # Audit log
         self._log_action("patient.create", patient.id)
@@ -54,14 +59,7 @@ class PatientService:
         query = self.db.query(Patient).filter(Patient.is_active == True)
         
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Patient.first_name.ilike(search_term),
-                    Patient.last_name.ilike(search_term),
-                    Patient.medical_record_number.ilike(search_term)
-                )
-            )
+            query = query.filter(PatientSearchService(self.db).match_clause(search))
         
         total = query.count()
         patients = query.offset(skip).limit(limit).all()
@@ -78,9 +76,6 @@ class PatientService:
         for field, value in update_data.items():
             setattr(patient, field, value)
         
-        self.db.commit()
-        self.db.refresh(patient)
-        
         self._log_action("patient.update", patient.id, {"updated_fields": list(update_data.keys())})
         
         return patient
@@ -92,7 +87,6 @@ class PatientService:
             return False
         
         patient.is_active = False
-        self.db.commit()
         
         self._log_action("patient.delete", patient.id)
         
@@ -100,19 +94,31 @@ class PatientService:
     
     def get_patient_history(self, patient_id: str) -> dict:
         """Get patient's longitudinal history."""
-        patient = self.get_patient_by_id(patient_id)
+        # Eager-load the episode tree: a fixed number of queries per patient
+        # instead of one per screening and sample
+        patient = (
+            self.db.query(Patient)
+            .options(
+                selectinload(Patient.screenings).joinedload(Screening.diagnosis),
+                selectinload(Patient.screenings).selectinload(Screening.images),
+                selectinload(Patient.samples).selectinload(Sample.ai_results),
+            )
+            .filter(Patient.id == patient_id)
+            .first()
+        )
         if not patient:
             return {}
-        
+        self._log_action("patient.view", patient.id)
+
         return {
             "patient": patient,
             "screenings": patient.screenings,
-            "samples": patient.samples if hasattr(patient, 'samples') else [],
+            "samples": patient.samples,
             "age": patient.get_age(),
         }
     
     def _log_action(self, action: str, resource_id: str, details: dict = None):
-        """Log action to audit trail."""
+        """Stage an audit entry; it commits with the caller's transaction."""
         if self.user:
             AuditLog.log_action(
                 self.db,
@@ -122,4 +128,3 @@ class PatientService:
                 resource_id=resource_id,
                 details=details
             )
-            self.db.commit()
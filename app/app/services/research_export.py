@@ -0,0 +1,308 @@
+"""
+CervixAI Research Export
+Streaming exports of screening outcomes for cancer registries and research
+partners.
+
+Each export is one entity (``patients``, ``screenings``, ``diagnoses``,
+``samples``, ``ai_results``, ``annotations``) as NDJSON, CSV or Parquet.
+Rows are read with ``yield_per`` (a server-side cursor on PostgreSQL) and
+written batch by batch, so memory stays flat whatever the table size.
+Parquet needs ``pyarrow``. It is written to a temporary file first, because
+its footer is only known at the end.
+
+Incremental exports: every export covers rows whose watermark column
+(``updated_at``, or ``processed_at`` for AI results) is at most ``until``. Pass
+the previous export's ``until`` as ``since`` to get only rows created or
+changed after it. A changed row is exported again under the same ID. Deletes
+are not exported. ``until`` defaults to
+now minus ``EXPORT_WATERMARK_LAG_SECONDS``, so rows of transactions still in
+flight (or not yet on a replica) fall into the next export, not between two.
+
+De-identification (the default) drops names, contact details, MRNs, file
+paths and free-text notes, and keeps only allow-listed keys of free-form JSON
+(coded risk factors, not whatever else was recorded there). It reduces the date of birth to ``birth_year`` and
+replaces patient IDs with keyed pseudonyms (HMAC-SHA256 with
+``EXPORT_PSEUDONYM_KEY``). Pseudonyms are stable, so exports still join on
+patient across entities and runs. Clinical dates are kept, as registries need
+them.
+"""
+import csv
+import hashlib
+import hmac
+import io
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Table, or_, select
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registers the exported tables on Base.metadata)
+from app.core.config import settings
+from app.db.database import Base
+from app.db.identifiers import GUID
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Bytes per chunk when streaming a finished Parquet file
+FILE_CHUNK_SIZE = 1024 * 1024
+
+# Coded patient risk factors safe to export; other risk_factors keys are dropped
+EXPORTED_RISK_FACTORS = ("hpv_positive", "previous_abnormal", "smoking")
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """How one table is exported and de-identified."""
+    table: str
+    watermark: str
+    pseudonymize: Tuple[str, ...] = ()  # Patient keys replaced by pseudonyms
+    drop: Tuple[str, ...] = ()  # Identifying or free-text columns
+    year_only: Tuple[str, ...] = ()  # Dates reduced to their year (date_of_birth -> birth_year)
+    allow_keys: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()  # JSON columns reduced to these keys
+
+
+EXPORTS: Dict[str, ExportSpec] = {
+    "patients": ExportSpec(
+        "patients", "updated_at", pseudonymize=("id",),
+        drop=("first_name", "last_name", "email", "phone", "medical_record_number", "contact_info",
+              "consent_document_path", "notes"),
+        year_only=("date_of_birth",),
+        allow_keys=(("risk_factors", EXPORTED_RISK_FACTORS),),
+    ),
+    "screenings": ExportSpec(
+        "screenings", "updated_at", pseudonymize=("patient_id",), drop=("clinical_notes", "reason_for_screening")
+    ),
+    "diagnoses": ExportSpec(
+        "diagnoses", "updated_at", drop=("ai_notes", "clinician_notes", "final_notes", "follow_up_notes")
+    ),
+    "samples": ExportSpec("samples", "updated_at", pseudonymize=("patient_id",), drop=("metadata", "image_path")),
+    "ai_results": ExportSpec("ai_results", "processed_at", drop=("heatmap_path", "ai_notes")),
+    "annotations": ExportSpec("annotations", "updated_at", drop=("notes", "follow_up_notes")),
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_until() -> datetime:
+    """Upper watermark for an export starting now (naive UTC, like stored timestamps)."""
+    return datetime.utcnow() - timedelta(seconds=settings.export_watermark_lag_seconds)
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC for comparison with stored timestamps; naive input is taken as UTC."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _year_column(name: str) -> str:
+    return name.replace("date_of_", "").replace("_date", "") + "_year"
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def export_statement(entity: str, since: Optional[datetime], until: datetime):
+    """Rows of ``entity`` with ``since < watermark <= until``, in watermark order."""
+    spec = EXPORTS[entity]
+    table: Table = Base.metadata.tables[spec.table]
+    watermark = table.c[spec.watermark]
+    if since is None:
+        # A full export also covers rows that never had a watermark set
+        window = or_(watermark <= until, watermark.is_(None))
+    else:
+        window = (watermark > since) & (watermark <= until)
+    return select(*table.c).where(window).order_by(watermark, table.c.id)
+
+
+class ResearchExport:
+    """
+    One export run. ``columns`` and ``until`` are fixed at construction;
+    ``chunks(db)`` streams the encoded file and counts ``rows_written``.
+    """
+
+    def __init__(self, entity: str, fmt: str = "ndjson", since: Optional[datetime] = None,
+                 until: Optional[datetime] = None, deidentify: bool = True,
+                 batch_size: Optional[int] = None):
+        if entity not in EXPORTS:
+            raise ValueError(f"Unknown export {entity!r}; expected one of {', '.join(EXPORTS)}")
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+        if fmt == "parquet" and not parquet_available():
+            raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.entity = entity
+        self.spec = EXPORTS[entity]
+        self.format = fmt
+        self.since = as_utc(since)
+        self.until = as_utc(until) or default_until()
+        if self.since is not None and self.since >= self.until:
+            raise ValueError("'since' must be earlier than the export's upper watermark")
+        self.deidentify = deidentify
+        self.batch_size = batch_size or settings.export_batch_size
+        self.table: Table = Base.metadata.tables[self.spec.table]
+        self.rows_written = 0
+        key = settings.export_pseudonym_key or settings.secret_key
+        self._key = key.encode()
+        self._allowed_keys = dict(self.spec.allow_keys)
+
+    @property
+    def filename(self) -> str:
+        return f"{self.entity}-{self.until:%Y%m%dT%H%M%S}.{self.format}"
+
+    @property
+    def columns(self) -> List[str]:
+        columns = []
+        for column in self.table.c:
+            name = column.name
+            if self.deidentify and name in self.spec.drop:
+                continue
+            columns.append(_year_column(name) if self.deidentify and name in self.spec.year_only else name)
+        return columns
+
+    def _pseudonym(self, value) -> Optional[str]:
+        if value is None:
+            return None
+        return hmac.new(self._key, str(value).encode(), hashlib.sha256).hexdigest()[:32]
+
+    def _transform(self, row: dict) -> dict:
+        if not self.deidentify:
+            return row
+        record = {}
+        for name, value in row.items():
+            if name in self.spec.drop:
+                continue
+            if name in self.spec.pseudonymize:
+                record[name] = self._pseudonym(value)
+            elif name in self.spec.year_only:
+                record[_year_column(name)] = value.year if value is not None else None
+            elif name in self._allowed_keys:
+                allowed = self._allowed_keys[name]
+                record[name] = {k: v for k, v in value.items() if k in allowed} if isinstance(value, dict) else None
+            else:
+                record[name] = value
+        return record
+
+    def batches(self, db: Session) -> Iterator[List[dict]]:
+        """Transformed rows, ``batch_size`` at a time, read with a streaming cursor."""
+        result = db.execute(
+            export_statement(self.entity, self.since, self.until).execution_options(yield_per=self.batch_size)
+        )
+        for partition in result.mappings().partitions():
+            batch = [self._transform(dict(row)) for row in partition]
+            self.rows_written += len(batch)
+            yield batch
+
+    def chunks(self, db: Session) -> Iterator[bytes]:
+        """The encoded export, one chunk per batch of rows."""
+        if self.format == "ndjson":
+            return self._ndjson(db)
+        if self.format == "csv":
+            return self._csv(db)
+        return self._parquet(db)
+
+    def _ndjson(self, db: Session) -> Iterator[bytes]:
+        for batch in self.batches(db):
+            yield "".join(json.dumps(row, default=_json_default) + "\n" for row in batch).encode()
+
+    def _csv(self, db: Session) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.columns)
+        for batch in self.batches(db):
+            writer.writerows([_csv_value(row[name]) for name in self.columns] for row in batch)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    def _arrow_schema(self):
+        import pyarrow as pa
+
+        types = {}
+        for column in self.table.c:
+            if isinstance(column.type, GUID) or (self.deidentify and column.name in self.spec.pseudonymize):
+                types[column.name] = pa.string()
+                continue
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = str
+            types[column.name] = {
+                bool: pa.bool_(), int: pa.int64(), float: pa.float64(),
+                datetime: pa.timestamp("us"), date: pa.date32(),
+            }.get(python_type, pa.string())  # JSON columns are stored as JSON text
+        if self.deidentify:
+            for name in self.spec.year_only:
+                types[_year_column(name)] = pa.int32()
+        return pa.schema([(name, types[name]) for name in self.columns])
+
+    def _parquet(self, db: Session) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = self._arrow_schema()
+        json_columns = [field.name for field in schema if pa.types.is_string(field.type)]
+        descriptor, path = tempfile.mkstemp(suffix=".parquet")
+        os.close(descriptor)
+        try:
+            with pq.ParquetWriter(path, schema) as writer:
+                for batch in self.batches(db):
+                    for row in batch:
+                        for name in json_columns:
+                            if isinstance(row.get(name), (dict, list)):
+                                row[name] = json.dumps(row[name], default=_json_default)
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            with open(path, "rb") as exported:
+                while chunk := exported.read(FILE_CHUNK_SIZE):
+                    yield chunk
+        finally:
+            os.unlink(path)
+
+    def write_to(self, db: Session, output) -> int:
+        """Write the export to a binary file object; returns rows written."""
+        for chunk in self.chunks(db):
+            output.write(chunk)
+        return self.rows_written
+
+    def summary(self) -> dict:
+        return {
+            "entity": self.entity,
+            "format": self.format,
+            "since": self.since.isoformat() if self.since else None,
+            "until": self.until.isoformat(),
+            "deidentified": self.deidentify,
+            "rows": self.rows_written,
+        }
+
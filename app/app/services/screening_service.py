@@ -0,0 +1,58 @@
+"""
+CervixAI Screening Service
+Read models for screening episodes.
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models import AIResult, Sample, Screening
+
+
+class ScreeningService:
+    """
+    Loads a screening case for display in a fixed number of queries.
+
+    ``get_bundle`` issues ``BUNDLE_QUERIES`` statements however many images
+    or AI results the case has: the screening joined to its patient and
+    diagnosis, its images (``selectinload``) and the patient's latest AI
+    results.
+    """
+
+    BUNDLE_QUERIES = 3
+
+    def __init__(self, db: Session, current_user=None):
+        self.db = db
+        self.user = current_user
+
+    def get_bundle(self, screening_id: str, ai_results: int = 5) -> Optional[dict]:
+        """Screening with patient, images, diagnosis and latest AI results."""
+        screening = (
+            self.db.query(Screening)
+            .options(
+                joinedload(Screening.patient),
+                joinedload(Screening.diagnosis),
+                selectinload(Screening.images),
+            )
+            .filter(Screening.id == screening_id)
+            .first()
+        )
+        if not screening:
+            return None
+
+        latest_results = (
+            self.db.query(AIResult)
+            .join(Sample, AIResult.sample_id == Sample.id)
+            .filter(Sample.patient_id == screening.patient_id)
+            .order_by(AIResult.processed_at.desc(), AIResult.id.desc())
+            .limit(ai_results)
+            .all()
+        ) if ai_results else []
+
+        return {
+            "screening": screening,
+            "patient": screening.patient,
+            "images": sorted(screening.images, key=lambda image: image.uploaded_at),
+            "diagnosis": screening.diagnosis,
+            "latest_ai_results": latest_results,
+        }
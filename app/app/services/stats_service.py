@@ -0,0 +1,67 @@
+"""
+CervixAI Statistics Service
+Dashboard figures from the maintained counter tables.
+"""
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import ScreeningStatus
+from app.models.dashboard_counter import ALL_USERS, TOTAL, dashboard_counts, day_bucket
+from app.models.status_counter import StatusCounter
+
+
+class StatsService:
+    """
+    Dashboard statistics in a fixed number of small queries.
+
+    Every figure is read from ``status_counters`` or ``dashboard_counters``,
+    which are updated in the same transaction as the rows they count, so
+    the cost does not grow with the tables.
+    """
+
+    PENDING_REVIEW_STATUSES = (ScreeningStatus.AI_ANALYZED.value, ScreeningStatus.UNDER_REVIEW.value)
+
+    def __init__(self, db: Session, current_user=None):
+        self.db = db
+        self.user = current_user
+
+    def get_dashboard(self, user_id: Optional[str] = None, day: Optional[date] = None) -> dict:
+        """Totals, the day's throughput and, with ``user_id``, that user's figures."""
+        day = day or datetime.utcnow().date()
+        bucket = day_bucket(day)
+
+        status_rows = self.db.query(StatusCounter.entity, StatusCounter.status, StatusCounter.count).filter(
+            StatusCounter.entity.in_(("patients", "screenings"))
+        ).all()
+        screenings = {status: count for entity, status, count in status_rows if entity == "screenings" and count}
+        patients = sum(count for entity, _, count in status_rows if entity == "patients")
+
+        scopes = [ALL_USERS] + ([str(user_id)] if user_id else [])
+        counts = dashboard_counts(self.db, [bucket, TOTAL], scopes)
+
+        def count(metric: str, scope: str = ALL_USERS, at: str = bucket) -> int:
+            return counts.get((metric, scope, at), 0)
+
+        stats = {
+            "day": day,
+            "patients": patients,
+            "screenings_by_status": screenings,
+            "pending_reviews": sum(screenings.get(status, 0) for status in self.PENDING_REVIEW_STATUSES),
+            "pending_signoffs": count("pending_signoffs", at=TOTAL),
+            "today": {
+                metric: count(metric)
+                for metric in ("screenings_created", "screening_analyses", "sample_analyses", "reviews", "signoffs")
+            },
+            "user": None,
+        }
+        if user_id:
+            scope = str(user_id)
+            stats["user"] = {
+                "user_id": scope,
+                "pending_signoffs": count("pending_signoffs", scope, TOTAL),
+                "reviews_today": count("reviews", scope),
+                "signoffs_today": count("signoffs", scope),
+            }
+        return stats
@@ -0,0 +1,241 @@
+"""
+CervixAI Preprocessed Tensor Store
+Optional cache of normalized model-input tensors in memory-mappable ``.npy``
+shards, so re-analysis and evaluation jobs skip image decoding.
+
+Layout under ``settings.tensor_store_dir``::
+
+    <config_hash>/index.json        key -> (shard name, row, source fingerprint)
+    <config_hash>/index.lock        held while the index is merged and replaced
+    <config_hash>/shard-<uuid>.npy  float32 array of shape (N, C, H, W)
+
+The directory name is a hash of the preprocessing configuration, so a change
+to input size or normalization starts a fresh store and stale ones are pruned.
+
+Several processes may write to one store. Shard names are unique, so writers
+never replace each other's shards. The index is re-read, merged and replaced
+under an exclusive ``fcntl`` lock on ``index.lock`` (a thread lock only, where
+``fcntl`` is unavailable). Readers reload the index when it changes on disk.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are serialized within one process only
+    fcntl = None
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+
+def preprocessing_hash(config: dict) -> str:
+    """Stable short hash of a preprocessing configuration."""
+    payload = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def source_fingerprint(path: Optional[str]) -> Optional[str]:
+    """Identify the current contents of a source image by size and mtime."""
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class TensorStore:
+    """
+    Append-only store of preprocessed tensors.
+
+    Reads are served from memory-mapped shards, so repeated passes over the
+    same images come straight from the page cache. Each ``put_many`` call
+    writes one uniquely named shard and merges its entries into the index
+    under a file lock; the index is replaced atomically so readers never see
+    a partial update.
+    """
+
+    def __init__(self, root: str, config: dict):
+        self.config = config
+        self.config_hash = preprocessing_hash(config)
+        self.root = root
+        self.directory = os.path.join(root, self.config_hash)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._shards: Dict[str, np.ndarray] = {}
+        self._index_mtime: Optional[int] = None
+        self._index = self._read_index()
+
+    # -- index ------------------------------------------------------------
+
+    def _read_index(self) -> dict:
+        path = os.path.join(self.directory, INDEX_FILE)
+        if os.path.exists(path):
+            self._index_mtime = os.stat(path).st_mtime_ns
+            with open(path) as fh:
+                index = json.load(fh)
+            if index.get("config_hash") == self.config_hash:
+                # Stores written before entries named their shard
+                for entry in index["entries"].values():
+                    if isinstance(entry[0], int):
+                        entry[0] = index["shards"][entry[0]]
+                return index
+        return {"config_hash": self.config_hash, "config": self.config, "shards": [], "entries": {}}
+
+    def _refresh_index(self):
+        """Reload the index if another writer replaced it."""
+        try:
+            mtime = os.stat(os.path.join(self.directory, INDEX_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._index_mtime:
+            self._index = self._read_index()
+
+    @contextmanager
+    def _index_lock(self):
+        """Exclusive across threads and, with ``fcntl``, across processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.directory, LOCK_FILE), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(self._index, fh)
+        os.replace(tmp, path)
+
+    def __len__(self) -> int:
+        return len(self._index["entries"])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index["entries"]
+
+    # -- reads ------------------------------------------------------------
+
+    def _shard(self, name: str) -> np.ndarray:
+        shard = self._shards.get(name)
+        if shard is None:
+            shard = np.load(os.path.join(self.directory, name), mmap_mode="r")
+            self._shards[name] = shard
+        return shard
+
+    def _locate(self, key: str, fingerprint: Optional[str]) -> Optional[Tuple[str, int]]:
+        entry = self._index["entries"].get(key)
+        if entry is None:
+            return None
+        shard_name, row, stored_fingerprint = entry
+        if fingerprint is not None and fingerprint != stored_fingerprint:
+            return None  # Source image changed since it was cached
+        return shard_name, row
+
+    def get(self, key: str, fingerprint: Optional[str] = None) -> Optional[np.ndarray]:
+        """Return the cached tensor (a read-only memory-mapped view) or None."""
+        location = self._locate(key, fingerprint)
+        if location is None:
+            return None
+        shard_name, row = location
+        return self._shard(shard_name)[row]
+
+    def get_many(self, keys: Sequence[str], fingerprints: Optional[Sequence[Optional[str]]] = None) -> List[Optional[np.ndarray]]:
+        """``get`` for several keys; missing or stale entries come back as None."""
+        self._refresh_index()
+        fingerprints = fingerprints or [None] * len(keys)
+        return [self.get(key, fp) for key, fp in zip(keys, fingerprints)]
+
+    def iter_batches(self, keys: Iterable[str], batch_size: int = 32) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """
+        Stream cached tensors in batches, ordered by shard position for
+        sequential reads. Keys not in the store are skipped.
+        """
+        self._refresh_index()
+        located = sorted(
+            (location, key)
+            for key in keys
+            for location in [self._locate(key, None)]
+            if location is not None
+        )
+        for start in range(0, len(located), batch_size):
+            chunk = located[start:start + batch_size]
+            batch = np.stack([self._shard(shard_name)[row] for (shard_name, row), _ in chunk])
+            yield [key for _, key in chunk], batch
+
+    # -- writes -----------------------------------------------------------
+
+    def put_many(self, items: Dict[str, Tuple[np.ndarray, Optional[str]]]):
+        """Store tensors as a new shard; ``items`` maps key -> (tensor, source fingerprint)."""
+        if not items:
+            return
+        keys = list(items)
+        array = np.stack([np.asarray(items[key][0], dtype=np.float32) for key in keys])
+
+        # A unique name: no other writer, in any process, can replace this shard
+        name = f"shard-{uuid.uuid4().hex}.npy"
+        path = os.path.join(self.directory, name)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fh:
+            np.save(fh, array)
+        os.replace(tmp, path)
+
+        with self._index_lock():
+            self._index = self._read_index()  # Merge into the latest index, not this instance's copy
+            self._index["shards"].append(name)
+            for row, key in enumerate(keys):
+                self._index["entries"][key] = [name, row, items[key][1]]
+            self._write_index()
+            self._index_mtime = os.stat(os.path.join(self.directory, INDEX_FILE)).st_mtime_ns
+
+    def prune_stale(self) -> List[str]:
+        """Delete stores built with a different preprocessing configuration."""
+        removed = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name != self.config_hash and os.path.isfile(os.path.join(path, INDEX_FILE)):
+                shutil.rmtree(path)
+                removed.append(name)
+        return removed
+
+    def stats(self) -> dict:
+        """Summary of the store for operators."""
+        size = sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in self._index["shards"]
+            if os.path.exists(os.path.join(self.directory, name))
+        )
+        return {
+            "directory": self.directory,
+            "config_hash": self.config_hash,
+            "config": self.config,
+            "entries": len(self),
+            "shards": len(self._index["shards"]),
+            "bytes": size,
+        }
+
+
+@lru_cache()
+def get_tensor_store() -> Optional[TensorStore]:
+    """Get the configured tensor store, or None when it is disabled."""
+    if not settings.tensor_store_dir:
+        return None
+    from app.services.inference import get_inference_engine
+
+    store = TensorStore(settings.tensor_store_dir, get_inference_engine().preprocessing_config())
+    store.prune_stale()
+    return store
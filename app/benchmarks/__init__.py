@@ -0,0 +1,4 @@
+"""
+CervixAI Benchmarks Package
+Performance harnesses that can be compared across commits.
+"""
@@ -0,0 +1,470 @@
+"""
+CervixAI Inference Benchmark
+Drives the analysis path end to end on synthetic cytology-like images and
+writes a machine-readable report.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.inference_benchmark --sizes 512x512,1024x1024 \\
+        --concurrency 1,4,8 --batch-sizes 1,8 --images 64 --output bench.json
+
+    python -m benchmarks.inference_benchmark --compare old.json new.json
+
+Scenarios:
+    stages   decode, preprocess, inference and heatmap render timed separately
+    service  full path ending in ``AIResultService.run_analysis`` persistence
+    route    ``POST /diagnoses/analyze`` through the ASGI app
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+# The app reads its configuration at import time, so the benchmark database
+# and upload directory must be in place before anything from ``app`` loads.
+_WORKDIR = tempfile.mkdtemp(prefix="cervixai-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_WORKDIR, 'bench.db')}")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_WORKDIR, "uploads"))
+
+SCENARIOS = ("stages", "service", "route")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def generate_cytology_image(width: int, height: int, seed: int) -> Image.Image:
+    """Render a Pap-smear-like field: stained background, cells and nuclei."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), (236, 214, 222))
+    draw = ImageDraw.Draw(img)
+
+    n_cells = max(8, (width * height) // 6000)
+    for _ in range(n_cells):
+        x, y = rng.randint(0, width), rng.randint(0, height)
+        rx, ry = rng.randint(12, 40), rng.randint(10, 34)
+        cytoplasm = (rng.randint(170, 230), rng.randint(120, 190), rng.randint(170, 215))
+        draw.ellipse([x - rx, y - ry, x + rx, y + ry], fill=cytoplasm, outline=(150, 100, 150))
+        nr = rng.randint(3, max(4, min(rx, ry) // 2))
+        nucleus = (rng.randint(40, 90), rng.randint(20, 70), rng.randint(90, 140))
+        draw.ellipse([x - nr, y - nr, x + nr, y + nr], fill=nucleus)
+
+    noise = np.random.default_rng(seed).normal(0, 6, (height, width, 3))
+    arr = np.clip(np.asarray(img, dtype=np.float32) + noise, 0, 255).astype(np.uint8)
+    return Image.fromarray(arr).filter(ImageFilter.GaussianBlur(radius=0.8))
+
+
+def write_images(width: int, height: int, count: int, directory: str) -> List[str]:
+    """Write ``count`` synthetic images of the given size and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"synthetic_{width}x{height}_{i}.png")
+        if not os.path.exists(path):
+            generate_cytology_image(width, height, seed=i).save(path, "PNG")
+        paths.append(path)
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds."""
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "p50": round(float(np.percentile(ms, 50)), 3),
+        "p95": round(float(np.percentile(ms, 95)), 3),
+        "p99": round(float(np.percentile(ms, 99)), 3),
+        "mean": round(float(ms.mean()), 3),
+    }
+
+
+def run_load(
+    work: Callable[[List[str]], None],
+    paths: List[str],
+    concurrency: int,
+    batch_size: int,
+) -> dict:
+    """Run ``work`` over ``paths`` in batches on ``concurrency`` threads."""
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+    latencies: List[float] = []
+    errors: List[str] = []
+    failed_images = 0
+    lock = threading.Lock()
+
+    def timed(batch: List[str]):
+        nonlocal failed_images
+        start = time.perf_counter()
+        try:
+            work(batch)
+        except Exception as exc:  # recorded, not fatal: contention errors are a result
+            with lock:
+                errors.append(f"{type(exc).__name__}: {exc}")
+                failed_images += len(batch)
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, batches))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    processed = sum(len(b) for b in batches) - failed_images
+    return {
+        "batches": len(batches),
+        "images": processed,
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "wall_seconds": round(wall, 4),
+        "latency_ms": summarize(latencies),
+        "images_per_second": round(processed / wall, 3) if wall else 0.0,
+        # 100% == one fully used core
+        "cpu_percent": round(100.0 * cpu / wall, 1) if wall else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+class BenchmarkContext:
+    """Seeds a throwaway database and holds what the scenarios need."""
+
+    def __init__(self):
+        from app.db.database import init_db, SessionLocal
+        from app.core.security import get_password_hash
+        from app.models import User, Patient, UserRole
+
+        init_db()
+        self.session_factory = SessionLocal
+        with SessionLocal() as db:
+            user = User(
+                email="bench@cervixai.local",
+                name="Benchmark",
+                hashed_password=get_password_hash("benchmark"),
+                role=UserRole.ADMIN.value,
+            )
+            patient = Patient(
+                first_name="Bench",
+                last_name="Mark",
+                date_of_birth=datetime(1980, 1, 1).date(),
+                consent_given=True,
+                consent_date=datetime.utcnow(),
+            )
+            db.add_all([user, patient])
+            db.commit()
+            self.user_id = user.id
+            self.patient_id = patient.id
+        self._client = None
+        self._headers = None
+
+    def user(self, db):
+        from app.models import User
+        return db.query(User).filter(User.id == self.user_id).first()
+
+    def create_samples(self, paths: List[str]) -> Dict[str, str]:
+        """Create one uploaded ``Sample`` per image; returns path -> sample id."""
+        from app.models import Sample
+        with self.session_factory() as db:
+            samples = {
+                path: Sample(
+                    patient_id=self.patient_id,
+                    collection_date=datetime.utcnow(),
+                    sample_type="pap_smear",
+                    image_path=path,
+                    status="uploaded",
+                )
+                for path in paths
+            }
+            db.add_all(samples.values())
+            db.commit()
+            return {path: sample.id for path, sample in samples.items()}
+
+    @property
+    def client(self):
+        if self._client is None:
+            from fastapi.testclient import TestClient
+            from app.main import app
+            from app.core.security import create_access_token
+
+            self._client = TestClient(app)
+            token = create_access_token(data={"sub": self.user_id})
+            self._headers = {"Authorization": f"Bearer {token}"}
+        return self._client
+
+    def create_screenings(self, paths: List[str]) -> Dict[str, str]:
+        """Create a screening with one image per path; returns path -> screening id."""
+        from app.models import Screening, ScreeningImage
+        with self.session_factory() as db:
+            screenings = {}
+            for path in paths:
+                screening = Screening(patient_id=self.patient_id, reason_for_screening="benchmark")
+                screening.images.append(ScreeningImage(
+                    filename=os.path.basename(path),
+                    original_filename=os.path.basename(path),
+                    file_path=path,
+                    file_size=os.path.getsize(path),
+                    mime_type="image/png",
+                ))
+                db.add(screening)
+                screenings[path] = screening
+            db.commit()
+            return {path: screening.id for path, screening in screenings.items()}
+
+
+def stage_workloads(ctx: BenchmarkContext) -> Dict[str, Callable[[List[str]], None]]:
+    """One callable per pipeline stage, each processing a batch of paths."""
+    from app.api.routes.diagnoses import generate_mock_heatmap
+    from app.services.inference import get_inference_engine
+
+    engine = get_inference_engine()
+    heatmap_dir = os.path.join(_WORKDIR, "heatmaps")
+    os.makedirs(heatmap_dir, exist_ok=True)
+
+    def decode_batch(batch):
+        for path in batch:
+            engine.decode(path)
+
+    def preprocess_batch(batch):
+        np.stack([engine.load_tensor(path) for path in batch])
+
+    def inference_batch(batch):
+        engine.predict_batch([engine.load_tensor(path) for path in batch])
+
+    def heatmap_batch(batch):
+        for path in batch:
+            out = os.path.join(heatmap_dir, f"{threading.get_ident()}_{os.path.basename(path)}")
+            generate_mock_heatmap(path, out)
+
+    return {
+        "decode": decode_batch,
+        "preprocess": preprocess_batch,
+        "inference": inference_batch,
+        "heatmap": heatmap_batch,
+    }
+
+
+def service_workload(ctx: BenchmarkContext, paths: List[str]) -> Callable[[List[str]], None]:
+    """Decode, preprocess, infer and persist via ``AIResultService``, then render heatmaps."""
+    from app.api.routes.diagnoses import generate_mock_heatmap
+    from app.services.ai_result_service import AIResultService
+
+    sample_ids = ctx.create_samples(paths)
+    heatmap_dir = os.path.join(_WORKDIR, "heatmaps")
+    os.makedirs(heatmap_dir, exist_ok=True)
+
+    def work(batch):
+        with ctx.session_factory() as db:
+            service = AIResultService(db, ctx.user(db))
+            for path in batch:
+                result = service.run_analysis(sample_id=sample_ids[path])
+                db.commit()
+                out = os.path.join(heatmap_dir, f"{result.id}.png")
+                generate_mock_heatmap(path, out)
+
+    return work
+
+
+def route_workload(ctx: BenchmarkContext, paths: List[str]) -> Callable[[List[str]], None]:
+    """``POST /diagnoses/analyze`` for pre-created screenings."""
+    from app.core.config import settings
+
+    screening_ids = ctx.create_screenings(paths)
+    url = f"{settings.api_v1_prefix}/diagnoses/analyze"
+
+    def work(batch):
+        for path in batch:
+            resp = ctx.client.post(url, json={"screening_id": screening_ids[path]}, headers=ctx._headers)
+            resp.raise_for_status()
+
+    return work
+
+
+def run_benchmarks(args) -> dict:
+    ctx = BenchmarkContext()
+    results = []
+
+    for size in args.sizes:
+        width, height = size
+        source_paths = write_images(width, height, args.images, os.path.join(_WORKDIR, "images"))
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                for batch_size in args.batch_sizes:
+                    if scenario == "stages":
+                        workloads = stage_workloads(ctx).items()
+                    elif scenario == "service":
+                        workloads = [("full_path", service_workload(ctx, source_paths))]
+                    else:
+                        workloads = [("diagnoses_analyze", route_workload(ctx, source_paths))]
+
+                    for stage, work in workloads:
+                        if args.warmup:
+                            # Warm up on the first image only; persistence scenarios
+                            # need fresh rows so they are not warmed
+                            if scenario == "stages":
+                                work(source_paths[:1])
+                        metrics = run_load(work, source_paths, concurrency, batch_size)
+                        entry = {
+                            "scenario": scenario,
+                            "stage": stage,
+                            "image_size": f"{width}x{height}",
+                            "concurrency": concurrency,
+                            "batch_size": batch_size,
+                            **metrics,
+                        }
+                        results.append(entry)
+                        print(
+                            f"{scenario:8s} {stage:18s} {width}x{height} c={concurrency:<3d} "
+                            f"b={batch_size:<3d} p50={entry['latency_ms']['p50']:.1f}ms "
+                            f"p99={entry['latency_ms']['p99']:.1f}ms "
+                            f"{entry['images_per_second']:.1f} img/s "
+                            f"cpu={entry['cpu_percent']:.0f}% rss={entry['peak_rss_mb']:.0f}MiB"
+                            + (f" errors={entry['errors']}" if entry["errors"] else ""),
+                            file=sys.stderr,
+                        )
+
+    return {"meta": environment_info(args), "results": results}
+
+
+def environment_info(args) -> dict:
+    """Describe the run so reports from different commits can be lined up."""
+    from app.core.config import settings
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "database_url": os.environ.get("DATABASE_URL"),
+        "model_precision": settings.ai_model_precision,
+        "images_per_run": args.images,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def _result_key(entry: dict) -> tuple:
+    return (entry["scenario"], entry["stage"], entry["image_size"], entry["concurrency"], entry["batch_size"])
+
+
+def compare_reports(baseline_path: str, candidate_path: str) -> List[dict]:
+    """Relative change of p95 latency and throughput per matching run."""
+    with open(baseline_path) as fh:
+        baseline = {_result_key(e): e for e in json.load(fh)["results"]}
+    with open(candidate_path) as fh:
+        candidate = {_result_key(e): e for e in json.load(fh)["results"]}
+
+    rows = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        old_p95, new_p95 = old["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        old_ips, new_ips = old["images_per_second"], new["images_per_second"]
+        rows.append({
+            "scenario": key[0],
+            "stage": key[1],
+            "image_size": key[2],
+            "concurrency": key[3],
+            "batch_size": key[4],
+            "p95_change_pct": round(100.0 * (new_p95 - old_p95) / old_p95, 1) if old_p95 else None,
+            "throughput_change_pct": round(100.0 * (new_ips - old_ips) / old_ips, 1) if old_ips else None,
+        })
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _size_list(value: str) -> List[tuple]:
+    sizes = []
+    for item in value.split(","):
+        width, _, height = item.lower().partition("x")
+        sizes.append((int(width), int(height or width)))
+    return sizes
+
+
+def _scenario_list(value: str) -> List[str]:
+    scenarios = [v for v in value.split(",") if v]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    return scenarios
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="CervixAI inference benchmark")
+    parser.add_argument("--sizes", type=_size_list, default=_size_list("512x512,1024x1024"),
+                        help="Comma-separated WIDTHxHEIGHT image sizes")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4],
+                        help="Comma-separated worker thread counts")
+    parser.add_argument("--batch-sizes", type=_int_list, default=[1, 8],
+                        help="Comma-separated images per unit of work")
+    parser.add_argument("--images", type=int, default=32, help="Images per run")
+    parser.add_argument("--scenarios", type=_scenario_list, default=list(SCENARIOS),
+                        help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false")
+    parser.add_argument("--output", default="bench_output.json", help="Report path (JSON)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+                        help="Compare two reports instead of running")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.compare:
+        json.dump(compare_reports(*args.compare), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    report = run_benchmarks(args)
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
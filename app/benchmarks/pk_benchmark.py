@@ -0,0 +1,205 @@
+"""
+CervixAI Primary Key Benchmark
+Compares key strategies for insert-heavy tables: random ``uuid4`` text keys
+(the previous default), UUIDv7 text keys and UUIDv7 in ``GUID`` columns
+(native ``uuid`` on PostgreSQL, 16-byte blobs on SQLite).
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.pk_benchmark --rows 200000 --batch-size 1000 \\
+        --output pk_bench.json
+    python -m benchmarks.pk_benchmark --database-url postgresql://app@localhost/bench
+
+Each strategy gets a fresh table shaped like ``audit_logs`` (key, indexed
+user key, action, timestamp, JSON details) and is filled in batches of
+``--batch-size`` rows, one transaction each. The report has overall and
+steady-state (last 10% of batches) insert throughput and the size of the
+table, its primary key index and the secondary key index.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+_WORKDIR = tempfile.mkdtemp(prefix="cervixai-pk-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_WORKDIR, 'app.db')}")
+
+STRATEGIES = ("uuid4_text", "uuid7_text", "uuid7_native")
+
+
+def key_factory(strategy: str) -> Callable[[], str]:
+    from app.db.identifiers import new_id
+
+    return (lambda: str(uuid.uuid4())) if strategy == "uuid4_text" else new_id
+
+
+def build_table(strategy: str):
+    from sqlalchemy import JSON, Column, DateTime, Index, MetaData, String, Table
+    from app.db.identifiers import GUID
+
+    key_type = GUID if strategy == "uuid7_native" else String(36)
+    name = f"pk_bench_{strategy}"
+    return Table(
+        name, MetaData(),
+        Column("id", key_type, primary_key=True),
+        Column("user_id", key_type, nullable=False),
+        Column("action", String(100), nullable=False),
+        Column("timestamp", DateTime, nullable=False),
+        Column("details", JSON),
+        Index(f"idx_{name}_user", "user_id"),
+    )
+
+
+def relation_sizes(connection, table) -> Dict[str, Optional[int]]:
+    """Bytes used by the table, its primary key index and the user index."""
+    from sqlalchemy import text
+
+    user_index = f"idx_{table.name}_user"
+    if connection.dialect.name == "postgresql":
+        row = connection.execute(text(
+            "SELECT pg_relation_size(CAST(:table AS regclass)), "
+            "pg_relation_size(CAST(:pkey AS regclass)), pg_relation_size(CAST(:user_index AS regclass))"
+        ), {"table": table.name, "pkey": f"{table.name}_pkey", "user_index": user_index}).one()
+        return {"table_bytes": row[0], "pk_index_bytes": row[1], "user_index_bytes": row[2]}
+
+    sizes = dict(connection.execute(text(
+        "SELECT d.name, SUM(d.pgsize) FROM dbstat d JOIN sqlite_schema s ON s.name = d.name "
+        "WHERE s.tbl_name = :table GROUP BY d.name"
+    ), {"table": table.name}).all())
+    pk_index = next((name for name in sizes if name.startswith("sqlite_autoindex_")), None)
+    return {
+        "table_bytes": sizes.get(table.name),
+        "pk_index_bytes": sizes.get(pk_index) if pk_index else None,
+        "user_index_bytes": sizes.get(user_index),
+    }
+
+
+def run_strategy(engine, strategy: str, rows: int, batch_size: int, users: int) -> dict:
+    table = build_table(strategy)
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+
+    next_key = key_factory(strategy)
+    rng = random.Random(0)
+    user_ids = [next_key() for _ in range(users)]
+    batch_seconds: List[float] = []
+    inserted = 0
+    while inserted < rows:
+        count = min(batch_size, rows - inserted)
+        batch = [
+            {"id": next_key(), "user_id": rng.choice(user_ids), "action": "patient.view",
+             "timestamp": datetime.utcnow(), "details": {"n": inserted + i}}
+            for i in range(count)
+        ]
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(table.insert(), batch)
+        batch_seconds.append(time.perf_counter() - start)
+        inserted += count
+
+    with engine.begin() as connection:
+        sizes = relation_sizes(connection, table)
+    table.drop(engine)
+
+    tail = batch_seconds[-max(1, len(batch_seconds) // 10):]
+    tail_rows = min(rows, len(tail) * batch_size)
+    total = sum(batch_seconds)
+    return {
+        "strategy": strategy,
+        "rows": rows,
+        "batch_size": batch_size,
+        "insert_seconds": round(total, 4),
+        "rows_per_second": round(rows / total, 1) if total else 0.0,
+        "steady_rows_per_second": round(tail_rows / sum(tail), 1) if sum(tail) else 0.0,
+        **sizes,
+    }
+
+
+def compare(results: List[dict]) -> List[dict]:
+    """Each strategy relative to random uuid4 text keys."""
+    base = next((entry for entry in results if entry["strategy"] == "uuid4_text"), None)
+    if not base:
+        return []
+
+    def ratio(entry: dict, key: str) -> Optional[float]:
+        return round(entry[key] / base[key], 3) if entry.get(key) and base.get(key) else None
+
+    return [
+        {
+            "strategy": entry["strategy"],
+            "throughput_ratio": ratio(entry, "rows_per_second"),
+            "steady_throughput_ratio": ratio(entry, "steady_rows_per_second"),
+            "pk_index_size_ratio": ratio(entry, "pk_index_bytes"),
+            "user_index_size_ratio": ratio(entry, "user_index_bytes"),
+            "table_size_ratio": ratio(entry, "table_bytes"),
+        }
+        for entry in results if entry is not base
+    ]
+
+
+def run_benchmarks(args) -> dict:
+    from sqlalchemy import create_engine
+
+    url = args.database_url or f"sqlite:///{os.path.join(_WORKDIR, 'pk.db')}"
+    engine = create_engine(url)
+    results = []
+    try:
+        for strategy in args.strategies:
+            entry = run_strategy(engine, strategy, args.rows, args.batch_size, args.users)
+            results.append(entry)
+            pk_kib = (entry["pk_index_bytes"] or 0) / 1024
+            print(
+                f"{strategy:13s} {entry['rows_per_second']:10.1f} rows/s "
+                f"steady {entry['steady_rows_per_second']:10.1f} rows/s pk index {pk_kib:9.0f} KiB",
+                file=sys.stderr,
+            )
+        meta = environment_info(args, engine)
+    finally:
+        engine.dispose()
+    return {"meta": meta, "results": results, "comparison": compare(results)}
+
+
+def environment_info(args, engine) -> dict:
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "server_version": ".".join(str(part) for part in engine.dialect.server_version_info or ()),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "rows": args.rows,
+        "batch_size": args.batch_size,
+        "users": args.users,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="CervixAI primary key strategy benchmark")
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows inserted per strategy")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per insert transaction")
+    parser.add_argument("--users", type=int, default=500, help="Distinct values of the indexed user key")
+    parser.add_argument("--strategies", type=lambda v: [s for s in v.split(",") if s in STRATEGIES],
+                        default=list(STRATEGIES), help=f"Comma-separated subset of {', '.join(STRATEGIES)}")
+    parser.add_argument("--database-url", help="Database to benchmark against (default: a temporary SQLite file)")
+    parser.add_argument("--output", default="pk_bench.json", help="Report path (JSON)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = run_benchmarks(args)
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+CervixAI SQLite Benchmark
+Compares the production SQLite profile (WAL, tuned PRAGMAs, single-writer
+gate) with the driver defaults under concurrent request-like load.
+
+Usage (from the ``app`` directory):
+
+    python -m benchmarks.sqlite_benchmark --threads 1,4,8,16 --ops 200 \\
+        --write-ratio 0.3 --output sqlite_bench.json
+
+Each worker thread runs ``--ops`` operations, each in its own session as a
+request would. A write creates a patient and its audit entry in one
+transaction (``POST /patients``); a read fetches a page of patients and a
+patient by ID. Every profile/thread-count pair starts from a fresh database
+file seeded with ``--seed-patients`` rows.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_WORKDIR = tempfile.mkdtemp(prefix="cervixai-sqlite-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_WORKDIR, 'app.db')}")
+
+PROFILES = ("default", "production")
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds."""
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "p50": round(float(np.percentile(ms, 50)), 3),
+        "p95": round(float(np.percentile(ms, 95)), 3),
+        "p99": round(float(np.percentile(ms, 99)), 3),
+        "mean": round(float(ms.mean()), 3),
+    }
+
+
+def build_engine(profile: str, path: str, pool_size: int):
+    """Engine on a fresh file configured as ``profile``, with its schema."""
+    from sqlalchemy import create_engine
+    from app.db.database import Base
+    from app.db.sqlite import WriterGate, configure_sqlite
+    import app.models  # noqa: F401
+
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    if profile == "production":
+        # A gate per engine so runs do not share state
+        configure_sqlite(engine, gate=WriterGate())
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def seed(engine, patients: int) -> List[str]:
+    from sqlalchemy import insert
+    from app.db.identifiers import new_id
+    from app.models import Patient
+
+    ids = [new_id() for _ in range(patients)]
+    with engine.begin() as connection:
+        connection.execute(insert(Patient.__table__), [
+            {"id": patient_id, "first_name": f"First{i}", "last_name": f"Last{i}",
+             "date_of_birth": date(1980, 1, 1), "created_at": datetime.utcnow()}
+            for i, patient_id in enumerate(ids)
+        ])
+    return ids
+
+
+def run_profile(profile: str, threads: int, ops: int, write_ratio: float, seed_patients: int) -> dict:
+    from sqlalchemy.orm import Session
+    from app.models import AuditLog, Patient
+
+    path = os.path.join(_WORKDIR, f"{profile}-{threads}.db")
+    engine = build_engine(profile, path, pool_size=threads)
+    patient_ids = seed(engine, seed_patients)
+
+    reads: List[float] = []
+    writes: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def write(rng: random.Random):
+        with Session(engine) as db:
+            patient = Patient(
+                first_name="Bench", last_name=f"W{rng.randrange(10**6)}", date_of_birth=date(1990, 1, 1)
+            )
+            db.add(patient)
+            db.flush()
+            db.add(AuditLog(action="patient.create", resource_type="patient", resource_id=patient.id))
+            db.commit()
+
+    def read(rng: random.Random):
+        with Session(engine) as db:
+            db.query(Patient).order_by(Patient.created_at.desc(), Patient.id.desc()).limit(21).all()
+            db.get(Patient, rng.choice(patient_ids))
+
+    def worker(index: int):
+        rng = random.Random(index)
+        for _ in range(ops):
+            is_write = rng.random() < write_ratio
+            start = time.perf_counter()
+            try:
+                (write if is_write else read)(rng)
+            except Exception as exc:  # recorded, not fatal: lock errors are a result
+                with lock:
+                    errors.append(f"{type(exc).__name__}: {str(exc).splitlines()[0]}")
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                (writes if is_write else reads).append(elapsed)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    wall = time.perf_counter() - wall_start
+    engine.dispose()
+
+    completed = len(reads) + len(writes)
+    return {
+        "profile": profile,
+        "threads": threads,
+        "operations": threads * ops,
+        "completed": completed,
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:3],
+        "wall_seconds": round(wall, 4),
+        "ops_per_second": round(completed / wall, 2) if wall else 0.0,
+        "writes_per_second": round(len(writes) / wall, 2) if wall else 0.0,
+        "read_latency_ms": summarize(reads),
+        "write_latency_ms": summarize(writes),
+    }
+
+
+def run_benchmarks(args) -> dict:
+    results = []
+    for threads in args.threads:
+        for profile in args.profiles:
+            entry = run_profile(profile, threads, args.ops, args.write_ratio, args.seed_patients)
+            results.append(entry)
+            print(
+                f"{profile:10s} t={threads:<3d} {entry['ops_per_second']:8.1f} ops/s "
+                f"read p95={entry['read_latency_ms']['p95']:.1f}ms "
+                f"write p95={entry['write_latency_ms']['p95']:.1f}ms"
+                + (f" errors={entry['errors']}" if entry["errors"] else ""),
+                file=sys.stderr,
+            )
+    return {"meta": environment_info(args), "results": results, "comparison": compare(results)}
+
+
+def compare(results: List[dict]) -> List[dict]:
+    """Production profile relative to the defaults at each thread count."""
+    by_key = {(entry["profile"], entry["threads"]): entry for entry in results}
+    rows = []
+    for threads in sorted({entry["threads"] for entry in results}):
+        base, tuned = by_key.get(("default", threads)), by_key.get(("production", threads))
+        if not base or not tuned:
+            continue
+        rows.append({
+            "threads": threads,
+            "throughput_ratio": round(tuned["ops_per_second"] / base["ops_per_second"], 2)
+            if base["ops_per_second"] else None,
+            "write_p95_ms": [base["write_latency_ms"]["p95"], tuned["write_latency_ms"]["p95"]],
+            "read_p95_ms": [base["read_latency_ms"]["p95"], tuned["read_latency_ms"]["p95"]],
+            "errors": [base["errors"], tuned["errors"]],
+        })
+    return rows
+
+
+def environment_info(args) -> dict:
+    import sqlite3
+
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workdir": _WORKDIR,
+        "ops_per_thread": args.ops,
+        "write_ratio": args.write_ratio,
+        "seed_patients": args.seed_patients,
+    }
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="CervixAI SQLite profile benchmark")
+    parser.add_argument("--threads", type=_int_list, default=[1, 4, 8, 16],
+                        help="Comma-separated worker thread counts")
+    parser.add_argument("--ops", type=int, default=200, help="Operations per thread")
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="Share of operations that write")
+    parser.add_argument("--seed-patients", type=int, default=2000)
+    parser.add_argument("--profiles", type=lambda v: [p for p in v.split(",") if p in PROFILES],
+                        default=list(PROFILES), help=f"Comma-separated subset of {', '.join(PROFILES)}")
+    parser.add_argument("--output", default="sqlite_bench.json", help="Report path (JSON)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = run_benchmarks(args)
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
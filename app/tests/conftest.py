@@ -0,0 +1,102 @@
+"""
+CervixAI Test Fixtures
+The app runs against a throwaway SQLite database and upload directory.
+"""
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import List
+
+_TMP = tempfile.mkdtemp(prefix="cervixai-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_TMP, "uploads")
+os.environ.pop("REDIS_URL", None)
+os.environ.pop("TENSOR_STORE_DIR", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.cache import entity_cache
+from app.core.security import create_access_token
+from app.db.database import SessionLocal, async_engine, engine, reset_db
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    # Depends on the client: app startup migrates the database
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="module")
+def empty_db(client):
+    """A freshly migrated, empty database for the tests of one module."""
+    reset_db()
+    entity_cache.clear()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a user with the given role; returns bearer headers."""
+    def register(role: str = "admin") -> dict:
+        response = client.post("/api/v1/auth/register", json={
+            "email": f"{role}-{uuid.uuid4().hex[:8]}@example.com",
+            "name": "Test User", "password": "test-password", "role": role,
+        })
+        assert response.status_code == 201, response.text
+        return {"Authorization": f"Bearer {create_access_token({'sub': response.json()['id']})}"}
+    return register
+
+
+class QueryCount:
+    """Statements seen while a ``count_queries`` block was active."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Context manager recording every statement the sync and async engines
+    execute inside it, to keep eager-loaded reads from regressing into N+1
+    queries::
+
+        with count_queries() as queries:
+            ScreeningService(db).get_bundle(screening_id)
+        assert queries.count == ScreeningService.BUNDLE_QUERIES, queries.statements
+    """
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+
+    @contextmanager
+    def counting():
+        queries = QueryCount()
+
+        def record(connection, cursor, statement, parameters, context, executemany):
+            queries.statements.append(statement)
+
+        for target in engines:
+            event.listen(target, "before_cursor_execute", record)
+        try:
+            yield queries
+        finally:
+            for target in engines:
+                event.remove(target, "before_cursor_execute", record)
+
+    return counting
@@ -0,0 +1,95 @@
+"""
+Batch analysis claims each sample for one run at a time, keeps the status
+counters in step, and releases unanalyzed samples afterwards.
+"""
+import uuid
+from datetime import date, datetime
+
+from app.db.database import SessionLocal
+from app.models import AIResult, Patient, Sample
+from app.models.status_counter import StatusCounter
+from app.services.ai_result_service import PROCESSING_STATUS, STALE_CLAIM_AFTER, AIResultService
+
+
+def seed_batch(db, statuses) -> str:
+    batch_id = str(uuid.uuid4())
+    patient = Patient(first_name="Batch", last_name="Test", date_of_birth=date(1979, 8, 14))
+    db.add(patient)
+    db.flush()
+    db.add_all([
+        Sample(patient_id=patient.id, collection_date=datetime.utcnow(), batch_id=batch_id, status=status)
+        for status in statuses
+    ])
+    db.commit()
+    return batch_id
+
+
+def sample_counts(db) -> dict:
+    return dict(db.query(StatusCounter.status, StatusCounter.count).filter(StatusCounter.entity == "samples"))
+
+
+def test_each_sample_is_claimed_by_one_run(db):
+    batch_id = seed_batch(db, ["pending", "uploaded", "pending", "reviewed"])
+    before = sample_counts(db)
+
+    with SessionLocal() as other:
+        samples, claimed = AIResultService(db).claim_batch_samples(batch_id)
+        rival, rival_claimed = AIResultService(other).claim_batch_samples(batch_id)
+
+    assert len(samples) == 3
+    assert {sample.status for sample in samples} == {PROCESSING_STATUS}
+    assert sorted(claimed.values()) == ["pending", "pending", "uploaded"]
+    assert rival == [] and rival_claimed == {}
+
+    after = sample_counts(db)
+    assert after["pending"] == before["pending"] - 2
+    assert after["uploaded"] == before["uploaded"] - 1
+    assert after[PROCESSING_STATUS] == before.get(PROCESSING_STATUS, 0) + 3
+
+
+def test_release_restores_unanalyzed_samples(db):
+    batch_id = seed_batch(db, ["pending", "uploaded"])
+    before = sample_counts(db)
+    service = AIResultService(db)
+    samples, claimed = service.claim_batch_samples(batch_id)
+    analyzed = samples[0]
+    analyzed.status = "analyzed"
+    db.commit()
+
+    service.release_samples(claimed)
+
+    statuses = dict(db.query(Sample.id, Sample.status).filter(Sample.batch_id == batch_id))
+    assert statuses[analyzed.id] == "analyzed"
+    assert statuses[samples[1].id] == claimed[samples[1].id]
+    after = sample_counts(db)
+    assert after[PROCESSING_STATUS] == before.get(PROCESSING_STATUS, 0)
+    assert after["analyzed"] == before.get("analyzed", 0) + 1
+
+
+def test_stale_claims_are_taken_over(db):
+    batch_id = seed_batch(db, ["pending"])
+    samples, _ = AIResultService(db).claim_batch_samples(batch_id)
+    samples[0].updated_at = datetime.utcnow() - STALE_CLAIM_AFTER * 2
+    db.commit()
+
+    retaken, claimed = AIResultService(db).claim_batch_samples(batch_id)
+
+    assert [sample.id for sample in retaken] == [samples[0].id]
+    assert claimed == {samples[0].id: "pending"}
+
+
+def test_concurrent_batch_runs_analyze_each_sample_once(client, auth_headers, db):
+    batch_id = seed_batch(db, ["pending", "uploaded", "pending"])
+    headers = auth_headers("physician")
+    service = AIResultService(db)
+    # A rival run still holds the last sample while this request runs
+    held, claimed = service.claim_batch_samples(batch_id)
+    service.release_samples({sample.id: claimed[sample.id] for sample in held[:2]})
+
+    response = client.post(f"/api/v1/batches/{batch_id}/analyze", headers=headers)
+    assert response.status_code == 200
+    assert '"total": 2' in response.text
+
+    results = db.query(AIResult).join(Sample).filter(Sample.batch_id == batch_id).count()
+    assert results == 2
+    assert db.query(Sample.status).filter(Sample.id == held[2].id).scalar() == PROCESSING_STATUS
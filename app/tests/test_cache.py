@@ -0,0 +1,102 @@
+"""
+Committed writes evict cached entities and principals, and a fill that raced
+an invalidation is not stored, whichever worker's cache invalidated.
+"""
+import uuid
+from datetime import date
+
+from app.core.cache import EntityCache, MemoryBackend, entity_cache
+from app.core.principal import Principal, PrincipalCache, principal_cache
+from app.models import Patient, User
+
+
+def seed_patient(db) -> Patient:
+    patient = Patient(first_name="Cache", last_name="Test", date_of_birth=date(1990, 3, 9))
+    db.add(patient)
+    db.commit()
+    return patient
+
+
+def seed_user(db) -> User:
+    user = User(email=f"cache-{uuid.uuid4().hex[:8]}@example.com", name="Cache Test",
+                hashed_password="x", role="physician")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def load(value):
+    return lambda: value
+
+
+def test_patient_update_and_delete_evict_the_cached_entity(db):
+    patient = seed_patient(db)
+    assert entity_cache.get_or_load("patient", patient.id, load({"version": 1})) == {"version": 1}
+    assert entity_cache.get_or_load("patient", patient.id, load({"version": 2})) == {"version": 1}
+
+    patient.first_name = "Changed"
+    db.commit()
+    assert entity_cache.get_or_load("patient", patient.id, load({"version": 2})) == {"version": 2}
+
+    db.delete(patient)
+    db.commit()
+    assert entity_cache.get_or_load("patient", patient.id, load(None)) is None
+
+
+def test_rolled_back_write_keeps_the_cached_entity(db):
+    patient = seed_patient(db)
+    entity_cache.get_or_load("patient", patient.id, load({"version": 1}))
+
+    patient.first_name = "Discarded"
+    db.flush()
+    db.rollback()
+    assert entity_cache.get_or_load("patient", patient.id, load({"version": 2})) == {"version": 1}
+
+
+def test_entity_fill_that_raced_an_invalidation_is_not_stored():
+    # Two workers sharing one backend: worker B commits a write while A loads
+    backend = MemoryBackend(100)
+    worker_a, worker_b = EntityCache(backend, ttl=60), EntityCache(backend, ttl=60)
+    patient_id = str(uuid.uuid4())
+
+    def stale_load():
+        worker_b.invalidate([("patient", patient_id)])
+        return {"version": 1}
+
+    assert worker_a.get_or_load("patient", patient_id, stale_load) == {"version": 1}
+    assert backend.get(EntityCache.key("patient", patient_id)) is None
+    assert worker_a.get_or_load("patient", patient_id, load({"version": 2})) == {"version": 2}
+    assert worker_b.get_or_load("patient", patient_id, load({"version": 3})) == {"version": 2}
+
+
+def test_user_change_and_delete_evict_cached_principals(db):
+    user = seed_user(db)
+    principal_cache.set("token", Principal.from_user(user), principal_cache.generation(user.id))
+    assert principal_cache.get(user.id, "token") is not None
+
+    user.role = "pathologist"
+    db.commit()
+    assert principal_cache.get(user.id, "token") is None
+
+    principal_cache.set("token", Principal.from_user(user), principal_cache.generation(user.id))
+    user.name = "Renamed"  # Not part of the principal
+    db.commit()
+    assert principal_cache.get(user.id, "token") is not None
+
+    db.delete(user)
+    db.commit()
+    assert principal_cache.get(user.id, "token") is None
+
+
+def test_principal_fill_that_raced_an_invalidation_is_not_stored():
+    backend = MemoryBackend(100)
+    worker_a, worker_b = PrincipalCache(backend, ttl=60), PrincipalCache(backend, ttl=60)
+    principal = Principal(id=str(uuid.uuid4()), email="race@example.com", role="physician", is_active=True)
+
+    generation = worker_a.generation(principal.id)  # Read before loading the user
+    worker_b.invalidate(principal.id)  # The user changed meanwhile
+    worker_a.set("token", principal, generation)
+    assert worker_a.get(principal.id, "token") is None
+
+    worker_a.set("token", principal, worker_a.generation(principal.id))
+    assert worker_b.get(principal.id, "token") == principal
@@ -0,0 +1,89 @@
+"""
+Keyset cursors page through a list without gaps or repeats in either
+direction, and malformed or tampered cursors are rejected with 400.
+"""
+import base64
+import json
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.db.pagination import encode_cursor
+from app.models import Patient, Sample
+
+
+@pytest.fixture
+def batch(db):
+    """Seven samples of a fresh batch, newest first; two share a timestamp."""
+    batch_id = str(uuid.uuid4())
+    patient = Patient(first_name="Page", last_name="Test", date_of_birth=date(1988, 11, 23))
+    db.add(patient)
+    db.flush()
+    start = datetime(2024, 1, 1)
+    created = [start + timedelta(minutes=n) for n in (0, 1, 2, 3, 3, 4, 5)]
+    samples = [
+        Sample(patient_id=patient.id, collection_date=start, batch_id=batch_id, created_at=at)
+        for at in created
+    ]
+    db.add_all(samples)
+    db.commit()
+    order = sorted(samples, key=lambda sample: (sample.created_at, sample.id), reverse=True)
+    return batch_id, [sample.id for sample in order]
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursors_round_trip_both_directions(client, auth_headers, batch):
+    batch_id, expected = batch
+    headers = auth_headers("physician")
+
+    def page(cursor=None):
+        params = {"batch_id": batch_id, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/samples/", headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        return [row["id"] for row in response.json()], response.headers
+
+    pages, cursor = [], None
+    while True:
+        ids, page_headers = page(cursor)
+        pages.append((ids, page_headers))
+        cursor = page_headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert [sample_id for ids, _ in pages for sample_id in ids] == expected
+    assert [len(ids) for ids, _ in pages] == [3, 3, 1]
+    assert "X-Prev-Cursor" not in pages[0][1]
+
+    # Walking back from the last page returns the earlier pages unchanged
+    for (earlier, _), (_, later_headers) in zip(reversed(pages[:-1]), reversed(pages[1:])):
+        ids, _ = page(later_headers["X-Prev-Cursor"])
+        assert ids == earlier
+
+
+VALID_KEY = "2024-01-01T00:00:00"
+
+BAD_CURSORS = {
+    "not base64": "%%%not-a-cursor",
+    "not json": base64.urlsafe_b64encode(b"{not json").decode(),
+    "missing id": raw_cursor({"k": VALID_KEY, "d": "next"}),
+    "unknown direction": raw_cursor({"k": VALID_KEY, "i": str(uuid.uuid4()), "d": "sideways"}),
+    "boolean id": raw_cursor({"k": VALID_KEY, "i": True, "d": "next"}),
+    "list id": raw_cursor({"k": VALID_KEY, "i": [1, 2], "d": "next"}),
+    "id not a uuid": encode_cursor(VALID_KEY, "not-a-uuid"),
+    "sort key not a timestamp": encode_cursor("yesterday", str(uuid.uuid4())),
+}
+
+
+@pytest.mark.parametrize("cursor", BAD_CURSORS.values(), ids=BAD_CURSORS.keys())
+def test_malformed_and_tampered_cursors_are_rejected(client, auth_headers, cursor):
+    headers = auth_headers("admin")
+    for path in ("/api/v1/samples/", "/api/v1/audit/"):
+        response = client.get(path, headers=headers, params={"cursor": cursor})
+        assert response.status_code == 400, (path, response.text)
+        assert response.json()["detail"] == "Invalid pagination cursor"
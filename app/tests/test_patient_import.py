@@ -0,0 +1,86 @@
+"""
+Bulk import skips repeated and existing MRNs, reports invalid rows, and
+isolates rows the database rejects while importing the rest of their chunk.
+"""
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models import AuditLog, Patient
+from app.services.patient_import import PatientImportService, parse_rows
+
+HEADER = "first_name,last_name,date_of_birth,medical_record_number,phone"
+
+
+@pytest.fixture
+def mrn():
+    prefix = f"IMP-{uuid.uuid4().hex[:8]}"
+    return lambda n: f"{prefix}-{n}"
+
+
+def created_mrns(db, mrns) -> set:
+    return set(db.scalars(select(Patient.medical_record_number).where(Patient.medical_record_number.in_(mrns))))
+
+
+def test_import_skips_repeated_and_existing_mrns(client, auth_headers, db, mrn):
+    db.add(Patient(first_name="Already", last_name="Here", date_of_birth=date(1970, 1, 1),
+                   medical_record_number=mrn("existing")))
+    db.commit()
+    csv_text = "\n".join([
+        HEADER,
+        f"Ann,One,1980-01-01,{mrn(1)},555-0101",
+        f"Ann,Again,1980-01-01,{mrn(1)},555-0101",
+        f"Old,Patient,1970-01-01,{mrn('existing')},",
+        f"Long,Phone,1980-01-01,{mrn(3)},{'5' * 25}",
+        f"Bea,Two,1981-02-02,{mrn(2)},",
+    ]) + "\n"
+
+    response = client.post(
+        "/api/v1/patients/import", params={"format": "csv", "chunk_size": 2},
+        files={"file": ("patients.csv", csv_text)}, headers=auth_headers("admin"),
+    )
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert {key: report[key] for key in ("rows", "created", "skipped_existing", "failed")} == {
+        "rows": 5, "created": 2, "skipped_existing": 1, "failed": 2,
+    }
+    errors = {error["row"]: error for error in report["errors"]}
+    assert sorted(errors) == [2, 4]
+    assert "repeated" in errors[2]["error"]
+    assert errors[4]["error"].startswith("phone")
+    assert created_mrns(db, [mrn(1), mrn(2), mrn(3)]) == {mrn(1), mrn(2)}
+    audited = db.query(AuditLog).filter(AuditLog.action == "patient.create").all()
+    assert sum(1 for entry in audited if (entry.details or {}).get("import_id") == report["import_id"]) == 2
+
+
+def test_dry_run_writes_nothing(db, mrn):
+    rows = parse_rows([HEADER, f"Dry,Run,1980-01-01,{mrn(1)},"], "csv")
+
+    report = PatientImportService(db).import_rows(rows, dry_run=True)
+
+    assert report["created"] == 1
+    assert created_mrns(db, [mrn(1)]) == set()
+
+
+def test_rows_rejected_by_the_database_are_isolated(db, mrn, monkeypatch):
+    insert_rows = PatientImportService._insert_rows
+
+    def reject_bad_row(self, rows, numbers, report, now):
+        if any(row["medical_record_number"] == mrn("bad") for row in rows.values()):
+            self.db.execute(text("SELECT * FROM no_such_table"))  # Any DBAPIError
+        return insert_rows(self, rows, numbers, report, now)
+
+    monkeypatch.setattr(PatientImportService, "_insert_rows", reject_bad_row)
+    lines = [HEADER] + [f"Row,{n},1980-01-01,{mrn(n)}," for n in (1, 2)] + [
+        f"Row,Bad,1980-01-01,{mrn('bad')},", f"Row,3,1980-01-01,{mrn(3)},",
+    ]
+
+    report = PatientImportService(db).import_rows(parse_rows(lines, "csv"), chunk_size=10)
+
+    assert (report["created"], report["failed"]) == (3, 1)
+    assert report["errors"][0]["row"] == 3
+    assert report["errors"][0]["error"].startswith("Rejected by the database")
+    assert created_mrns(db, [mrn(n) for n in (1, 2, 3, "bad")]) == {mrn(1), mrn(2), mrn(3)}
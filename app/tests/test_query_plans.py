@@ -0,0 +1,108 @@
+"""
+Every list and lookup query the API issues is served by an index.
+
+A database is seeded with ``seed_synthetic``; real requests are sent and
+each SELECT they run is captured and checked with ``EXPLAIN QUERY PLAN``.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db.database import SessionLocal, async_engine, engine
+from app.db.plan_audit import _full_scans, audit_query_plans, seed_synthetic
+from app.models import AIResult, Annotation, Patient, Sample, Screening
+from app.services.research_export import EXPORTS
+
+
+@pytest.fixture(scope="module")
+def seeded(empty_db):
+    with SessionLocal() as db:
+        seed_synthetic(db, patients=2000)
+
+        def one(column):
+            return db.execute(select(column).where(column.isnot(None)).limit(1)).scalar()
+
+        return {
+            "patient_id": one(Patient.id),
+            "mrn": one(Patient.medical_record_number),
+            "screening_id": one(Screening.id),
+            "sample_id": one(Sample.id),
+            "batch_id": one(Sample.batch_id),
+            "result_id": one(AIResult.id),
+            "clinician_id": one(Annotation.clinician_id),
+        }
+
+
+@pytest.fixture
+def captured_selects():
+    """SELECT statements run by either engine while the test runs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", capture)
+    yield statements
+    for target in engines:
+        event.remove(target, "before_cursor_execute", capture)
+
+
+def full_scans(statement, parameters):
+    with engine.connect() as connection:
+        plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    return _full_scans("sqlite", plan)
+
+
+ENDPOINTS = [
+    "/patients?count=none",
+    "/patients/{patient_id}",
+    "/patients/search?q={mrn}",
+    "/patients/search?dob_from=1980-01-01&dob_to=1980-12-31",
+    "/patients?risk_factor=hpv_positive&count=none",
+    "/screenings?count=none",
+    "/screenings?patient_id={patient_id}",
+    "/screenings?status=completed&count=none",
+    "/images/screening/{screening_id}",
+    "/diagnoses/screening/{screening_id}",
+    "/samples/",
+    "/samples/?patient_id={patient_id}",
+    "/samples/?batch_id={batch_id}",
+    "/samples/?status=reviewed",
+    "/ai-results/",
+    "/ai-results/?sample_id={sample_id}",
+    "/ai-results/?score=hsil:gt:0.3",
+    "/annotations/",
+    "/annotations/?result_id={result_id}",
+    "/annotations/?signed_off=false&clinician_id={clinician_id}",
+    "/audit?count=none",
+    "/audit?entity_type=patient&count=none",
+    *[f"/exports/{entity}?since={{since}}" for entity in EXPORTS],
+]
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_endpoint_queries_use_indexes(client, auth_headers, seeded, captured_selects, path):
+    headers = auth_headers("admin")
+    captured_selects.clear()  # Registration queries are not under test
+    since = (datetime.utcnow() - timedelta(days=1)).isoformat()
+
+    response = client.get("/api/v1" + path.format(since=since, **seeded), headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert captured_selects, "the request ran no SELECT"
+    scans = {statement: full_scans(statement, parameters) for statement, parameters in captured_selects}
+    assert not {statement: lines for statement, lines in scans.items() if lines}
+
+
+def test_full_scan_is_detected(seeded):
+    # Patient notes are not indexed
+    assert full_scans("SELECT * FROM patients WHERE notes = ?", ("follow up",))
+
+
+def test_audited_queries_use_indexes(seeded, db):
+    regressions = {result.name: result.full_scans for result in audit_query_plans(db) if not result.uses_index}
+    assert not regressions
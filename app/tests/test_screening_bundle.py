@@ -0,0 +1,72 @@
+"""
+A screening bundle loads in ``ScreeningService.BUNDLE_QUERIES`` statements
+however many images the screening has, and reading it is audited.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.models import AIResult, AuditLog, Diagnosis, Patient, Sample, Screening, ScreeningImage
+from app.services.screening_service import ScreeningService
+
+
+def seed_screening(db, images: int) -> str:
+    patient = Patient(first_name="Bundle", last_name="Test", date_of_birth=date(1985, 4, 2))
+    screening = Screening(patient=patient, status="under_review")
+    db.add_all([patient, screening])
+    db.flush()
+    now = datetime.utcnow()
+    db.add_all([
+        ScreeningImage(
+            screening_id=screening.id, filename=f"{n}.png", original_filename=f"{n}.png",
+            file_path="/dev/null", uploaded_at=now + timedelta(seconds=n)
+        )
+        for n in range(images)
+    ])
+    db.add(Diagnosis(screening_id=screening.id))
+    for n in range(3):
+        sample = Sample(patient_id=patient.id, collection_date=now)
+        db.add(sample)
+        db.flush()
+        db.add(AIResult(
+            sample_id=sample.id, diagnosis={}, confidence_scores={"nilm": 0.9},
+            model_version="test", processed_at=now + timedelta(seconds=n)
+        ))
+    db.commit()
+    return screening.id
+
+
+@pytest.mark.parametrize("images", [1, 12])
+def test_bundle_query_count_does_not_grow_with_images(db, count_queries, images):
+    screening_id = seed_screening(db, images)
+
+    with SessionLocal() as session, count_queries() as queries:
+        bundle = ScreeningService(session).get_bundle(screening_id)
+
+    assert len(bundle["images"]) == images
+    assert bundle["diagnosis"] is not None
+    assert len(bundle["latest_ai_results"]) == 3
+    assert ScreeningService.BUNDLE_QUERIES == 3
+    assert queries.count == ScreeningService.BUNDLE_QUERIES, queries.statements
+
+
+def test_bundle_endpoint_queries_and_audits_patient_view(client, db, auth_headers, count_queries):
+    screening_id = seed_screening(db, images=4)
+    patient_id = db.get(Screening, screening_id).patient_id
+    headers = auth_headers("physician")
+    client.get("/api/v1/users/me", headers=headers)  # Cache the principal: no auth queries below
+
+    with count_queries() as queries:
+        response = client.get(f"/api/v1/screenings/{screening_id}/bundle", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()["images"]) == 4
+    selects = [statement for statement in queries.statements if statement.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == ScreeningService.BUNDLE_QUERIES, selects
+
+    db.expire_all()
+    views = db.query(AuditLog).filter(
+        AuditLog.action == "patient.view", AuditLog.resource_id == patient_id
+    ).all()
+    assert len(views) == 1
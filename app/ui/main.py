@@ -122,28 +122,40 @@ def dashboard_page():
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    # Get counts
-    patients_data, _ = api_request("GET", "/patients", {"limit": 1})
-    screenings_pending, _ = api_request("GET", "/screenings", {"status": "pending", "limit": 1})
-    screenings_review, _ = api_request("GET", "/screenings", {"status": "ai_analyzed", "limit": 1})
+    # Counts, from maintained counters
+    stats, _ = api_request("GET", "/stats/dashboard")
+    stats = stats or {}
+    by_status = stats.get("screenings_by_status", {})
     
     with col1:
-        st.metric("Total Patients", patients_data.get("total", 0) if patients_data else 0)
+        st.metric("Total Patients", stats.get("patients", 0))
     
     with col2:
-        st.metric("Pending Upload", screenings_pending.get("total", 0) if screenings_pending else 0)
+        st.metric("Pending Upload", by_status.get("pending", 0))
     
     with col3:
-        st.metric("Awaiting Review", screenings_review.get("total", 0) if screenings_review else 0)
+        st.metric("Awaiting Review", stats.get("pending_reviews", 0))
     
     with col4:
         st.metric("Your Role", st.session_state.user.get("role", "").title())
     
+    today = stats.get("today", {})
+    mine = stats.get("user") or {}
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Analyzed Today", today.get("screening_analyses", 0) + today.get("sample_analyses", 0))
+    with col2:
+        st.metric("Reviewed Today", today.get("reviews", 0))
+    with col3:
+        st.metric("Pending Sign-offs", stats.get("pending_signoffs", 0))
+    with col4:
+        st.metric("Your Pending Sign-offs", mine.get("pending_signoffs", 0))
+    
     st.divider()
     
     # Recent screenings
     st.subheader("Recent Screenings")
-    screenings_data, error = api_request("GET", "/screenings", {"limit": 10})
+    screenings_data, error = api_request("GET", "/screenings", {"limit": 10, "count": "none"})
     
     if screenings_data and screenings_data.get("items"):
         for screening in screenings_data["items"]:
@@ -176,11 +188,10 @@ def patients_page():
     
     with col1:
         # Patient list
-        params = {"limit": 20}
         if search_term:
-            params["search"] = search_term
-        
-        data, error = api_request("GET", "/patients", params)
+            data, error = api_request("GET", "/patients/search", {"q": search_term, "limit": 20})
+        else:
+            data, error = api_request("GET", "/patients", {"limit": 20})
         
         if data and data.get("items"):
             for patient in data["items"]:
@@ -349,8 +360,16 @@ def review_page():
     
     for screening in screenings_data["items"]:
         with st.expander(f"🟠 Screening {screening['id'][:8]}... - Awaiting Review", expanded=True):
-            # Get diagnosis
-            diagnosis, _ = api_request("GET", f"/diagnoses/screening/{screening['id']}")
+            # Case bundle: patient, images and diagnosis in one request
+            bundle, _ = api_request("GET", f"/screenings/{screening['id']}/bundle", {"ai_results": 0})
+            diagnosis = bundle.get("diagnosis") if bundle else None
+            
+            if bundle:
+                patient = bundle["patient"]
+                st.caption(
+                    f"{patient['first_name']} {patient['last_name']} · "
+                    f"{len(bundle['images'])} image(s)"
+                )
             
             if diagnosis:
                 col1, col2 = st.columns(2)